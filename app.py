@@ -1,10 +1,79 @@
+import hmac
+import os
+import time
+import uuid
+
 import streamlit as st
 import numpy as np
 import pandas as pd
-from typing import Optional
+import altair as alt
+import pyarrow as pa
+
+from sigorta import (
+    DEVELOPMENT_PATTERNS,
+    DISABLED_PROFILER,
+    PROCESS_TIMINGS,
+    RESULT_CACHE,
+    SCENARIOS,
+    PeriodHistory,
+    Portfolio,
+    Profiler,
+    TimingBuffer,
+    analytic_period_metrics,
+    bootstrap_reserves,
+    bornhuetter_ferguson,
+    cached,
+    chain_ladder,
+    coach_policy,
+    compute_last_insights,
+    demand_from_premium,
+    evaluate_policies,
+    evaluate_table,
+    fixed_policy,
+    make_insurers,
+    open_store,
+    pattern_factors,
+    period_seed,
+    pricing_period_result,
+    replay_period,
+    simulate_capital_paths,
+    simulate_market,
+    simulate_multiline,
+    simulate_period,
+    suggested_gross_premium,
+    sweep_surface,
+    threshold_policy,
+    triangle_from_history,
+)
 
 st.set_page_config(page_title="Sigorta Temel Mantık Simülasyonu (Eğitici + Koç)", layout="wide")
 
+# =============================
+# Süre ölçümü (isteğe bağlı)
+# =============================
+# Kapalıyken DISABLED_PROFILER hiçbir şey yapmaz ve wrap fonksiyonları olduğu gibi döndürür.
+if st.session_state.get("profile_enabled", False):
+    profiler = Profiler(st.session_state.setdefault("_timings", TimingBuffer()), PROCESS_TIMINGS)
+else:
+    profiler = DISABLED_PROFILER
+rerun_started = time.perf_counter()
+simulate_period = profiler.wrap(simulate_period)
+compute_last_insights = profiler.wrap(compute_last_insights)
+
+# =============================
+# Sınıf deposu
+# =============================
+# Kayıt isteğe bağlıdır: SIGORTA_STORE bir dosya yolu verirse tüm oturumların dönemleri ve soru
+# cevapları o SQLite dosyasına eşzamansız yazılır; verilmezse hiçbir şey saklanmaz.
+# Eğitmen görünümü yalnızca SIGORTA_EGITMEN_TOKEN tanımlıyken ve ?egitmen=<token> ile açılır.
+STORE_PATH = os.environ.get("SIGORTA_STORE", "")
+INSTRUCTOR_TOKEN = os.environ.get("SIGORTA_EGITMEN_TOKEN", "")
+store = open_store(STORE_PATH) if STORE_PATH else None
+
+def is_instructor() -> bool:
+    given = st.query_params.get("egitmen", "")
+    return bool(INSTRUCTOR_TOKEN) and hmac.compare_digest(given.encode(), INSTRUCTOR_TOKEN.encode())
+
 # =============================
 # Yardımcılar
 # =============================
@@ -14,69 +83,6 @@ def fmt_tl(x: float) -> str:
 def fmt_pct(x: float) -> str:
     return f"{x*100:.1f}%"
 
-def simulate_period(n_policies: int, p_claim: float, mean_loss: float, seed: Optional[int] = None):
-    rng = np.random.default_rng(seed)
-    claim_occurs = rng.random(n_policies) < p_claim
-    n_claims = int(claim_occurs.sum())
-    losses = rng.exponential(scale=mean_loss, size=n_claims) if n_claims > 0 else np.array([])
-    return n_claims, float(losses.sum())
-
-def demand_from_premium(premium: float, base_policies: int, reference_premium: float, sensitivity: float):
-    ratio = premium / reference_premium if reference_premium > 0 else 1.0
-    demand_factor = np.exp(-sensitivity * (ratio - 1.0))
-    return max(0, int(round(base_policies * demand_factor)))
-
-def compute_last_insights(df: pd.DataFrame, suggested_gross: float, premium_choice: float):
-    last = df.iloc[-1].to_dict()
-
-    premium_income = float(last["Prim Geliri"])
-    cr = float(last["Combined Ratio"])
-    n_pol = int(last["Poliçe"])
-
-    base_market = int(last.get("Referans Satış (poliçe)", 0)) or 1
-    demand_ratio = n_pol / base_market
-
-    price_gap = premium_choice / max(1.0, suggested_gross)  # >1 pahalı, <1 ucuz
-
-    diagnosis, actions, roadmap = [], [], []
-
-    if premium_income == 0:
-        diagnosis.append("Satış yok: prim rekabetçi seviyenin çok üzerinde kalmış görünüyor.")
-        actions.append("Prim düzeyini düşür (ör. önerilen brüt primin %90–%110 bandına yaklaş).")
-    else:
-        if cr < 1.0:
-            diagnosis.append(f"Teknik sonuç olumlu: Combined Ratio = {cr:.2f} (< 1).")
-            actions.append("Fiyatı koru veya kontrollü büyüme için küçük indirim dene (örn. -%5).")
-        elif 1.0 <= cr < 1.10:
-            diagnosis.append(f"Teknik sonuç sınıra yakın: Combined Ratio = {cr:.2f} (1’e yakın).")
-            actions.append("Prim düzeyini bir kademe artır (örn. +%5–%10) veya gider oranını düşürmeyi dene.")
-        else:
-            diagnosis.append(f"Teknik sonuç olumsuz: Combined Ratio = {cr:.2f} (>> 1).")
-            actions.append("Prim düzeyini artır (+%10–%20) ve fiyat disiplinini güçlendir.")
-
-    if price_gap < 0.9:
-        diagnosis.append("Prim, önerilen brüt primin belirgin altında: satış artabilir ama prim yetersizliği sermayeyi zorlayabilir.")
-        actions.append("CR>1 ise önce prim seviyesini önerilen banda yaklaştır.")
-    elif price_gap > 1.1:
-        diagnosis.append("Prim, önerilen brüt primin üstünde: zarar riski azalabilir ama rekabetçi satış düşebilir.")
-        actions.append("Satış çok düştüyse prim seviyesini biraz geri çek (örn. -%5).")
-    else:
-        diagnosis.append("Prim, önerilen brüt prime yakın: fiyatlama açısından dengeli bir bölgede ilerliyorsun.")
-
-    if demand_ratio < 0.6:
-        diagnosis.append("Satış zayıf: fiyat pahalı kalmış olabilir veya piyasa fiyata çok hassastır.")
-        actions.append("Satış hedefleniyorsa prim düzeyini düşür veya fiyata duyarlılığı daha düşük bir piyasa varsayımıyla test et.")
-    elif demand_ratio > 1.2:
-        diagnosis.append("Satış güçlü: genişleyen risk havuzu sonuçları beklenen değere yaklaştırma eğilimindedir.")
-        actions.append("CR kötü ise satış artışı zararı büyütebilir → prim artır. CR iyi ise büyümeyi sürdür.")
-
-    roadmap.append("1) Öncelik: Combined Ratio’yu 1’in altına çek (teknik denge).")
-    roadmap.append("2) Sonra: CR<1 iken küçük fiyat indirimleriyle satış hacmini test et (kontrollü).")
-    roadmap.append("3) Piyasa çok hassassa: prim ayarını küçük adımlarla yap; küçük artış satışları hızlı düşürebilir.")
-    roadmap.append("4) Rekabet baskısı yüksekse, primin daha disiplinli olması gerekir.")
-
-    return diagnosis, actions, roadmap
-
 def ask_mcq(step_key: str, question: str, options: list[str], correct: str, radio_key: str):
     """
     Çoktan seçmeli soru:
@@ -95,6 +101,13 @@ def ask_mcq(step_key: str, question: str, options: list[str], correct: str, radi
     ok = (ans == correct)
     return ans, ok
 
+def submit_quiz(step_key, ok: bool):
+    """Cevabı oturuma işler ve depoya (varsa) deneme olarak yazar."""
+    st.session_state.quiz_submitted[step_key] = True
+    st.session_state.quiz_ok[step_key] = ok
+    if store is not None:
+        store.record_quiz(st.session_state.session_id, step_key, ok)
+
 # =============================
 # State
 # =============================
@@ -102,6 +115,10 @@ def init_state():
     if "step" not in st.session_state:
         st.session_state.step = 0  # 0 intro, 1-5
 
+    if "session_id" not in st.session_state:
+        # Depodaki koşu kimliği; Baştan Başlat yeni koşu açar
+        st.session_state.session_id = uuid.uuid4().hex
+
     if "quiz_ok" not in st.session_state:
         st.session_state.quiz_ok = {"intro": False, 1: False, 2: False, 3: False, 4: False}
 
@@ -116,7 +133,14 @@ def init_state():
         st.session_state.period = 0  # fiyatlama dönemi
 
     if "history" not in st.session_state:
-        st.session_state.history = []
+        st.session_state.history = PeriodHistory()
+
+    if "portfolio_mode" not in st.session_state:
+        # İsteğe bağlı kalıcı portföy kipi; varsayılan her dönem yeni, homojen bir portföydür
+        st.session_state.portfolio_mode = False
+    if "portfolio" not in st.session_state:
+        # Kalıcı poliçe portföyü; portföy kipinde ilk simülasyonda kurulur
+        st.session_state.portfolio = None
 
     # kararlar
     if "scenario" not in st.session_state:
@@ -132,50 +156,13 @@ def init_state():
     if "sensitivity" not in st.session_state:
         st.session_state.sensitivity = 1.2
     if "seed" not in st.session_state:
-        st.session_state.seed = 0
+        # Her oturum kendi tohumunu alır; dönem akışları (tohum, dönem) çiftinden türetilir.
+        st.session_state.seed = int(np.random.SeedSequence().entropy % 1_000_000)
     if "last_commentary" not in st.session_state:
         st.session_state.last_commentary = ""
 
 init_state()
-
-# =============================
-# Piyasa/Risk Profili (terminoloji sadeleştirildi)
-# =============================
-SCENARIOS = {
-    "Seçici Risk Kabul (Daha İyi Portföy)": {
-        "p_claim": 0.05,
-        "mean_loss": 20_000,
-        "label": "Daha düşük hasar olasılığı ve daha düşük ortalama hasar",
-        "market_logic": (
-            "**Ne demek?**\n"
-            "- Şirket daha düşük riskli poliçeler satıyor varsayılır.\n"
-            "- Bu yüzden hasar daha seyrek ve/veya daha düşük tutarda gelir.\n"
-            "- Rekabet baskısı görece düşüktür (fiyat kırma daha azdır)."
-        )
-    },
-    "Standart Piyasa": {
-        "p_claim": 0.08,
-        "mean_loss": 25_000,
-        "label": "Ortalama risk karışımı; tipik piyasa dengesi",
-        "market_logic": (
-            "**Ne demek?**\n"
-            "- Piyasa ortalamasına yakın bir risk düzeyi varsayılır.\n"
-            "- Rekabet baskısı orta düzeydedir.\n"
-            "- Hasar olasılığı ve ortalama hasar ‘referans’ seviyededir."
-        )
-    },
-    "Yoğun Rekabet (Zayıf Fiyat Disiplini)": {
-        "p_claim": 0.12,
-        "mean_loss": 32_000,
-        "label": "Hasar olasılığı ve ortalama hasar daha yüksek (daha zorlu koşul)",
-        "market_logic": (
-            "**Ne demek?**\n"
-            "- Rekabet baskısı yüksektir: fiyat kırma eğilimi artar.\n"
-            "- Daha riskli poliçelerin portföye gelmesi olasıdır.\n"
-            "- Bu nedenle hasar daha sık ve/veya daha yüksek tutarda gerçekleşebilir."
-        )
-    },
-}
+profiler.checkpoint("init_state")
 
 # =============================
 # Navigation
@@ -188,9 +175,11 @@ def go_prev():
 
 def hard_reset():
     st.session_state.step = 0
+    st.session_state.session_id = uuid.uuid4().hex
     st.session_state.period = 0
     st.session_state.capital = st.session_state.capital0
-    st.session_state.history = []
+    st.session_state.history = PeriodHistory()
+    st.session_state.portfolio = None
     st.session_state.last_commentary = ""
     st.session_state.quiz_ok = {"intro": False, 1: False, 2: False, 3: False, 4: False}
     st.session_state.quiz_submitted = {"intro": False, 1: False, 2: False, 3: False, 4: False}
@@ -200,6 +189,141 @@ def hard_reset():
         if str(k).startswith("_mcq_order_"):
             del st.session_state[k]
 
+# =============================
+# Paylaşılan sonuç önbelleği
+# =============================
+# RESULT_CACHE süreç genelindedir: aynı parametrelerle gelen tüm oturumlar sonucu bir kez hesaplar.
+# Bu yüzden çok yollu analizler oturum tohumuyla değil sabit ANALYTICS_SEED ile çekilir; oturum
+# tohumu yalnızca fiyatlama dönemlerinin (tohum, dönem) akışlarında kullanılır.
+ANALYTICS_SEED = 20_240_601
+cached_sweep_surface = cached(sweep_surface)
+cached_capital_paths = cached(simulate_capital_paths)
+cached_period_metrics = cached(analytic_period_metrics)
+cached_multiline = cached(simulate_multiline)
+cached_market = cached(simulate_market)
+
+@cached
+def autopilot_comparison(p_claim: float, mean_loss: float, expense_loading: float, profit_loading: float,
+                         base_policies: int, sensitivity: float, capital0: float, premium_factor: float,
+                         raise_pct: float, cut_pct: float, n_paths: int, seed: int):
+    """Koç politikası, sabit primler ve kullanıcının CR kuralı; politikalar burada kurulur ki argümanlar anahtarlanabilsin."""
+    policies = {
+        "Koç (otomatik pilot)": coach_policy(),
+        "Sabit (senin primin)": fixed_policy(),
+        "Sabit (önerilen, %100)": fixed_policy(),
+        "Senin kuralın": threshold_policy([1.0], [1.0 - cut_pct / 100.0, 1.0 + raise_pct / 100.0]),
+    }
+    start = {name: premium_factor for name in policies}
+    start["Sabit (önerilen, %100)"] = 100.0
+    return evaluate_policies(policies, p_claim, mean_loss, expense_loading, profit_loading, base_policies,
+                             sensitivity, capital0, start_factor=start, n_paths=n_paths, seed=seed)
+
+def get_sweep_surface():
+    """
+    Tarama yüzeyi (senaryo, gider, tampon/kâr, referans satış, sermaye) ile anahtarlanır.
+    Prim düzeyi ve duyarlılık anahtarda yoktur: kaydırıcıyı oynatmak yeniden hesap gerektirmez.
+    """
+    scenario = SCENARIOS[st.session_state.scenario]
+    return cached_sweep_surface(
+        p_claim=scenario["p_claim"],
+        mean_loss=scenario["mean_loss"],
+        expense_loading=st.session_state.expense_loading,
+        profit_loading=st.session_state.profit_loading,
+        base_policies=st.session_state.base_policies,
+        capital0=st.session_state.capital0,
+        seed=ANALYTICS_SEED,
+    )
+
+# =============================
+# Geçmiş görünümleri
+# =============================
+# Görünümler history nesnesinde saklanır ve yalnızca yeni dönem eklenince yeniden kurulur.
+# Aynı nesneler her rerun'da aynı baytlara serileşir; Streamlit 10 KB üzeri mesajları tarayıcı
+# önbelleğinden referansla gönderdiğinden geçmiş değişmedikçe tablo ve grafikler yeniden taşınmaz.
+HISTORY_TABLE_ROWS = 500
+TREND_POINTS = 500
+TREND_CHARTS = (
+    ("grafik: prim geliri / hasar", ["Prim Geliri", "Toplam Hasar"]),
+    ("grafik: combined ratio", ["Combined Ratio"]),
+    ("grafik: sermaye", ["Sermaye"]),
+)
+
+def history_table(history: PeriodHistory) -> pa.Table:
+    """Sonuç tablosu (Arrow; st.dataframe her rerun'da pandas dönüşümü yapmaz), en fazla son HISTORY_TABLE_ROWS dönem."""
+    start = max(0, len(history) - HISTORY_TABLE_ROWS)
+    return pa.table({name: values[start:] for name, values in history.columns().items()})
+
+def history_trends(history: PeriodHistory) -> pd.DataFrame:
+    """Trend grafikleri için en fazla TREND_POINTS noktaya seyreltilmiş veri (son dönem her zaman dahil)."""
+    stride = -(-len(history) // TREND_POINTS)
+    rows = np.arange(len(history) - 1, -1, -stride)[::-1]
+    columns = history.columns(["Fiyatlama Dönemi", "Prim Geliri", "Toplam Hasar", "Combined Ratio", "Sermaye"])
+    return pd.DataFrame({name: values[rows] for name, values in columns.items()}).set_index("Fiyatlama Dönemi")
+
+def trend_charts(history: PeriodHistory) -> list:
+    """
+    (ölçüm adı, uzun biçimli veri, Vega-Lite şeması) üçlüleri. st.line_chart her çağrıda veriyi
+    dönüştürüp Altair grafiği kurar; hazır şemayla st.vega_lite_chart yalnızca serileştirir.
+    """
+    trends = history_trends(history)
+    charts = []
+    for name, columns in TREND_CHARTS:
+        data = trends[columns].reset_index().melt("Fiyatlama Dönemi", var_name="Kalem", value_name="Değer")
+        spec = {
+            "mark": {"type": "line"},
+            "encoding": {
+                "x": {"field": "Fiyatlama Dönemi", "type": "quantitative", "axis": {"format": "d", "tickMinStep": 1}},
+                "y": {"field": "Değer", "type": "quantitative", "title": None},
+                "color": {"field": "Kalem", "type": "nominal", "title": None},
+            },
+        }
+        charts.append((name, data, spec))
+    return charts
+
+RESERVE_ORIGINS = 12
+RESERVE_RESAMPLES = 10_000
+
+def reserve_view(history: PeriodHistory, pattern: str) -> dict:
+    """
+    Son RESERVE_ORIGINS kaza döneminin ödenen üçgeni, chain-ladder (ödenen / gerçekleşen) ve BF
+    tahminleri, bootstrap rezerv dağılımı. BF'nin önsel nihai hasarı her dönemin piyasa koşulundaki
+    beklenen hasar × poliçedir.
+    """
+    patterns = DEVELOPMENT_PATTERNS[pattern]
+    triangle = triangle_from_history(history, **patterns, n_origins=RESERVE_ORIGINS)
+    n = len(triangle)
+    columns = {name: values[-n:] for name, values in history.columns(["Fiyatlama Dönemi", "Piyasa koşulu", "Poliçe"]).items()}
+    expected_loss = np.array([SCENARIOS[s]["p_claim"] * SCENARIOS[s]["mean_loss"] for s in columns["Piyasa koşulu"]])
+    fallback = pattern_factors(patterns["payment_pattern"])
+
+    cl_paid = chain_ladder(triangle.paid, triangle.mask, fallback)
+    cl_incurred = chain_ladder(triangle.incurred, triangle.mask)
+    bf = bornhuetter_ferguson(triangle.paid, triangle.mask, expected_loss * columns["Poliçe"], cl_paid["cdf"])
+    boot = bootstrap_reserves(triangle.paid, triangle.mask, RESERVE_RESAMPLES, fallback_factors=fallback,
+                              seed=int(history.column("Tohum")[-1]))
+
+    index = pd.Index(columns["Fiyatlama Dönemi"], name="Kaza dönemi")
+    latest_paid = triangle.latest("paid")
+    return {
+        "triangle": pd.DataFrame(triangle.observed("paid").round(), index=index,
+                                 columns=[f"Gelişme {j + 1}" for j in range(triangle.mask.shape[1])]),
+        "estimates": pd.DataFrame({
+            "Ödenen": latest_paid,
+            "Gerçekleşen": triangle.latest("incurred"),
+            "CL nihai (ödenen)": cl_paid["ultimate"],
+            "CL nihai (gerçekleşen)": cl_incurred["ultimate"],
+            "BF nihai": bf["ultimate"],
+            "Gerçek nihai": triangle.ultimate,
+        }, index=index).round(),
+        "paid_this_period": float(triangle.calendar_paid()[-1]),
+        "true_reserve": float(triangle.outstanding().sum()),
+        "cl_reserve": float(cl_paid["total_ibnr"]),
+        "cl_incurred_reserve": float((cl_incurred["ultimate"] - latest_paid).sum()),
+        "bf_reserve": float(bf["total_ibnr"]),
+        "bootstrap_q95": float(boot["quantiles"][0.95]),
+        "bootstrap_std": boot["std"],
+    }
+
 # =============================
 # Üst hesaplar
 # =============================
@@ -207,8 +331,9 @@ p_claim = SCENARIOS[st.session_state.scenario]["p_claim"]
 mean_loss = SCENARIOS[st.session_state.scenario]["mean_loss"]
 
 expected_loss_per_policy = p_claim * mean_loss
-suggested_gross = expected_loss_per_policy * (1 + st.session_state.expense_loading + st.session_state.profit_loading)
+suggested_gross = suggested_gross_premium(p_claim, mean_loss, st.session_state.expense_loading, st.session_state.profit_loading)
 premium_choice = suggested_gross * (st.session_state.premium_factor / 100.0)
+profiler.checkpoint("üst hesaplar")
 
 # =============================
 # Başlık + pano
@@ -227,6 +352,18 @@ with st.sidebar:
     if st.button("🔄 Baştan Başlat", use_container_width=True):
         hard_reset()
         st.rerun()
+    st.session_state.seed = int(st.number_input(
+        "Oturum tohumu", min_value=0, max_value=999_999, value=int(st.session_state.seed), step=1,
+        help="Her dönemin rastgele akışı (tohum, dönem) çiftinden türetilir. Aynı tohum ve kararlar aynı sonuçları verir."
+    ))
+    cache_stats = RESULT_CACHE.stats()
+    st.caption(
+        f"Paylaşılan önbellek: {cache_stats.entries} kayıt, {cache_stats.bytes / 1024 ** 2:.1f} MB, "
+        f"isabet oranı {fmt_pct(cache_stats.hit_rate)}"
+    )
+    st.checkbox("⏱️ Performans ölçümü", key="profile_enabled",
+                help="Açıkken rerun bölümlerinin ve sıcak yolların süreleri kaydedilir (kenar çubuğunun altında).")
+profiler.checkpoint("pano + kenar çubuğu")
 
 # =============================
 # INTRO
@@ -254,8 +391,7 @@ Bir poliçenin, bir fiyatlama döneminde ortalama ne kadar hasar maliyeti üretm
     ans, ok = ask_mcq("intro", "Beklenen hasar/poliçe hangi iki şeyin çarpımıdır?", options, correct, "q_intro")
 
     if st.button("Cevabı Gönder", use_container_width=True):
-        st.session_state.quiz_submitted["intro"] = True
-        st.session_state.quiz_ok["intro"] = ok
+        submit_quiz("intro", ok)
         st.rerun()
 
     if st.session_state.quiz_submitted["intro"]:
@@ -328,8 +464,7 @@ Seçim iki şeyi belirler:
     ans, ok = ask_mcq("1", "Hasar olasılığı (p) artarsa, beklenen hasar/poliçe için en doğru ifade hangisidir?", options, correct, "q1")
 
     if st.button("Cevabı Gönder", use_container_width=True):
-        st.session_state.quiz_submitted[1] = True
-        st.session_state.quiz_ok[1] = ok
+        submit_quiz(1, ok)
         st.rerun()
 
     if st.session_state.quiz_submitted[1]:
@@ -363,7 +498,7 @@ elif st.session_state.step == 2:
     p_claim = SCENARIOS[st.session_state.scenario]["p_claim"]
     mean_loss = SCENARIOS[st.session_state.scenario]["mean_loss"]
     expected_loss_per_policy = p_claim * mean_loss
-    suggested_gross = expected_loss_per_policy * (1 + st.session_state.expense_loading + st.session_state.profit_loading)
+    suggested_gross = suggested_gross_premium(p_claim, mean_loss, st.session_state.expense_loading, st.session_state.profit_loading)
 
     st.success(
         f"Teknik prim: **{fmt_tl(expected_loss_per_policy)}**\n\n"
@@ -380,8 +515,7 @@ elif st.session_state.step == 2:
     ans, ok = ask_mcq("2", "Gider oranı artarsa önerilen brüt prim ne olur?", options, correct, "q2")
 
     if st.button("Cevabı Gönder", use_container_width=True):
-        st.session_state.quiz_submitted[2] = True
-        st.session_state.quiz_ok[2] = ok
+        submit_quiz(2, ok)
         st.rerun()
 
     if st.session_state.quiz_submitted[2]:
@@ -414,7 +548,7 @@ elif st.session_state.step == 3:
     p_claim = SCENARIOS[st.session_state.scenario]["p_claim"]
     mean_loss = SCENARIOS[st.session_state.scenario]["mean_loss"]
     expected_loss_per_policy = p_claim * mean_loss
-    suggested_gross = expected_loss_per_policy * (1 + st.session_state.expense_loading + st.session_state.profit_loading)
+    suggested_gross = suggested_gross_premium(p_claim, mean_loss, st.session_state.expense_loading, st.session_state.profit_loading)
     premium_choice = suggested_gross * (st.session_state.premium_factor / 100.0)
 
     if st.session_state.premium_factor < 90:
@@ -432,8 +566,7 @@ elif st.session_state.step == 3:
     ans, ok = ask_mcq("3", "Prim çok düşerse en olası etki hangisidir?", options, correct, "q3")
 
     if st.button("Cevabı Gönder", use_container_width=True):
-        st.session_state.quiz_submitted[3] = True
-        st.session_state.quiz_ok[3] = ok
+        submit_quiz(3, ok)
         st.rerun()
 
     if st.session_state.quiz_submitted[3]:
@@ -473,6 +606,84 @@ Prim “rekabetçi/makul” seviyedeyken, bu fiyatlama döneminde satılmasını
     )
     st.info(f"Bu prim düzeyinde tahmini satış: **{n_est:,} poliçe**")
 
+    # Talep ve prim geliri eğrisi: prim düzeyi kaydırıcısının tüm aralığı tek çağrıda
+    curve_factors = np.linspace(60, 160, 201)
+    curve_premiums = suggested_gross * curve_factors / 100.0
+    curve_policies = demand_from_premium(
+        premium=curve_premiums,
+        base_policies=st.session_state.base_policies,
+        reference_premium=suggested_gross if suggested_gross > 0 else 1.0,
+        sensitivity=st.session_state.sensitivity
+    )
+    curve = pd.DataFrame({
+        "Prim düzeyi (%)": curve_factors,
+        "Prim/poliçe": curve_premiums,
+        "Poliçe": curve_policies,
+        "Prim Geliri": curve_policies * curve_premiums,
+    })
+    best = curve.iloc[int(curve["Prim Geliri"].to_numpy().argmax())]
+
+    x = alt.X("Prim düzeyi (%):Q", scale=alt.Scale(domain=[60, 160]))
+    policies_line = alt.Chart(curve).mark_line(color="#1f77b4").encode(
+        x=x, y=alt.Y("Poliçe:Q", axis=alt.Axis(title="Poliçe", titleColor="#1f77b4")), tooltip=list(curve.columns)
+    )
+    revenue_line = alt.Chart(curve).mark_line(color="#2ca02c").encode(
+        x=x, y=alt.Y("Prim Geliri:Q", axis=alt.Axis(title="Prim Geliri (TL)", titleColor="#2ca02c")), tooltip=list(curve.columns)
+    )
+    best_point = alt.Chart(pd.DataFrame([best])).mark_point(shape="diamond", size=150, filled=True, color="#2ca02c").encode(
+        x=x, y="Prim Geliri:Q", tooltip=list(curve.columns)
+    )
+    choice_rule = alt.Chart(pd.DataFrame({"Prim düzeyi (%)": [st.session_state.premium_factor]})).mark_rule(
+        color="black", strokeDash=[4, 4]
+    ).encode(x=x)
+    with profiler.timed("grafik: talep/gelir eğrisi"):
+        st.altair_chart(
+            alt.layer(policies_line, alt.layer(revenue_line, best_point).resolve_scale(y="shared"), choice_rule)
+            .resolve_scale(y="independent"),
+            use_container_width=True,
+        )
+    st.caption(
+        f"◆ Prim gelirini en çok yapan düzey: **%{best['Prim düzeyi (%)']:.0f}** "
+        f"({fmt_tl(best['Prim/poliçe'])}, {int(best['Poliçe']):,} poliçe, gelir {fmt_tl(best['Prim Geliri'])}). "
+        "Kesikli çizgi: seçili prim düzeyi. Not: en yüksek gelir, en yüksek kâr demek değildir."
+    )
+
+    with st.expander("🗺️ Prim düzeyi × duyarlılık haritası", expanded=False):
+        surface = get_sweep_surface()
+        metrics = {
+            "Beklenen Combined Ratio": "expected_cr",
+            "Simüle Combined Ratio": "simulated_cr",
+            "Beklenen UW Sonucu (dönem)": "expected_uw",
+            "Simüle UW Sonucu (dönem)": "simulated_uw",
+            "İflas olasılığı (12 dönem)": "ruin_probability",
+            "Poliçe": "policies",
+        }
+        metric_label = st.selectbox("Gösterilecek değer", list(metrics.keys()), key="sweep_metric")
+
+        factor_grid, sens_grid = np.meshgrid(surface["premium_factor"], surface["sensitivity"], indexing="ij")
+        grid = pd.DataFrame({
+            "Prim düzeyi (%)": factor_grid.ravel(),
+            "Duyarlılık": sens_grid.ravel(),
+            metric_label: surface[metrics[metric_label]].ravel(),
+        })
+        choice = pd.DataFrame({
+            "Prim düzeyi (%)": [st.session_state.premium_factor],
+            "Duyarlılık": [round(st.session_state.sensitivity, 1)],
+        })
+
+        heat = alt.Chart(grid).mark_rect().encode(
+            x=alt.X("Prim düzeyi (%):O"),
+            y=alt.Y("Duyarlılık:O", sort="descending"),
+            color=alt.Color(f"{metric_label}:Q", scale=alt.Scale(scheme="redyellowgreen", reverse=metrics[metric_label] in ("expected_cr", "simulated_cr", "ruin_probability"))),
+            tooltip=list(grid.columns),
+        )
+        marker = alt.Chart(choice).mark_point(shape="diamond", size=200, filled=True, color="black").encode(
+            x="Prim düzeyi (%):O", y=alt.Y("Duyarlılık:O", sort="descending")
+        )
+        with profiler.timed("grafik: duyarlılık haritası"):
+            st.altair_chart(heat + marker, use_container_width=True)
+        st.caption("◆ Seçili prim düzeyi ve duyarlılık")
+
     st.divider()
     st.write("Mini Soru:")
 
@@ -481,8 +692,7 @@ Prim “rekabetçi/makul” seviyedeyken, bu fiyatlama döneminde satılmasını
     ans, ok = ask_mcq("4", "Fiyata duyarlılık yükselirse prim artınca satış nasıl değişir?", options, correct, "q4")
 
     if st.button("Cevabı Gönder", use_container_width=True):
-        st.session_state.quiz_submitted[4] = True
-        st.session_state.quiz_ok[4] = ok
+        submit_quiz(4, ok)
         st.rerun()
 
     if st.session_state.quiz_submitted[4]:
@@ -517,60 +727,260 @@ elif st.session_state.step == 5:
     }
     st.dataframe(pd.DataFrame([summary]), use_container_width=True)
 
+    # Kip yalnızca ilk dönemden önce seçilir; Baştan Başlat ile değiştirilebilir
+    st.session_state.portfolio_mode = st.checkbox(
+        "Kalıcı portföy (poliçeler yenilenir, iptal olur, yeni iş eklenir)",
+        value=st.session_state.portfolio_mode,
+        disabled=len(st.session_state.history) > 0,
+        help="Kapalıyken her dönem referans satış büyüklüğünde yeni ve homojen bir portföy simüle edilir.",
+    )
+
     b1, b2 = st.columns(2)
     if b1.button("⬅ Geri", use_container_width=True):
         go_prev(); st.rerun()
 
     def simulate_one_pricing_period():
-        n_policies = demand_from_premium(
-            premium=premium_choice,
-            base_policies=st.session_state.base_policies,
-            reference_premium=suggested_gross if suggested_gross > 0 else 1.0,
-            sensitivity=st.session_state.sensitivity
-        )
-
+        reference_premium = suggested_gross if suggested_gross > 0 else 1.0
         st.session_state.period += 1
-        n_claims, total_loss = simulate_period(
-            n_policies=n_policies,
-            p_claim=p_claim,
-            mean_loss=mean_loss,
-            seed=None
-        )
-
-        premium_income = float(n_policies) * float(premium_choice)
-        expense = premium_income * st.session_state.expense_loading
-        uw_result = premium_income - total_loss - expense
-        st.session_state.capital += uw_result
-        combined_ratio = (total_loss + expense) / premium_income if premium_income > 0 else 0.0
-
-        if premium_income == 0:
+        seed = period_seed(st.session_state.seed, st.session_state.period)
+
+        if st.session_state.portfolio_mode:
+            if st.session_state.portfolio is None:
+                # Başlangıç portföyü dönem akışlarından ayrı (0, 1) akışıyla kurulur
+                st.session_state.portfolio = Portfolio(
+                    st.session_state.base_policies, p_claim, mean_loss,
+                    seed=np.random.SeedSequence(st.session_state.seed, spawn_key=(0, 1)),
+                )
+            period = profiler.wrap(st.session_state.portfolio.run_period, "portföy dönemi")(
+                premium=premium_choice,
+                reference_premium=reference_premium,
+                base_policies=st.session_state.base_policies,
+                sensitivity=st.session_state.sensitivity,
+                seed=seed,
+                p_claim=p_claim,
+                mean_loss=mean_loss,
+            )
+            n_policies, n_claims, total_loss = period.policies, period.n_claims, period.total_loss
+        else:
+            n_policies = demand_from_premium(
+                premium=premium_choice,
+                base_policies=st.session_state.base_policies,
+                reference_premium=reference_premium,
+                sensitivity=st.session_state.sensitivity
+            )
+            n_claims, total_loss = simulate_period(
+                n_policies=n_policies,
+                p_claim=p_claim,
+                mean_loss=mean_loss,
+                seed=seed,
+                severity=SCENARIOS[st.session_state.scenario].get("severity"),
+            )
+
+        result = pricing_period_result(n_policies, premium_choice, n_claims, total_loss, st.session_state.expense_loading)
+        st.session_state.capital += result["UW Sonucu"]
+
+        if result["Prim Geliri"] == 0:
             comment = "Satış yok: prim rekabetçi seviyenin çok üzerinde kalmış görünüyor."
         else:
-            if combined_ratio < 1.0:
+            if result["Combined Ratio"] < 1.0:
                 comment = "✅ Teknik kâr: Combined Ratio < 1."
             else:
                 comment = "⚠️ Teknik zarar: Combined Ratio > 1."
 
         st.session_state.last_commentary = comment
 
-        st.session_state.history.append({
+        row = {
             "Fiyatlama Dönemi": st.session_state.period,
-            "Poliçe": n_policies,
+            "Piyasa koşulu": st.session_state.scenario,
+            "Tohum": st.session_state.seed,
+            "Poliçe": result["Poliçe"],
             "Referans Satış (poliçe)": st.session_state.base_policies,
-            "Prim/poliçe": premium_choice,
-            "Prim Geliri": premium_income,
-            "Hasar Adedi": n_claims,
-            "Toplam Hasar": total_loss,
-            "Gider": expense,
-            "UW Sonucu": uw_result,
-            "Combined Ratio": combined_ratio,
+            **{k: v for k, v in result.items() if k != "Poliçe"},
             "Sermaye": st.session_state.capital
-        })
+        }
+        st.session_state.history.append(row)
+        if store is not None:
+            store.record_period(st.session_state.session_id, row)
 
     if b2.button("📣 Bu primle piyasaya çık (1 dönem simüle et)", use_container_width=True):
         simulate_one_pricing_period()
         st.rerun()
 
+    st.divider()
+    st.subheader("🌐 Bu fiyatla 12 dönem: olası sermaye yolları")
+    if st.session_state.portfolio_mode:
+        st.caption("Kalıcı portföy kipindesin: bu bölümdeki analizler, dönem simülasyonundan farklı olarak "
+                   "her dönem yeni ve homojen bir referans portföyü modeller.")
+    n_paths = st.select_slider("Yol sayısı", options=[1_000, 10_000, 50_000, 100_000, 200_000], value=100_000)
+
+    n_policies_est = demand_from_premium(
+        premium=premium_choice,
+        base_policies=st.session_state.base_policies,
+        reference_premium=suggested_gross if suggested_gross > 0 else 1.0,
+        sensitivity=st.session_state.sensitivity
+    )
+    paths = cached_capital_paths(
+        n_paths=n_paths,
+        n_policies=n_policies_est,
+        p_claim=p_claim,
+        mean_loss=mean_loss,
+        premium=premium_choice,
+        expense_loading=st.session_state.expense_loading,
+        capital0=st.session_state.capital0,
+        seed=ANALYTICS_SEED,
+    )
+
+    st.markdown("**Tek dönem risk göstergeleri (analitik, FFT)**")
+    if SCENARIOS[st.session_state.scenario].get("severity", {}).get("dist", "exponential") == "exponential":
+        risk = cached_period_metrics(
+            n_policies=n_policies_est,
+            p_claim=p_claim,
+            mean_loss=mean_loss,
+            premium=premium_choice,
+            expense_loading=st.session_state.expense_loading,
+        )
+        a1, a2, a3, a4 = st.columns(4)
+        a1.metric("P(Combined Ratio > 1)", fmt_pct(risk["prob_cr_above_1"]))
+        a2.metric("Beklenen UW Sonucu", fmt_tl(risk["expected_uw"]))
+        a3.metric("UW zararı VaR %99,5", fmt_tl(risk["uw_var"][0.995]))
+        a4.metric("UW zararı TVaR %99,5", fmt_tl(risk["uw_tvar"][0.995]))
+        first_uw = paths["capital"][:, 0] - st.session_state.capital0
+        st.caption(
+            f"Monte Carlo kontrolü ({n_paths:,} yolun ilk dönemi): P(CR > 1) ≈ {fmt_pct(float((first_uw < 0).mean()))}, "
+            f"ortalama UW ≈ {fmt_tl(float(first_uw.mean()))}"
+        )
+    else:
+        st.caption("Analitik yol yalnızca üstel hasar dağılımı için geçerlidir; bu senaryoda Monte Carlo sonuçlarına bakın.")
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("İflas olasılığı (12 dönemde)", fmt_pct(paths["ruin_probability"]))
+    m2.metric("Dönem sonu sermaye (medyan)", fmt_tl(float(np.median(paths["final_capital"]))))
+    m3.metric("Dönem sonu sermaye (%5)", fmt_tl(float(np.quantile(paths["final_capital"], 0.05))))
+
+    fan = pd.DataFrame(
+        {f"%{int(q * 100)}": np.concatenate([[st.session_state.capital0], v]) for q, v in paths["quantiles"].items()},
+        index=pd.RangeIndex(0, paths["capital"].shape[1] + 1, name="Fiyatlama Dönemi"),
+    )
+    with profiler.timed("grafik: sermaye yelpazesi"):
+        st.line_chart(fan)
+
+    counts, edges = np.histogram(paths["final_capital"], bins=40)
+    st.caption("Dönem sonu sermaye dağılımı")
+    with profiler.timed("grafik: dönem sonu sermaye"):
+        st.bar_chart(pd.DataFrame({"Yol": counts}, index=pd.Index(np.round((edges[:-1] + edges[1:]) / 2, -3), name="Sermaye")))
+
+    with st.expander("🧩 Çok branşlı portföy: katastrof yılı ve çeşitlendirme", expanded=False):
+        st.caption(
+            "Konut, kasko ve işyeri branşları aynı prim düzeyi, gider ve tampon/kâr oranıyla fiyatlanır. "
+            "Katastrof yılında tüm branşların hasar olasılığı birlikte artar."
+        )
+        cat_pct = st.slider("Katastrof yılı olasılığı (%)", 0, 20, 5, key="cat_probability")
+        multi = cached_multiline(
+            expense_loading=st.session_state.expense_loading,
+            profit_loading=st.session_state.profit_loading,
+            premium_factor=st.session_state.premium_factor,
+            cat_probability=cat_pct / 100.0,
+            capital0=st.session_state.capital0,
+            seed=ANALYTICS_SEED,
+        )
+        with profiler.timed("tablo: çok branşlı portföy"):
+            st.dataframe(pd.DataFrame({
+                "Prim/poliçe": [fmt_tl(x) for x in multi["premium"]],
+                "Beklenen CR": np.round(multi["expected_cr"], 3),
+                "Simüle CR": np.round(multi["combined_ratio"], 3),
+                "CR %99": np.round(multi["cr_q99"], 3),
+                "Gereken sermaye (tek başına)": [fmt_tl(x) for x in multi["required_capital"]],
+            }, index=pd.Index(multi["lines"], name="Branş")), use_container_width=True)
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric("Portföy CR (ort. / %99)", f"{multi['aggregate_combined_ratio']:.2f} / {multi['aggregate_cr_q99']:.2f}")
+        k2.metric(f"Gereken sermaye (iflas ≤ {fmt_pct(multi['target_ruin'])})", fmt_tl(multi["aggregate_required_capital"]))
+        k3.metric("Çeşitlendirme faydası", fmt_pct(multi["diversification_benefit"]))
+        k4.metric("İflas olasılığı (başlangıç sermayesiyle)", fmt_pct(multi["ruin_probability"]))
+        if cat_pct > 0:
+            st.caption(
+                f"Katastrof yıllarında portföy CR ortalaması {multi['cat_year_cr']:.2f}; branşların hasar prim "
+                f"oranları arasındaki korelasyon en fazla {np.max(np.triu(multi['loss_ratio_correlation'], 1)):.2f}."
+            )
+
+    with st.expander("🤖 Koçun önerileri otomatik pilotta", expanded=False):
+        st.caption(
+            "Koçun fiyat önerileri her dönem uygulanır (CR < 1 → −%5; 1–1,10 → +%7,5; ≥ 1,10 → +%15; satış yoksa "
+            "%110'a çek) ve 12 dönem boyunca binlerce yolda sabit primle ve senin kuralınla karşılaştırılır."
+        )
+        r1, r2 = st.columns(2)
+        raise_pct = r1.slider("Senin kuralın: CR ≥ 1 ise artış (%)", 0, 30, 10, key="rule_raise")
+        cut_pct = r2.slider("Senin kuralın: CR < 1 ise indirim (%)", 0, 30, 5, key="rule_cut")
+        autopilot = autopilot_comparison(
+            p_claim=p_claim,
+            mean_loss=mean_loss,
+            expense_loading=st.session_state.expense_loading,
+            profit_loading=st.session_state.profit_loading,
+            base_policies=st.session_state.base_policies,
+            sensitivity=st.session_state.sensitivity,
+            capital0=st.session_state.capital0,
+            premium_factor=st.session_state.premium_factor,
+            raise_pct=raise_pct,
+            cut_pct=cut_pct,
+            n_paths=5_000,
+            seed=ANALYTICS_SEED,
+        )
+        with profiler.timed("tablo: otomatik pilot"):
+            st.dataframe(pd.DataFrame({
+                "Dönem sonu sermaye (ort.)": [fmt_tl(r["final_capital_mean"]) for r in autopilot.values()],
+                "Dönem sonu sermaye (%5)": [fmt_tl(r["final_capital_p05"]) for r in autopilot.values()],
+                "İflas olasılığı": [fmt_pct(r["ruin_probability"]) for r in autopilot.values()],
+                "Combined Ratio": [round(r["combined_ratio"], 3) for r in autopilot.values()],
+                "CR oynaklığı": [round(r["cr_volatility"], 3) for r in autopilot.values()],
+            }, index=pd.Index(list(autopilot), name="Politika")), use_container_width=True)
+        st.caption("Ortalama sermaye (dönem bazında)")
+        with profiler.timed("grafik: otomatik pilot sermayesi"):
+            st.line_chart(pd.DataFrame(
+                {name: r["capital_by_period"] for name, r in autopilot.items()},
+                index=pd.RangeIndex(1, len(next(iter(autopilot.values()))["capital_by_period"]) + 1, name="Fiyatlama Dönemi"),
+            ))
+
+    with st.expander("🏁 Rekabetçi piyasa: rakip sigortacılar", expanded=False):
+        st.caption(
+            "Toplam piyasa talebi sigortacılar arasında fiyata göre paylaşılır: ucuz olan pay kazanır. "
+            "Rakipler sabit prim, piyasayı takip, fiyat kırma veya CR hedefli kurallarla fiyat belirler. "
+            "Sermayesi eksiye düşen piyasadan çıkar."
+        )
+        n_rivals = st.slider("Rakip sayısı", 1, 30, 3, key="n_rivals")
+        insurers = make_insurers(
+            n_rivals,
+            expense_loading=st.session_state.expense_loading,
+            profit_loading=st.session_state.profit_loading,
+            capital0=st.session_state.capital0,
+            premium_factor=st.session_state.premium_factor,
+            seed=ANALYTICS_SEED,
+        )
+        market = cached_market(
+            insurers,
+            p_claim=p_claim,
+            mean_loss=mean_loss,
+            market_policies=st.session_state.base_policies * (n_rivals + 1),
+            sensitivity=st.session_state.sensitivity,
+            n_trials=5_000,
+            seed=ANALYTICS_SEED,
+        )
+        with profiler.timed("tablo: rekabetçi piyasa"):
+            st.dataframe(pd.DataFrame({
+                "Başlangıç primi": [fmt_tl(x) for x in market["base_premium"]],
+                "Ort. pazar payı": [fmt_pct(x) for x in market["mean_share"]],
+                "Ort. poliçe/dönem": np.round(market["mean_policies"]).astype(int),
+                "Combined Ratio": np.round(market["mean_cr"], 3),
+                "İflas olasılığı": [fmt_pct(x) for x in market["ruin_probability"]],
+                "Dönem sonu sermaye (medyan)": [fmt_tl(x) for x in market["final_capital_median"]],
+            }, index=pd.Index(market["insurers"], name="Sigortacı")), use_container_width=True)
+        st.caption("Senin ortalama pazar payın ve prim düzeyinin piyasa ortalamasına oranı (dönem bazında)")
+        with profiler.timed("grafik: pazar payı"):
+            st.line_chart(pd.DataFrame({
+                "Pazar payın": market["share_by_period"][0],
+                "Prim / piyasa ort.": market["mean_premium_by_period"][0] / market["mean_premium_by_period"].mean(axis=0),
+            }, index=pd.RangeIndex(1, market["share_by_period"].shape[1] + 1, name="Fiyatlama Dönemi")))
+
+profiler.checkpoint(f"adım {st.session_state.step} render")
+
 # =============================
 # Sonuçlar + Koç
 # =============================
@@ -579,8 +989,9 @@ st.divider()
 if st.session_state.last_commentary:
     st.success(st.session_state.last_commentary)
 
-if st.session_state.history:
-    df = pd.DataFrame(st.session_state.history)
+history = st.session_state.history
+if history:
+    results_table = history.view("table", profiler.wrap(history_table, "Arrow: sonuç tablosu"))
 
     with st.expander("📘 Sonuç kalemleri (kısa açıklama)", expanded=False):
         st.markdown(
@@ -598,10 +1009,51 @@ if st.session_state.history:
         )
 
     st.subheader("📊 Sonuç Tablosu")
-    st.dataframe(df, use_container_width=True)
+    if len(history) > results_table.num_rows:
+        st.caption(f"Toplam {len(history):,} dönem; tabloda son {results_table.num_rows:,} dönem gösteriliyor.")
+    st.dataframe(results_table, use_container_width=True)
+
+    with st.expander("🔁 Geçmiş bir dönemi yeniden üret", expanded=False):
+        portfolio = st.session_state.portfolio
+        st.caption(
+            "Her dönemin sonucu tabloda saklanır, ama (tohum, dönem) anahtarı ve o dönemin kararlarıyla da yeniden "
+            "üretilebilir. Burada seçilen dönem yeniden hesaplanıp tablodaki satırla karşılaştırılır"
+            + ("; kalıcı portföy o döneme kadar en yakın ara kayıttan yeniden işletilir." if portfolio is not None else ".")
+        )
+        periods = history.column("Fiyatlama Dönemi")
+        # Uzun geçmişte seçim kutusu her rerun'da binlerce seçenek taşırdı; sayı girişi sabit boyutludur
+        replay_at = st.number_input("Fiyatlama dönemi", min_value=int(periods[0]), max_value=int(periods[-1]),
+                                    value=int(periods[-1]), step=1, key="replay_period")
+        row = history[int(np.flatnonzero(periods == replay_at)[0])]
+        replayed = None
+        if portfolio is None:
+            replay_scenario = SCENARIOS[row["Piyasa koşulu"]]
+            n_claims_r, total_loss_r = replay_period(
+                seed=int(row["Tohum"]),
+                period=int(replay_at),
+                n_policies=int(row["Poliçe"]),
+                p_claim=replay_scenario["p_claim"],
+                mean_loss=replay_scenario["mean_loss"],
+                severity=replay_scenario.get("severity"),
+            )
+            replayed = (int(row["Poliçe"]), n_claims_r, total_loss_r)
+        elif st.button("🔁 Portföyü bu döneme kadar yeniden işlet", key="replay_portfolio"):
+            # Portföy tekrarı dönem sayısıyla büyür; yalnızca istenince çalışır
+            period = portfolio.replay(int(replay_at))
+            replayed = (period.policies, period.n_claims, period.total_loss)
+
+        if replayed is not None:
+            n_policies_r, n_claims_r, total_loss_r = replayed
+            same = (n_policies_r == int(row["Poliçe"]) and n_claims_r == int(row["Hasar Adedi"])
+                    and np.isclose(total_loss_r, float(row["Toplam Hasar"])))
+            st.write(f"Tohum **{int(row['Tohum'])}**, dönem **{replay_at}** → hasar adedi **{n_claims_r:,}**, toplam hasar **{fmt_tl(total_loss_r)}**")
+            if same:
+                st.success("Tablodaki sonuçla birebir aynı.")
+            else:
+                st.warning("Tablodaki sonuçtan farklı.")
 
     st.subheader("🧠 Koç: Bu dönem ne oldu, bir sonraki adım ne olmalı?")
-    diagnosis, actions, roadmap = compute_last_insights(df, suggested_gross, premium_choice)
+    diagnosis, actions, roadmap = compute_last_insights(history, suggested_gross, premium_choice)
 
     cl, cr = st.columns([1, 1])
     with cl:
@@ -617,10 +1069,47 @@ if st.session_state.history:
     for r in roadmap:
         st.write("•", r)
 
+    # Kurallar tüm geçmişe tek geçişte uygulanır (her satır kendi primiyle); sayımlar bir sonraki döneme kadar saklanır
+    coach_counts = history.view(f"coach_counts:{suggested_gross}",
+                                lambda h: evaluate_table(h, suggested_gross).counts())
+    st.caption(
+        f"Tüm dönemler: teknik kâr **{coach_counts['teknik_kar']}**, sınırda **{coach_counts['sinirda']}**, "
+        f"teknik zarar **{coach_counts['teknik_zarar']}**, satış yok **{coach_counts['satis_yok']}** dönem · "
+        f"ucuz **{coach_counts['ucuz']}**, pahalı **{coach_counts['pahali']}** · "
+        f"zayıf satış **{coach_counts['satis_zayif']}**, güçlü satış **{coach_counts['satis_guclu']}** dönem"
+    )
+
     st.subheader("📈 Trendler")
-    st.line_chart(df.set_index("Fiyatlama Dönemi")[["Prim Geliri", "Toplam Hasar"]])
-    st.line_chart(df.set_index("Fiyatlama Dönemi")[["Combined Ratio"]])
-    st.line_chart(df.set_index("Fiyatlama Dönemi")[["Sermaye"]])
+    for name, data, spec in history.view("trend_charts", profiler.wrap(trend_charts, "grafik verisi: trendler")):
+        with profiler.timed(name):
+            st.vega_lite_chart(data, spec, use_container_width=True)
+
+    with st.expander("🧾 Hasar gelişimi ve rezerv (IBNR)", expanded=False):
+        st.caption(
+            "Tablodaki UW Sonucu ve Sermaye her dönemin nihai hasarıyla hesaplanır. Gerçekte hasarlar sonraki "
+            "dönemlerde bildirilip ödenir; şirket dönem sonunda yalnızca ödenen ve bildirilen hasarı görür, "
+            "kalanı (muallak + IBNR) tahmin etmek zorundadır."
+        )
+        pattern = st.selectbox("Gelişme deseni", list(DEVELOPMENT_PATTERNS), index=1, key="development_pattern")
+        reserves = history.view(f"reserves:{pattern}", profiler.wrap(
+            lambda h: reserve_view(h, pattern), "rezerv: üçgen + bootstrap"))
+        st.caption("Kümülatif ödenen hasar üçgeni (TL; boş hücreler henüz gözlenmedi)")
+        st.dataframe(reserves["triangle"], use_container_width=True)
+        st.dataframe(reserves["estimates"], use_container_width=True)
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric("Bu dönem ödenen hasar", fmt_tl(reserves["paid_this_period"]))
+        k2.metric("Rezerv tahmini (CL / BF)", f"{fmt_tl(reserves['cl_reserve'])} / {fmt_tl(reserves['bf_reserve'])}")
+        k3.metric("Rezerv %95 (bootstrap)", fmt_tl(reserves["bootstrap_q95"]))
+        k4.metric(
+            "Sermaye (tahmini rezervle)",
+            fmt_tl(history.column("Sermaye")[-1] + reserves["true_reserve"] - reserves["cl_reserve"]),
+            delta=fmt_tl(reserves["true_reserve"] - reserves["cl_reserve"]),
+        )
+        st.caption(
+            f"Gerçek kalan ödeme {fmt_tl(reserves['true_reserve'])}; gerçekleşen üçgenden chain-ladder "
+            f"{fmt_tl(reserves['cl_incurred_reserve'])}. Bootstrap ({RESERVE_RESAMPLES:,} örnek) standart sapması "
+            f"{fmt_tl(reserves['bootstrap_std'])}."
+        )
 
     if st.session_state.period >= 12:
         if st.session_state.capital > st.session_state.capital0:
@@ -630,3 +1119,70 @@ if st.session_state.history:
             st.error("12 fiyatlama dönemi bitti: Sermaye düştü.")
 else:
     st.info("Adım adım ilerle: mini sorularla ilerleyip en sonda simülasyon çalıştırınca sonuçlar ve koç yorumları görünür.")
+
+profiler.checkpoint("sonuçlar + koç")
+
+# =============================
+# Eğitmen görünümü (?egitmen=<token>)
+# =============================
+if store is not None and is_instructor():
+    st.divider()
+    st.subheader("👩‍🏫 Eğitmen görünümü: tüm oturumlar")
+    overview = store.overview()
+    e1, e2, e3, e4 = st.columns(4)
+    e1.metric("Oturum", f"{overview['sessions']:,}")
+    e2.metric("12 dönemi bitiren", f"{overview['finished']:,}")
+    e3.metric("Simüle edilen dönem", f"{overview['periods']:,}")
+    e4.metric("Soru denemesi", f"{overview['quiz_attempts']:,}")
+
+    finished_only = st.checkbox("Yalnızca 12 dönemi bitirenler", value=True, key="instructor_finished")
+    capital = store.capital_distribution(min_periods=12 if finished_only else 1)
+    if capital["sessions"]:
+        st.caption(
+            "Son sermaye dağılımı — " + ", ".join(f"%{q * 100:g}: {fmt_tl(v)}" for q, v in capital["quantiles"].items())
+            + f" (ortalama {fmt_tl(capital['mean'])}, {capital['sessions']:,} oturum)"
+        )
+        st.bar_chart(pd.DataFrame(
+            {"Oturum": capital["counts"]},
+            index=pd.Index([fmt_tl(x) for x in (capital["edges"][:-1] + capital["edges"][1:]) / 2], name="Son sermaye"),
+        ))
+
+    by_scenario = store.cr_by_scenario()
+    if by_scenario:
+        st.dataframe(pd.DataFrame({
+            "Dönem": [r["periods"] for r in by_scenario],
+            "Combined Ratio": [round(r["combined_ratio"], 3) for r in by_scenario],
+            "Dönem CR ort. ± std": [f"{r['cr_mean']:.2f} ± {r['cr_std']:.2f}" for r in by_scenario],
+            "Zararlı dönem payı": [fmt_pct(r["loss_share"]) for r in by_scenario],
+        }, index=pd.Index([r["scenario"] for r in by_scenario], name="Piyasa koşulu")), use_container_width=True)
+
+    quiz = store.quiz_pass_rates()
+    if quiz:
+        st.dataframe(pd.DataFrame({
+            "Oturum": [r["sessions"] for r in quiz],
+            "Deneme": [r["attempts"] for r in quiz],
+            "İlk denemede doğru": [fmt_pct(r["first_try_rate"]) for r in quiz],
+            "Sonunda geçen": [fmt_pct(r["pass_rate"]) for r in quiz],
+        }, index=pd.Index([r["step"] for r in quiz], name="Soru (adım)")), use_container_width=True)
+
+    store_stats = store.stats()
+    st.caption(
+        f"Depo: {STORE_PATH} · {store_stats.written:,} kayıt {store_stats.batches:,} toplu yazımda yazıldı, "
+        f"kuyrukta {store_stats.queued}, düşürülen {store_stats.dropped}, hata {store_stats.errors}"
+    )
+
+# =============================
+# Performans paneli
+# =============================
+if profiler.enabled:
+    profiler.record("rerun (toplam)", time.perf_counter() - rerun_started)
+    with st.sidebar.expander("⏱️ Performans", expanded=True):
+        scope = st.radio("Kapsam", ["Bu oturum", "Süreç (tüm oturumlar)"], horizontal=True, key="profile_scope")
+        timings = st.session_state["_timings"] if scope == "Bu oturum" else PROCESS_TIMINGS
+        summary = timings.summary()
+        if summary:
+            table = pd.DataFrame.from_dict(summary, orient="index").sort_values("total_ms", ascending=False)
+            st.dataframe(table.round(2), use_container_width=True)
+        st.caption(f"Tamponda {len(timings):,} ölçüm (süreler ms).")
+        st.download_button("JSON olarak indir", timings.to_json(), file_name="sigorta_sureler.json",
+                           mime="application/json", use_container_width=True)
@@ -0,0 +1,278 @@
+"""
+Simülasyonun sıcak yolları için kıyaslama (benchmark) takımı.
+
+    python -m benchmarks.bench                              # çalıştır, JSON'u stdout'a yaz
+    python -m benchmarks.bench -o sonuc.json --filter simulate_period
+    python -m benchmarks.bench --save-baseline              # benchmarks/baseline.json'u güncelle
+    python -m benchmarks.bench --baseline benchmarks/baseline.json --threshold 0.25
+
+Referans dosyası verilmişse (veya benchmarks/baseline.json varsa) her vaka en iyi süresine
+göre karşılaştırılır; eşikten fazla yavaşlayan vaka varsa çıkış kodu 1 olur.
+Referans süreler makineye özgüdür: aynı makinede üretilmiş bir dosyayla karşılaştırın.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable, Iterator, NamedTuple
+
+import numpy as np
+
+from sigorta import (
+    SCENARIOS,
+    PeriodHistory,
+    Portfolio,
+    analytic_period_metrics,
+    bootstrap_reserves,
+    chain_ladder,
+    compute_last_insights,
+    demand_from_premium,
+    develop_claims,
+    evaluate_table,
+    make_insurers,
+    pricing_period_result,
+    simulate_market,
+    simulate_period,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[[], Callable[[], object]]
+
+def _history(n_rows: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    rows, capital = [], 1_000_000.0
+    for period in range(1, n_rows + 1):
+        n_claims, total_loss = simulate_period(2000, 0.08, 25_000, seed=rng)
+        result = pricing_period_result(2000, 2600.0, n_claims, total_loss, 0.20)
+        capital += result["UW Sonucu"]
+        rows.append({
+            "Fiyatlama Dönemi": period,
+            "Piyasa koşulu": "Standart Piyasa",
+            "Tohum": seed,
+            "Poliçe": result["Poliçe"],
+            "Referans Satış (poliçe)": 2000,
+            **{k: v for k, v in result.items() if k != "Poliçe"},
+            "Sermaye": capital,
+        })
+    return rows
+
+def _period_history(n_rows: int, seed: int = 0) -> PeriodHistory:
+    history = PeriodHistory()
+    for row in _history(n_rows, seed):
+        history.append(row)
+    return history
+
+def iter_cases() -> Iterator[Case]:
+    for exp in range(2, 9):
+        n = 10 ** exp
+        for name, scenario in SCENARIOS.items():
+            p, m = scenario["p_claim"], scenario["mean_loss"]
+            yield Case(
+                f"simulate_period[n=1e{exp},p={p}]",
+                lambda n=n, p=p, m=m: (lambda: simulate_period(n, p, m, seed=1)),
+            )
+    # Eski poliçe başına yol, çapraz kontrol ve hızlanmayı görmek için (bellek nedeniyle 1e7'e kadar)
+    for exp in range(2, 8):
+        n = 10 ** exp
+        yield Case(
+            f"simulate_period[n=1e{exp},p=0.08,per_policy]",
+            lambda n=n: (lambda: simulate_period(n, 0.08, 25_000, seed=1, method="per_policy")),
+        )
+
+    for exp in (3, 6, 8):
+        n = 10 ** exp
+        yield Case(
+            f"analytic_period_metrics[n=1e{exp}]",
+            lambda n=n: (lambda: analytic_period_metrics(n, 0.08, 25_000, 2600.0, 0.20)),
+        )
+
+    yield Case(
+        "demand_from_premium[scalar]",
+        lambda: (lambda: demand_from_premium(2600.0, 2000, 2600.0, 1.2)),
+    )
+    for size in (1_000, 100_000):
+        def setup(size=size):
+            premiums = np.linspace(0.6, 1.6, size) * 2600.0
+            return lambda: demand_from_premium(premiums, 2000, 2600.0, 1.2)
+        yield Case(f"demand_from_premium[array={size}]", setup)
+
+    for n_rows in (12, 1_000, 100_000):
+        def setup(n_rows=n_rows):
+            import pandas as pd
+            df = pd.DataFrame(_history(n_rows))
+            return lambda: compute_last_insights(df, 2600.0, 2600.0)
+        yield Case(f"compute_last_insights[rows={n_rows}]", setup)
+
+    for n_paths in (10_000, 100_000):
+        def setup(n_paths=n_paths):
+            triangle = develop_claims(np.full((n_paths, 12), 4e6), seed=0)
+            return lambda: chain_ladder(triangle.paid, triangle.mask)
+        yield Case(f"chain_ladder[paths={n_paths},origins=12]", setup)
+    for n_resamples in (10_000, 50_000):
+        def setup(n_resamples=n_resamples):
+            triangle = develop_claims(np.full(12, 4e6), seed=0)
+            return lambda: bootstrap_reserves(triangle.paid, triangle.mask, n_resamples, seed=1)
+        yield Case(f"bootstrap_reserves[resamples={n_resamples}]", setup)
+
+    for n_rows in (12, 100_000):
+        def setup(n_rows=n_rows):
+            history = _period_history(n_rows)
+            return lambda: compute_last_insights(history, 2600.0, 2600.0)
+        yield Case(f"compute_last_insights[history={n_rows}]", setup)
+
+    for n_rows in (100_000, 1_000_000):
+        def setup(n_rows=n_rows):
+            rng = np.random.default_rng(0)
+            batch = {
+                "Prim Geliri": rng.uniform(0, 5e6, n_rows),
+                "Combined Ratio": rng.uniform(0.6, 1.6, n_rows),
+                "Poliçe": rng.integers(0, 4_000, n_rows),
+                "Referans Satış (poliçe)": np.full(n_rows, 2_000),
+                "Prim/poliçe": rng.uniform(1_500, 4_000, n_rows),
+            }
+            return lambda: evaluate_table(batch, 2600.0).counts()
+        yield Case(f"evaluate_table[rows={n_rows}]", setup)
+
+    def setup_append():
+        rows = _history(1_000)
+
+        def fill():
+            history = PeriodHistory()
+            for row in rows:
+                history.append(row)
+        return fill
+    yield Case("period_history_append[rows=1000]", setup_append)
+
+    for size in (100_000, 1_000_000):
+        def setup(size=size):
+            portfolio = Portfolio(size, 0.08, 25_000, seed=0)
+            # Referans primde giriş ve çıkış dengede: portföy boyutu ölçüm boyunca sabit kalır
+            return lambda: portfolio.run_period(2600.0, 2600.0, size, 1.0)
+        yield Case(f"portfolio_period[policies={size}]", setup)
+
+    for n_insurers in (4, 40):
+        def setup(n_insurers=n_insurers):
+            insurers = make_insurers(n_insurers - 1)
+            return lambda: simulate_market(insurers, 0.08, 25_000, 2000 * n_insurers, 1.2, n_trials=10_000, seed=0)
+        yield Case(f"simulate_market[insurers={n_insurers},trials=10000]", setup)
+
+    for n_periods in (12, 5_000):
+        yield Case(f"app_rerun[step=5,periods={n_periods}]", lambda n_periods=n_periods: _setup_rerun(n_periods))
+        # Mini soru adımı: geçmiş değişmez, sonuç paneli önbellekteki görünümlerden çizilir
+        yield Case(f"app_rerun[step=1,periods={n_periods}]", lambda n_periods=n_periods: _setup_rerun(n_periods, step=1))
+
+def _setup_rerun(n_periods: int, step: int = 5):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.run()
+    at.session_state.history = _period_history(n_periods)
+    at.session_state.period = n_periods
+    at.session_state.step = step
+    at.session_state.seed = 0
+    at.run()
+
+    def rerun():
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return rerun
+
+def measure(fn: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> dict:
+    """timeit.autorange ile döngü sayısını seçer; çağrı başına en iyi ve medyan süreyi döndürür."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return {"best": min(times), "median": statistics.median(times), "loops": number, "repeat": repeat}
+
+def run(filter_text: str = "", repeat: int = 5, min_time: float = 0.2, log=sys.stderr) -> dict:
+    results = {}
+    for case in iter_cases():
+        if filter_text and filter_text not in case.name:
+            continue
+        try:
+            fn = case.setup()
+        except ImportError as e:
+            print(f"  atlandı {case.name}: {e}", file=log)
+            continue
+        results[case.name] = measure(fn, repeat=repeat, min_time=min_time)
+        print(f"  {case.name:<48} {results[case.name]['best'] * 1e3:12.4f} ms", file=log)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Ortak vakalar için oran = şimdiki / referans (en iyi süre). Eşiği aşanlar regresyondur."""
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or base["best"] <= 0:
+            continue
+        ratio = cur["best"] / base["best"]
+        rows.append({"name": name, "ratio": ratio, "regression": ratio > 1.0 + threshold})
+    return rows
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", help="Sonuç JSON dosyası (varsayılan: stdout)")
+    parser.add_argument("--filter", default="", help="Yalnızca adında bu metin geçen vakalar")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Bir ölçüm turunun asgari süresi (sn)")
+    parser.add_argument("--baseline", default=None, help=f"Referans JSON (varsayılan: varsa {DEFAULT_BASELINE})")
+    parser.add_argument("--threshold", type=float, default=0.25, help="İzin verilen yavaşlama oranı (0.25 = %%25)")
+    parser.add_argument("--save-baseline", action="store_true", help="Sonuçları referans dosyasına yaz")
+    args = parser.parse_args(argv)
+
+    current = run(args.filter, args.repeat, args.min_time)
+    payload = json.dumps(current, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        print(f"referans kaydedildi: {baseline_path}", file=sys.stderr)
+        return 0
+    if not os.path.exists(baseline_path):
+        if args.baseline:
+            print(f"hata: referans bulunamadı: {baseline_path}", file=sys.stderr)
+            return 2
+        return 0
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(current, baseline, args.threshold)
+    regressions = [r for r in rows if r["regression"]]
+    for r in rows:
+        flag = "  REGRESYON" if r["regression"] else ""
+        print(f"  {r['name']:<48} ×{r['ratio']:.2f}{flag}", file=sys.stderr)
+    if regressions:
+        print(f"{len(regressions)} vaka %{args.threshold * 100:.0f} eşiğinden fazla yavaşladı.", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
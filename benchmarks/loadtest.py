@@ -0,0 +1,211 @@
+"""
+Eş zamanlı oturum yük testi (streamlit.testing.v1.AppTest ile).
+
+Her sanal öğrenci sihirbazı baştan sona yürür: giriş ve 1–4. adımların mini sorularını doğru
+cevaplar, "İleri" ile 5. adıma geçer ve simülasyon düğmesine 12 kez basar. Her rerun'ın
+gecikmesi ölçülür.
+
+    python -m benchmarks.loadtest                                  # 8 oturum, 4 süreç
+    python -m benchmarks.loadtest --sessions 40 --processes 8 -o yuk.json
+
+Eş zamanlılık süreçlerle sağlanır: AppTest (Streamlit 1.32) iş parçacığı güvenli değildir
+(her çalıştırma genel Runtime örneğini değiştirir, Altair veri kümeleri paylaşılır). Her süreç
+kendi oturumlarını sırayla yürütür; süreçler aynı anda çalışıp CPU için yarışır.
+
+Rapor: rerun gecikmesinin p50/p95/p99'u (toplam ve eylem türüne göre), saniyede rerun ve
+dakikada tamamlanan oturum (kapasite), oturum başına bellek (süreçteki RSS artışı / açık oturum).
+Aynı süreçteki oturumlar sigorta.RESULT_CACHE'i paylaşır; bu, gerçek sunucudaki durumla aynıdır.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# (radyo anahtarı, doğru şık) — app.py'deki ask_mcq çağrılarıyla aynı sırada
+QUIZ_ANSWERS = (
+    ("q_intro", "hasar olasılığı (p) × ortalama hasar"),
+    ("q1", "Artar"),
+    ("q2", "Artar"),
+    ("q3", "Satış artar ama zarar riski artar"),
+    ("q4", "Daha hızlı düşer"),
+)
+SIMULATE_LABEL = "📣 Bu primle piyasaya çık (1 dönem simüle et)"
+N_PERIODS = 12
+
+class Rerun(NamedTuple):
+    action: str
+    seconds: float
+
+def _fix_rerun_triggers():
+    """
+    Streamlit 1.32 AppTest'inde st.rerun() sonrası düğme tetikleyicileri sıfırlanmaz ve betik
+    sonsuz döngüye girer (gerçek sunucuda sorun yoktur). Rerun nedeniyle biten çalıştırmada
+    tetikleyiciler, sunucudaki ScriptRunner'ın yaptığı gibi sıfırlanır.
+    """
+    from streamlit.runtime.scriptrunner import ScriptRunnerEvent
+    from streamlit.testing.v1 import local_script_runner
+
+    runner = local_script_runner.LocalScriptRunner
+    if getattr(runner._on_script_finished, "_resets_triggers", False):
+        return
+    original = runner._on_script_finished
+
+    def _on_script_finished(self, ctx, event, premature_stop):
+        if event == ScriptRunnerEvent.SCRIPT_STOPPED_FOR_RERUN:
+            self._session_state._state._reset_triggers()
+        original(self, ctx, event, premature_stop)
+
+    _on_script_finished._resets_triggers = True
+    runner._on_script_finished = _on_script_finished
+
+def _rss_bytes() -> int:
+    """Sürecin anlık yerleşik belleği (Linux'ta /proc, diğerlerinde tepe değer)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _button(at, label: str):
+    return next(b for b in at.main.button if b.label == label)
+
+def _timed(at, action: str, log: list, timeout: float):
+    t0 = time.perf_counter()
+    at.run(timeout=timeout)
+    log.append(Rerun(action, time.perf_counter() - t0))
+    if at.exception:
+        raise RuntimeError(f"{action}: {at.exception[0].message}")
+
+def run_session(timeout: float = 120.0, keep: Optional[list] = None) -> list:
+    """Tek bir oturumu baştan sona yürütür ve rerun gecikmelerini döndürür."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    log = []
+    _timed(at, "açılış", log, timeout)
+    for radio_key, answer in QUIZ_ANSWERS:
+        at.radio(key=radio_key).set_value(answer)
+        _button(at, "Cevabı Gönder").click()
+        _timed(at, "soru", log, timeout)
+        _button(at, "İleri ➜").click()
+        _timed(at, "ileri", log, timeout)
+    if at.session_state.step != 5:
+        raise RuntimeError(f"Sihirbaz 5. adıma ulaşmadı (adım {at.session_state.step}).")
+    for _ in range(N_PERIODS):
+        _button(at, SIMULATE_LABEL).click()
+        _timed(at, "simülasyon", log, timeout)
+    if at.session_state.period != N_PERIODS:
+        raise RuntimeError(f"{N_PERIODS} dönem yerine {at.session_state.period} dönem simüle edildi.")
+    if keep is not None:
+        keep.append(at)  # bellek ölçümü için oturum, tüm oturumlar bitene kadar yaşatılır
+    return log
+
+def run_sessions(n_sessions: int, timeout: float = 120.0) -> dict:
+    """Bu süreçte n_sessions oturumu sırayla çalıştırır (açık oturumlar sonuna kadar yaşatılır)."""
+    _fix_rerun_triggers()
+    run_session(timeout)  # ısınma: modül içe aktarma ve ilk derlemeler ölçüme girmesin
+    rss_before = _rss_bytes()
+    alive, reruns, errors = [], [], []
+    t0 = time.perf_counter()
+    for _ in range(n_sessions):
+        try:
+            reruns.extend(run_session(timeout, alive))
+        except Exception as ex:  # bir oturumun hatası diğerlerini durdurmaz
+            errors.append(repr(ex))
+    wall = time.perf_counter() - t0
+    rss_after = _rss_bytes()
+    return {
+        "reruns": [tuple(r) for r in reruns],
+        "errors": errors,
+        "wall_seconds": wall,
+        "sessions": len(alive),
+        "rss_delta": rss_after - rss_before,
+    }
+
+def _latency(values: list) -> dict:
+    values = sorted(v * 1000.0 for v in values)
+    if not values:
+        return {}
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {
+        "count": len(values),
+        "mean_ms": statistics.fmean(values),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": values[-1],
+    }
+
+def report(parts: list, wall: float, config: dict) -> dict:
+    reruns = [r for part in parts for r in part["reruns"]]
+    sessions = sum(part["sessions"] for part in parts)
+    by_action = {}
+    for action, seconds in reruns:
+        by_action.setdefault(action, []).append(seconds)
+    memory = [part["rss_delta"] / part["sessions"] for part in parts if part["sessions"]]
+    return {
+        "config": config,
+        "sessions_completed": sessions,
+        "errors": [e for part in parts for e in part["errors"]],
+        "wall_seconds": wall,
+        "throughput": {
+            "reruns_per_second": len(reruns) / wall if wall > 0 else 0.0,
+            "sessions_per_minute": 60.0 * sessions / wall if wall > 0 else 0.0,
+        },
+        "latency": _latency([s for _, s in reruns]),
+        "latency_by_action": {action: _latency(values) for action, values in by_action.items()},
+        "memory_per_session_mb": statistics.fmean(memory) / 1024 ** 2 if memory else None,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="Toplam oturum sayısı")
+    parser.add_argument("--processes", type=int, default=4, help="Eş zamanlı süreç sayısı (oturumlar eşit bölünür)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Tek bir rerun için zaman aşımı (sn)")
+    parser.add_argument("-o", "--output", help="JSON rapor dosyası (varsayılan: stdout)")
+    args = parser.parse_args(argv)
+
+    processes = max(1, min(args.processes, args.sessions))
+    config = {"sessions": args.sessions, "processes": processes}
+    shares = [args.sessions // processes + (i < args.sessions % processes) for i in range(processes)]
+    t0 = time.perf_counter()
+    if processes == 1:
+        parts = [run_sessions(shares[0], args.timeout)]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            parts = list(pool.map(run_sessions, shares, [args.timeout] * processes))
+    # Isınma süresi hariç: süreçlerin ölçülen en uzun süresi
+    wall = max(part["wall_seconds"] for part in parts)
+    result = report(parts, wall, config)
+    result["elapsed_seconds"] = time.perf_counter() - t0
+
+    lat = result["latency"]
+    print(f"{result['sessions_completed']} oturum, {lat.get('count', 0)} rerun, {result['wall_seconds']:.1f} sn", file=sys.stderr)
+    for action, stats in [("tümü", lat)] + list(result["latency_by_action"].items()):
+        if stats:
+            print(f"  {action:<12} p50 {stats['p50_ms']:8.1f} ms   p95 {stats['p95_ms']:8.1f} ms   "
+                  f"p99 {stats['p99_ms']:8.1f} ms", file=sys.stderr)
+    print(f"  {result['throughput']['reruns_per_second']:.1f} rerun/sn, "
+          f"{result['throughput']['sessions_per_minute']:.1f} oturum/dk", file=sys.stderr)
+    if result["memory_per_session_mb"] is not None:
+        print(f"  oturum başına bellek ≈ {result['memory_per_session_mb']:.1f} MB", file=sys.stderr)
+    for error in result["errors"]:
+        print(f"  HATA: {error}", file=sys.stderr)
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if result["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
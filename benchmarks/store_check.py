@@ -0,0 +1,192 @@
+"""
+Sınıf deposu tutarlılık denetimi.
+
+Rastgele oturumlar ClassroomStore'a yazılır (tekrar eden dönemler, satışsız dönemler, geçtikten
+sonra tekrar cevaplanan ve hiç geçilemeyen sorular dahil); ardından tetikleyicilerin güncellediği
+özet tablolar ve eğitmen sorguları ham tablolardan (periods, quiz_attempts) yeniden hesaplanan
+değerlerle karşılaştırılır.
+
+    python -m benchmarks.store_check                    # 300 oturum
+    python -m benchmarks.store_check --sessions 2000 --seed 7
+
+Depo kapatıldıktan sonra açık okuyucu bağlantısı ya da WAL dosyası kalmadığı da denetlenir.
+Uyuşmazlık varsa listelenir ve çıkış kodu 1 olur.
+"""
+import argparse
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+from sigorta import ClassroomStore, pricing_period_result
+
+SCENARIO_NAMES = ("Standart Piyasa", "Riskli Piyasa", "Sert Piyasa")
+QUIZ_STEPS = ("intro", 1, 2, 3, 4)
+N_PERIODS = 12
+
+def fill_store(store: ClassroomStore, n_sessions: int, seed: int = 0):
+    """n_sessions rastgele oturumu depoya yazar ve kuyruğun boşalmasını bekler."""
+    rng = np.random.default_rng(seed)
+    for s in range(n_sessions):
+        session_id = f"oturum-{s}"
+        for step in QUIZ_STEPS:
+            for _ in range(rng.integers(1, 5)):
+                store.record_quiz(session_id, step, bool(rng.random() < 0.5))
+
+        scenario = SCENARIO_NAMES[rng.integers(len(SCENARIO_NAMES))]
+        capital = 1_000_000.0
+        for period in range(1, rng.integers(1, N_PERIODS + 1) + 1):
+            policies = 0 if rng.random() < 0.05 else int(rng.integers(500, 3000))
+            premium = float(rng.uniform(1500.0, 3500.0))
+            n_claims = int(rng.binomial(policies, 0.08))
+            total_loss = float(rng.gamma(max(n_claims, 1), 25_000.0)) if n_claims else 0.0
+            result = pricing_period_result(policies, premium, n_claims, total_loss, 0.20)
+            capital += result["UW Sonucu"]
+            row = {"Fiyatlama Dönemi": period, "Piyasa koşulu": scenario, "Tohum": seed,
+                   **result, "Sermaye": capital}
+            store.record_period(session_id, row)
+            if rng.random() < 0.1:
+                store.record_period(session_id, row)    # tekrar: INSERT OR IGNORE ile atlanmalı
+    store.flush()
+
+def _expected(conn: sqlite3.Connection) -> dict:
+    """Özet tabloların ham tablolardan yeniden hesaplanmış karşılıkları."""
+    session_summary = conn.execute(
+        "SELECT p.session_id, p.scenario, COUNT(*), "
+        "  (SELECT capital FROM periods q WHERE q.session_id = p.session_id ORDER BY period DESC LIMIT 1), "
+        "  SUM(premium_income), SUM(total_loss + expense) "
+        "FROM periods p GROUP BY p.session_id ORDER BY p.session_id"
+    ).fetchall()
+    scenario_summary = conn.execute(
+        "SELECT scenario, COUNT(*), SUM(combined_ratio > 1), SUM(premium_income), SUM(total_loss + expense), "
+        "  SUM(premium_income > 0), "
+        "  TOTAL(CASE WHEN premium_income > 0 THEN combined_ratio END), "
+        "  TOTAL(CASE WHEN premium_income > 0 THEN combined_ratio * combined_ratio END) "
+        "FROM periods GROUP BY scenario ORDER BY scenario"
+    ).fetchall()
+    quiz_progress = conn.execute(
+        "SELECT session_id, step, COUNT(*), MAX(ok) FROM quiz_attempts "
+        "GROUP BY session_id, step ORDER BY session_id, step"
+    ).fetchall()
+    # İlk deneme: oturum ve soru başına en küçük id
+    quiz_summary = conn.execute(
+        "SELECT a.step, COUNT(*), SUM(a.ok), COUNT(DISTINCT a.session_id), "
+        "  (SELECT COUNT(*) FROM (SELECT session_id FROM quiz_attempts b WHERE b.step = a.step "
+        "                         GROUP BY session_id HAVING MAX(ok))), "
+        "  (SELECT COUNT(*) FROM quiz_attempts c WHERE c.step = a.step AND c.ok AND c.id = "
+        "     (SELECT MIN(id) FROM quiz_attempts d WHERE d.session_id = c.session_id AND d.step = c.step)) "
+        "FROM quiz_attempts a GROUP BY a.step ORDER BY a.step"
+    ).fetchall()
+    return {"session_summary": session_summary, "scenario_summary": scenario_summary,
+            "quiz_progress": quiz_progress, "quiz_summary": quiz_summary}
+
+_ACTUAL = {
+    "session_summary": "SELECT session_id, scenario, periods, capital, premium_income, total_cost "
+                       "FROM session_summary ORDER BY session_id",
+    "scenario_summary": "SELECT scenario, periods, loss_periods, premium_income, total_cost, cr_periods, "
+                        "cr_sum, cr_sq_sum FROM scenario_summary ORDER BY scenario",
+    "quiz_progress": "SELECT session_id, step, attempts, passed FROM quiz_progress ORDER BY session_id, step",
+    "quiz_summary": "SELECT step, attempts, correct, sessions, sessions_passed, first_try "
+                    "FROM quiz_summary ORDER BY step",
+}
+
+def _same(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+    return a == b
+
+def check_store(store: ClassroomStore) -> list:
+    """Özet tablolar ve eğitmen sorguları ham verilerle uyuşmuyorsa uyuşmazlık açıklamalarını döndürür."""
+    problems = []
+    conn = sqlite3.connect(store.path)
+    try:
+        expected = _expected(conn)
+        for table, query in _ACTUAL.items():
+            actual = conn.execute(query).fetchall()
+            if len(actual) != len(expected[table]):
+                problems.append(f"{table}: {len(actual)} satır, beklenen {len(expected[table])}")
+                continue
+            for got, want in zip(actual, expected[table]):
+                if not all(_same(g, w) for g, w in zip(got, want)):
+                    problems.append(f"{table}: {tuple(got)} ≠ {tuple(want)}")
+
+        crs = {}
+        for scenario, cr in conn.execute("SELECT scenario, combined_ratio FROM periods WHERE premium_income > 0"):
+            crs.setdefault(scenario, []).append(cr)
+        final_capital = np.array([r[0] for r in conn.execute(
+            "SELECT capital FROM periods p WHERE period = "
+            "(SELECT MAX(period) FROM periods q WHERE q.session_id = p.session_id)")], dtype=float)
+        n_periods = conn.execute("SELECT COUNT(*) FROM periods").fetchone()[0]
+        n_attempts = conn.execute("SELECT COUNT(*) FROM quiz_attempts").fetchone()[0]
+    finally:
+        conn.close()
+
+    for row in store.cr_by_scenario():
+        values = np.array(crs.get(row["scenario"], []), dtype=float)
+        want_mean = float(values.mean()) if values.size else 0.0
+        want_std = float(values.std(ddof=1)) if values.size > 1 else 0.0
+        if not (math.isclose(row["cr_mean"], want_mean, rel_tol=1e-9, abs_tol=1e-12)
+                and math.isclose(row["cr_std"], want_std, rel_tol=1e-6, abs_tol=1e-9)):
+            problems.append(f"cr_by_scenario[{row['scenario']}]: ort./std {row['cr_mean']}/{row['cr_std']} "
+                            f"≠ {want_mean}/{want_std}")
+
+    distribution = store.capital_distribution()
+    if distribution["sessions"] != final_capital.size or (
+            final_capital.size and not math.isclose(distribution["mean"], float(final_capital.mean()), rel_tol=1e-12)):
+        problems.append("capital_distribution: son sermaye ham verilerle uyuşmuyor")
+
+    overview = store.overview()
+    if (overview["sessions"], overview["periods"], overview["quiz_attempts"]) != (final_capital.size, n_periods, n_attempts):
+        problems.append(f"overview: {overview} ≠ ({final_capital.size}, {n_periods}, {n_attempts})")
+
+    stats = store.stats()
+    if stats.written != n_periods + n_attempts:
+        problems.append(f"stats.written: {stats.written} ≠ {n_periods + n_attempts}")
+    return problems
+
+def check_closed(store: ClassroomStore) -> list:
+    """close() sonrası açık bağlantı kalmamalı: son bağlantı kapanınca SQLite -wal/-shm dosyalarını siler."""
+    problems = []
+    if store.open_readers:
+        problems.append(f"close: {store.open_readers} okuyucu bağlantısı açık kaldı")
+    leftover = [suffix for suffix in ("-wal", "-shm") if os.path.exists(store.path + suffix)]
+    if leftover:
+        problems.append(f"close: {', '.join(leftover)} dosyası duruyor (açık WAL okuyucusu var)")
+    return problems
+
+def run_check(n_sessions: int, seed: int = 0) -> list:
+    """Geçici bir depoda fill_store + check_store; eğitmen sorguları birkaç iş parçacığından, kapanış denetimiyle."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ClassroomStore(os.path.join(tmp, "sinif.sqlite"))
+        try:
+            fill_store(store, n_sessions, seed)
+            # Streamlit her oturumu ayrı iş parçacığında çalıştırır: her biri kendi okuyucusunu açar
+            readers = [threading.Thread(target=store.overview) for _ in range(4)]
+            for thread in readers:
+                thread.start()
+            for thread in readers:
+                thread.join()
+            problems = check_store(store)
+        finally:
+            store.close()
+        return problems + check_closed(store)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.store_check", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=300, help="Rastgele oturum sayısı")
+    parser.add_argument("--seed", type=int, default=0, help="Rastgele veri tohumu")
+    args = parser.parse_args(argv)
+
+    problems = run_check(args.sessions, args.seed)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    print(f"{args.sessions} oturum: " + ("özet tablolar ham verilerle tutarlı" if not problems
+                                         else f"{len(problems)} uyuşmazlık"))
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
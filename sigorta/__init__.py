@@ -0,0 +1,50 @@
+"""Sigorta fiyatlama simülasyonunun arayüzden bağımsız çekirdeği."""
+from .core import (
+    AGGREGATE_SAMPLING_THRESHOLD,
+    FAN_QUANTILES,
+    SCENARIOS,
+    SWEEP_PREMIUM_FACTORS,
+    SWEEP_SENSITIVITIES,
+    compute_last_insights,
+    demand_from_premium,
+    period_seed,
+    pricing_period_result,
+    replay_period,
+    simulate_capital_paths,
+    simulate_period,
+    suggested_gross_premium,
+    sweep_surface,
+)
+from .severity import (
+    CLAIM_CHUNK_SIZE,
+    ClaimTotals,
+    Reinsurance,
+    Severity,
+    make_reinsurance,
+    make_severity,
+    simulate_claims,
+)
+from .analytic import AggregateDistribution, aggregate_loss_distribution, analytic_period_metrics
+from .stats import RiskAccumulator, RunningMoments, StreamingMetric, TDigest
+from .cache import RESULT_CACHE, CacheStats, ResultCache, cached
+from .history import HISTORY_COLUMNS, PeriodHistory
+from .profiling import DISABLED_PROFILER, PROCESS_TIMINGS, Profiler, TimingBuffer
+from .sampling import SAMPLERS, make_sampler, rqmc_estimate
+from .variance import compare_premiums
+from .coach import COACH_RULES, CoachEvaluation, CoachRule, coach_metrics, cr_price_bands, evaluate_coach, evaluate_table
+from .autopilot import PolicyState, coach_policy, evaluate_policies, fixed_policy, threshold_policy
+from .market import PRICING_RULES, Insurer, MarketState, make_insurers, simulate_market
+from .multiline import MULTILINE_LINES, simulate_multiline
+from .reserving import (
+    DEVELOPMENT_PATTERNS,
+    ClaimsTriangle,
+    bootstrap_reserves,
+    bornhuetter_ferguson,
+    chain_ladder,
+    develop_claims,
+    pattern_factors,
+    simulate_reserve_runoff,
+    triangle_from_history,
+)
+from .store import ClassroomStore, StoreStats, open_store
+from .portfolio import POLICY_DTYPE, RISK_CLASSES, Portfolio, PortfolioPeriod
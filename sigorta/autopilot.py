@@ -0,0 +1,133 @@
+"""
+Otomatik pilot: fiyatlama politikalarının çok yollu karşılaştırması.
+
+Bir politika her dönem sonunda yolun durumuna (son CR, satış, sermaye, mevcut prim düzeyi)
+bakıp bir sonraki dönemin prim düzeyini (önerilen brüt primin yüzdesi) belirler. Politikalar
+yol başına Python döngüsüyle değil, tüm yollar için tek bir NumPy çağrısıyla değerlendirilir;
+karşılaştırılan tüm politikalar (politika × yol) dizilerinde aynı adımda ilerler.
+
+coach_policy, koçun "teknik" grubundaki fiyat önerilerini uygular; bant sınırları ve çarpanlar
+COACH_RULES'tan okunur (coach.cr_price_bands), kural tablosu değişirse politika da değişir:
+    satış yok              → prim düzeyini önerilen bandın üst ucuna (NO_SALES_FACTOR, %110) çek
+    CR < 1                 → %5 indir
+    1 ≤ CR < 1,10          → %5–%10 artır (orta nokta %7,5)
+    CR ≥ 1,10              → %10–%20 artır (orta nokta %15)
+"""
+from typing import Callable, Mapping, NamedTuple, Sequence, Union
+
+import numpy as np
+
+from .coach import COACH_RULES, NO_SALES_FACTOR, cr_price_bands
+from .core import SeedLike, demand_from_premium, suggested_gross_premium
+
+# Prim düzeyi kaydırıcısının aralığı (SWEEP_PREMIUM_FACTORS ile aynı)
+FACTOR_BOUNDS = (60.0, 160.0)
+
+class PolicyState(NamedTuple):
+    """Politikaya verilen dönem sonu durumu; diziler (yol,) şeklindedir."""
+    period: int
+    premium_factor: np.ndarray
+    combined_ratio: np.ndarray
+    policies: np.ndarray
+    demand_ratio: np.ndarray      # satış / referans satış
+    capital: np.ndarray
+
+# Politika: durum → bir sonraki dönemin prim düzeyi (%), (yol,)
+PricingPolicy = Callable[[PolicyState], np.ndarray]
+
+def fixed_policy() -> PricingPolicy:
+    """Prim düzeyini başlangıç değerinde tutar."""
+    def policy(state):
+        return state.premium_factor
+    return policy
+
+def threshold_policy(cr_edges: Sequence[float], multipliers: Sequence[float],
+                     no_sales_factor: float = None) -> PricingPolicy:
+    """
+    Kullanıcı tanımlı eşik tablosu: CR, cr_edges ile len(cr_edges) + 1 banda ayrılır ve prim düzeyi
+    bandın çarpanıyla çarpılır. no_sales_factor verilirse satış olmayan yollarda prim düzeyi
+    en fazla bu değere çekilir.
+    """
+    edges = np.asarray(cr_edges, dtype=float)
+    mult = np.asarray(multipliers, dtype=float)
+    if mult.size != edges.size + 1:
+        raise ValueError("multipliers, cr_edges'den bir fazla eleman içermeli.")
+
+    def policy(state):
+        factor = state.premium_factor * mult[np.searchsorted(edges, state.combined_ratio, side="right")]
+        if no_sales_factor is not None:
+            factor = np.where(state.policies == 0, np.minimum(state.premium_factor, no_sales_factor), factor)
+        return factor
+    return policy
+
+def coach_policy(rules=COACH_RULES) -> PricingPolicy:
+    """Koçun CR bantlarına göre verdiği fiyat önerileri (modül açıklamasına bakın)."""
+    cr_edges, multipliers = cr_price_bands(rules)
+    return threshold_policy(cr_edges, multipliers, no_sales_factor=NO_SALES_FACTOR)
+
+def evaluate_policies(policies: Mapping[str, PricingPolicy], p_claim: float, mean_loss: float,
+                      expense_loading: float, profit_loading: float, base_policies: int,
+                      sensitivity: float, capital0: float, start_factor: Union[float, Mapping[str, float]] = 100.0,
+                      n_paths: int = 10_000, n_periods: int = 12, seed: SeedLike = None):
+    """
+    Her politikayı n_paths yolda n_periods dönem işletir. Dönem içi model simulate_period'un
+    "aggregate" yoludur: satış = demand_from_premium, hasar adedi ~ Binom, toplam hasar ~ Gamma.
+    start_factor ilk dönemin prim düzeyidir; sözlükse politika adına göre (verilmeyenler %100).
+    Dönüş: politika adı → dönem sonu sermaye (ortalama, medyan, %5), iflas olasılığı,
+    CR (oranların oranı), CR oynaklığı (yol içi dönemler arası standart sapmanın ortalaması),
+    dönem bazında ortalama prim düzeyi ve sermaye; ayrıca ortalamaların standart hataları.
+    """
+    names = list(policies)
+    shape = (len(names), n_paths)
+    suggested = suggested_gross_premium(p_claim, mean_loss, expense_loading, profit_loading)
+    reference = suggested if suggested > 0 else 1.0
+
+    rng = np.random.default_rng(seed)
+    if isinstance(start_factor, Mapping):
+        start = np.array([float(start_factor.get(name, 100.0)) for name in names])
+    else:
+        start = np.full(len(names), float(start_factor))
+    factor = np.repeat(start[:, None], n_paths, axis=1)
+    capital = np.full(shape, float(capital0))
+    ruined = np.zeros(shape, dtype=bool)
+    cr_path = np.empty(shape + (n_periods,))
+    factor_path = np.empty(shape + (n_periods,))
+    capital_path = np.empty(shape + (n_periods,))
+    income_total = np.zeros(shape)
+    cost_total = np.zeros(shape)
+    for t in range(n_periods):
+        premium = suggested * factor / 100.0
+        n_pol = demand_from_premium(premium, base_policies, reference, sensitivity)
+        n_claims = rng.binomial(n_pol, p_claim)
+        losses = rng.gamma(shape=n_claims, scale=mean_loss)
+        income = n_pol * premium
+        costs = losses + income * expense_loading
+        capital += income - costs
+        ruined |= capital < 0
+        cr = np.divide(costs, income, out=np.zeros_like(income), where=income > 0)
+        income_total += income
+        cost_total += costs
+        cr_path[..., t] = cr
+        factor_path[..., t] = factor
+        capital_path[..., t] = capital
+
+        for i, name in enumerate(names):
+            state = PolicyState(t + 1, factor[i], cr[i], n_pol[i], n_pol[i] / max(1, base_policies), capital[i])
+            factor[i] = np.clip(policies[name](state), *FACTOR_BOUNDS)
+
+    final = capital_path[..., -1]
+    cr_vol = cr_path.std(axis=-1)
+    results = {}
+    for i, name in enumerate(names):
+        results[name] = {
+            "final_capital_mean": float(final[i].mean()),
+            "final_capital_se": float(final[i].std(ddof=1) / np.sqrt(n_paths)) if n_paths > 1 else 0.0,
+            "final_capital_median": float(np.median(final[i])),
+            "final_capital_p05": float(np.quantile(final[i], 0.05)),
+            "ruin_probability": float(ruined[i].mean()),
+            "combined_ratio": float(cost_total[i].sum() / income_total[i].sum()) if income_total[i].sum() > 0 else 0.0,
+            "cr_volatility": float(cr_vol[i].mean()),
+            "premium_factor_by_period": factor_path[i].mean(axis=0),
+            "capital_by_period": capital_path[i].mean(axis=0),
+        }
+    return results
@@ -0,0 +1,245 @@
+"""
+Toplu senaryo çalıştırıcı: parametre dosyasını okur, her koşuyu simüle eder ve
+sonuçları satır satır CSV/Parquet'e akıtır.
+
+Parametre dosyası (JSON veya TOML):
+
+    {
+      "defaults": {"scenario": "Standart Piyasa", "n_trials": 1000, "seed": 42},
+      "grid": {"premium_factor": [80, 100, 120], "sensitivity": [0.5, 1.2, 2.0]},
+      "runs": [
+        {"scenario": "Yoğun Rekabet (Zayıf Fiyat Disiplini)", "premium_factor": 110},
+        {"severity": {"dist": "pareto", "alpha": 2.2},
+         "reinsurance": {"retention": 250000, "limit": 1000000, "quota_share": 0.2, "xol_rate": 0.03}}
+      ]
+    }
+
+"grid" anahtarlarının kartezyen çarpımı ve "runs" listesi, "defaults" üzerine yazılarak
+koşulara dönüştürülür. Verilmeyen değerler uygulamanın başlangıç değerleridir; "severity"
+verilmezse senaryonun hasar dağılımı kullanılır (bkz. severity.make_severity / make_reinsurance).
+"""
+import csv
+import itertools
+import json
+import os
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from .core import (
+    SCENARIOS,
+    demand_from_premium,
+    pricing_period_result,
+    simulate_period,
+    suggested_gross_premium,
+)
+from .severity import make_reinsurance, make_severity, simulate_claims
+
+# init_state ile aynı başlangıç değerleri
+DEFAULT_RUN = {
+    "scenario": "Standart Piyasa",
+    "expense_loading": 0.20,
+    "profit_loading": 0.10,
+    "premium_factor": 100,
+    "base_policies": 2000,
+    "sensitivity": 1.2,
+    "n_trials": 1,
+    "seed": 0,
+    "method": "auto",
+    "reinsurance": None,
+}
+
+PARAM_COLUMNS = [
+    "run", "trial", "scenario", "p_claim", "mean_loss", "expense_loading", "profit_loading",
+    "premium_factor", "base_policies", "sensitivity", "suggested_gross", "severity",
+]
+# Reasürans varsa "Toplam Hasar" şirketin payında kalan (net) hasardır; "UW Sonucu" ve
+# "Combined Ratio" devredilen primi de içerir (brüt prim geliri bazında).
+RESULT_COLUMNS = [
+    "Poliçe", "Prim/poliçe", "Prim Geliri", "Devredilen Prim", "Hasar Adedi", "Brüt Hasar", "Devredilen Hasar",
+    "Toplam Hasar", "Gider", "UW Sonucu", "Combined Ratio",
+]
+COLUMNS = PARAM_COLUMNS + RESULT_COLUMNS
+
+def load_params(path: str) -> dict:
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def expand_runs(params: dict) -> list[dict]:
+    """defaults + (grid kartezyen çarpımı ∪ runs) → tam parametreli koşu listesi."""
+    base = {**DEFAULT_RUN, **params.get("defaults", {})}
+    overrides = []
+
+    grid = params.get("grid", {})
+    if grid:
+        keys = list(grid.keys())
+        for values in itertools.product(*(grid[k] for k in keys)):
+            overrides.append(dict(zip(keys, values)))
+    overrides.extend(params.get("runs", []))
+    if not overrides:
+        overrides.append({})
+
+    runs = []
+    for i, override in enumerate(overrides):
+        run = {**base, **override, "run": i}
+        if run["scenario"] not in SCENARIOS:
+            raise ValueError(f"Bilinmeyen senaryo: {run['scenario']!r}")
+        scenario = SCENARIOS[run["scenario"]]
+        run.setdefault("p_claim", scenario["p_claim"])
+        run.setdefault("mean_loss", scenario["mean_loss"])
+        run.setdefault("severity", scenario.get("severity"))
+        # Tanımlar koşu başlamadan doğrulansın
+        make_severity(run["mean_loss"], run["severity"])
+        make_reinsurance(run["reinsurance"])
+        runs.append(run)
+    return runs
+
+# Bir iş parçasındaki deneme sayısı. Tohum akışları parça başına türetildiği için
+# sonuçlar bu değere bağlıdır, çalışan (worker) sayısına bağlı değildir.
+DEFAULT_CHUNK_SIZE = 10_000
+
+class Chunk(NamedTuple):
+    index: int
+    run: dict
+    start: int
+    n_trials: int
+    seed: np.random.SeedSequence
+
+def iter_chunks(runs: list[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Chunk]:
+    """
+    Koşuları sabit boyutlu deneme parçalarına böler. Her koşunun akışı kendi "seed" değeri ve
+    koşu numarasından, parçaların akışları da bundan SeedSequence.spawn ile türetilir.
+    """
+    index = 0
+    for run in runs:
+        n_trials = int(run["n_trials"])
+        n_chunks = max(1, -(-n_trials // chunk_size))
+        seeds = np.random.SeedSequence(run["seed"], spawn_key=(run["run"],)).spawn(n_chunks)
+        for c, seed in enumerate(seeds):
+            start = c * chunk_size
+            yield Chunk(index, run, start, min(chunk_size, n_trials - start), seed)
+            index += 1
+
+def simulate_chunk(chunk: Chunk) -> list[dict]:
+    """Bir parçanın bağımsız fiyatlama dönemlerini satır sözlükleri olarak döndürür."""
+    run = chunk.run
+    suggested = suggested_gross_premium(run["p_claim"], run["mean_loss"], run["expense_loading"], run["profit_loading"])
+    premium = suggested * (run["premium_factor"] / 100.0)
+    n_policies = demand_from_premium(
+        premium=premium,
+        base_policies=run["base_policies"],
+        reference_premium=suggested if suggested > 0 else 1.0,
+        sensitivity=run["sensitivity"],
+    )
+    params = {k: run[k] for k in PARAM_COLUMNS if k in run}
+    params["suggested_gross"] = suggested
+    params["severity"] = (run["severity"] or {}).get("dist", "exponential")
+    severity = make_severity(run["mean_loss"], run["severity"])
+    reinsurance = make_reinsurance(run["reinsurance"]) if run["reinsurance"] else None
+
+    rng = np.random.default_rng(chunk.seed)
+    records = []
+    for trial in range(chunk.start, chunk.start + chunk.n_trials):
+        if reinsurance is None:
+            n_claims, gross = simulate_period(n_policies, run["p_claim"], run["mean_loss"], seed=rng,
+                                              method=run["method"], severity=run["severity"])
+            ceded = 0.0
+        else:
+            totals = simulate_claims(n_policies, run["p_claim"], severity, reinsurance, seed=rng)
+            n_claims, gross, ceded = totals.n_claims, totals.gross, totals.ceded
+        result = pricing_period_result(n_policies, premium, n_claims, gross - ceded, run["expense_loading"])
+        ceded_premium = reinsurance.ceded_premium(result["Prim Geliri"]) if reinsurance is not None else 0.0
+        if ceded_premium:
+            result["UW Sonucu"] -= ceded_premium
+            result["Combined Ratio"] += ceded_premium / result["Prim Geliri"]
+        records.append({
+            **params,
+            "trial": trial,
+            "Devredilen Prim": ceded_premium,
+            "Brüt Hasar": gross,
+            "Devredilen Hasar": ceded,
+            **result,
+        })
+    return records
+
+def iter_records(runs: list[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """Tüm koşuların satırlarını tek süreçte, parça sırasıyla üretir."""
+    for chunk in iter_chunks(runs, chunk_size):
+        yield from simulate_chunk(chunk)
+
+# =============================
+# Çıktı
+# =============================
+class CsvSink:
+    def __init__(self, path: str):
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._f, fieldnames=COLUMNS)
+        self._writer.writeheader()
+
+    def write(self, record: dict):
+        self._writer.writerow(record)
+
+    def close(self):
+        self._f.close()
+
+class ParquetSink:
+    """Satırları batch_size'lık gruplar halinde Parquet satır gruplarına yazar (pyarrow gerekir)."""
+
+    def __init__(self, path: str, batch_size: int = 65_536):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet çıktısı için pyarrow kurulu olmalı.") from e
+        self._pa, self._pq = pa, pq
+        self._path = path
+        self._batch_size = batch_size
+        self._buffer = {c: [] for c in COLUMNS}
+        self._n = 0
+        self._writer = None
+
+    def write(self, record: dict):
+        for c in COLUMNS:
+            self._buffer[c].append(record[c])
+        self._n += 1
+        if self._n >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._n == 0:
+            return
+        table = self._pa.table(self._buffer)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+        self._buffer = {c: [] for c in COLUMNS}
+        self._n = 0
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+def open_sink(path: str, fmt: str = "auto"):
+    if fmt == "auto":
+        fmt = "parquet" if os.path.splitext(path)[1].lower() in (".parquet", ".pq") else "csv"
+    if fmt == "parquet":
+        return ParquetSink(path)
+    if fmt == "csv":
+        return CsvSink(path)
+    raise ValueError(f"Bilinmeyen çıktı biçimi: {fmt!r}")
+
+def write_records(records: Iterable[dict], path: str, fmt: str = "auto") -> int:
+    sink = open_sink(path, fmt)
+    n = 0
+    try:
+        for record in records:
+            sink.write(record)
+            n += 1
+    finally:
+        sink.close()
+    return n
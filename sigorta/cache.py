@@ -0,0 +1,201 @@
+"""
+Süreç genelinde paylaşılan, iş parçacığı güvenli sonuç önbelleği.
+
+Streamlit her oturumu aynı süreçte ayrı iş parçacıklarında çalıştırır; modül düzeyindeki
+RESULT_CACHE bu yüzden tüm kullanıcılar arasında ortaktır. Pahalı hesaplar (tarama yüzeyi,
+çok yollu sermaye simülasyonu, FFT) parametre kümesi başına bir kez yapılır.
+
+- Anahtar: fonksiyon adı + normalize edilmiş argümanlar (float'lar 12 anlamlı basamağa yuvarlanır,
+  sözlükler sıralanır, diziler içerikleriyle anahtarlanır).
+- Tahliye: en eski kullanılan (LRU), isteğe bağlı yaşam süresi (TTL) ve toplam bayt sınırı.
+- Aynı anahtar için eş zamanlı istekler hesabı bir kez yapar, diğerleri sonucu bekler.
+- Paylaşılan sonuçlardaki NumPy dizileri salt okunur yapılır.
+"""
+import functools
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+def normalize_key(value):
+    """Argümanları hashlenebilir ve sayısal gürültüye dayanıklı bir anahtara dönüştürür."""
+    if isinstance(value, (bool, str, bytes, type(None))):
+        return value
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(f"{float(value):.12g}")
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.shape, value.dtype.str, value.tobytes())
+    if isinstance(value, np.random.SeedSequence):
+        return ("SeedSequence", value.entropy, tuple(value.spawn_key))
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_key(v) for v in value)
+    raise TypeError(f"Önbellek anahtarı olamaz: {type(value).__name__}")
+
+def estimate_bytes(value) -> int:
+    """Sonucun yaklaşık bellek kullanımı (diziler için nbytes, kapsayıcılar için özyinelemeli)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+def _freeze(value):
+    """Paylaşılan sonuçtaki dizileri salt okunur yapar (bir oturum diğerininkini bozamasın)."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for v in value.values():
+            _freeze(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _freeze(v)
+    return value
+
+class ResultCache:
+    """LRU + TTL + bayt sınırlı, kilitle korunan sonuç önbelleği; isabet/ıskalama sayaçları tutar."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()   # anahtar → (değer, bayt, zaman)
+        self._in_flight = {}            # anahtar → threading.Event
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key):
+        """Kilit altında çağrılır. (bulundu mu, değer)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, size, stamp = entry
+        if self.ttl is not None and self.clock() - stamp > self.ttl:
+            del self._entries[key]
+            self._bytes -= size
+            self._expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def get(self, key, default=None):
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self._hits += 1
+                return value
+            self._misses += 1
+            return default
+
+    def put(self, key, value):
+        size = estimate_bytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return value  # tek başına sınırı aşan sonuç saklanmaz
+            self._entries[key] = (value, size, self.clock())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute: Callable[[], object]):
+        """Anahtar önbellekte yoksa compute() bir kez çalışır; aynı anda gelen istekler onu bekler."""
+        while True:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    self._hits += 1
+                    return value
+                event = self._in_flight.get(key)
+                if event is None:
+                    self._misses += 1
+                    event = self._in_flight[key] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+            if not owner:
+                # Hesap bittiğinde tekrar bakılır; hesap hata verdiyse sıradaki istek kendisi dener
+                event.wait()
+                continue
+            try:
+                return self.put(key, _freeze(compute()))
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+                event.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations,
+                              len(self._entries), self._bytes)
+
+RESULT_CACHE = ResultCache()
+
+def cached(func: Optional[Callable] = None, *, cache: Optional[ResultCache] = None,
+           random_arg: Optional[str] = "seed"):
+    """
+    Fonksiyonu paylaşılan önbellekten geçirir: @cached ya da cached(sweep_surface).
+    random_arg (varsayılan "seed") None ya da bir Generator ise sonuç her çağrıda farklı olmalıdır;
+    bu çağrılar önbelleğe alınmadan doğrudan çalıştırılır.
+    """
+    if func is None:
+        return functools.partial(cached, cache=cache, random_arg=random_arg)
+    signature = inspect.signature(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        if random_arg in arguments and (arguments[random_arg] is None
+                                        or isinstance(arguments[random_arg], np.random.Generator)):
+            return func(*args, **kwargs)
+        try:
+            key = (name, normalize_key(dict(arguments)))
+        except TypeError:
+            return func(*args, **kwargs)  # anahtarlanamayan argüman (ör. durum taşıyan sampler)
+        target = cache if cache is not None else RESULT_CACHE
+        return target.get_or_compute(key, lambda: func(*args, **kwargs))
+
+    return wrapper
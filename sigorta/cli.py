@@ -0,0 +1,53 @@
+"""
+Komut satırı:
+
+    python -m sigorta parametreler.json -o sonuclar.csv
+    python -m sigorta parametreler.toml -o sonuclar.parquet --workers 8
+"""
+import argparse
+import sys
+import time
+
+from .batch import DEFAULT_CHUNK_SIZE, expand_runs, load_params, open_sink
+from .parallel import run_parallel
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m sigorta", description="Sigorta fiyatlama simülasyonu — toplu çalıştırıcı")
+    parser.add_argument("params", help="Parametre dosyası (.json veya .toml)")
+    parser.add_argument("-o", "--output", required=True, help="Çıktı dosyası (.csv veya .parquet)")
+    parser.add_argument("--format", choices=["auto", "csv", "parquet"], default="auto", help="Çıktı biçimi (varsayılan: uzantıdan)")
+    parser.add_argument("--workers", type=int, default=1, help="Paralel süreç sayısı (0: tüm çekirdekler)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Parça başına deneme (sonuçları etkiler)")
+    return parser
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers negatif olamaz (0: tüm çekirdekler)")
+    try:
+        runs = expand_runs(load_params(args.params))
+    except (OSError, ValueError) as e:
+        print(f"hata: {e}", file=sys.stderr)
+        return 2
+
+    t0 = time.perf_counter()
+    sink = open_sink(args.output, args.format)
+    try:
+        summaries, stats = run_parallel(runs, sink, workers=args.workers or None, chunk_size=args.chunk_size)
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - t0
+
+    n = sum(s.n for s in summaries.values())
+    print(f"{len(runs)} koşu, {n} satır → {args.output} ({elapsed:.2f} sn)", file=sys.stderr)
+    for run_id, s in summaries.items():
+        print(f"  koşu {run_id}: CR={s.combined_ratio:.4f}  UW ort.={s.uw_mean:,.0f}  UW std={s.uw_std:,.0f}", file=sys.stderr)
+        if s.n:
+            risk = s.risk.report()
+            print(f"           UW zararı VaR/TVaR %99,5={risk['uw_var'][0.995]:,.0f}/{risk['uw_tvar'][0.995]:,.0f}"
+                  f"  P(CR>1)={risk['prob_cr_above_1']:.3f}  CR %5–%95={risk['cr_quantiles'][0.05]:.3f}–{risk['cr_quantiles'][0.95]:.3f}"
+                  f"  LR ort.={risk['lr_mean']:.3f}", file=sys.stderr)
+    for pid, rate in stats.throughput().items():
+        print(f"  çalışan {pid}: {stats.chunks[pid]} parça, {rate:,.0f} poliçe/sn", file=sys.stderr)
+    return 0
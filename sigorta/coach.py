@@ -0,0 +1,187 @@
+"""
+Tablo güdümlü koç kuralları.
+
+Her kural bir gruba aittir ve koşulları (gösterge, işleç, eşik) üçlüleridir. Grup içinde
+kurallar sırayla denenir ve ilk eşleşen kazanır (eski if/elif zinciriyle aynı). Göstergeler:
+
+    premium_income   prim geliri
+    combined_ratio   (hasar + gider) / prim geliri
+    price_gap        prim / max(1, önerilen brüt prim)       (>1 pahalı, <1 ucuz)
+    demand_ratio     poliçe / referans satış (referans 0 ise 1 alınır)
+
+Kurallar bir kez NumPy maskelerine derlenir ve tüm satırlara (geçmişin tüm dönemleri ya da
+milyonlarca toplu simülasyon denemesi) aynı anda uygulanır. Sonuç, satır × grup kural
+kodlarıdır; mesajlar yalnızca gösterilecek satırlar için metne dönüştürülür.
+"""
+import operator
+from typing import Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+class CoachRule(NamedTuple):
+    code: str
+    group: str
+    conditions: tuple              # ((gösterge, işleç, eşik), ...); boşsa her zaman eşleşir
+    diagnosis: Optional[str]       # {cr:.2f} gibi alanlar satırın göstergeleriyle doldurulur
+    action: Optional[str] = None
+    price_factor: Optional[float] = None   # öneri uygulanınca prim düzeyi çarpanı (otomatik pilot)
+
+COACH_GROUPS = ("teknik", "fiyat", "talep")
+COACH_RULES = (
+    CoachRule("satis_yok", "teknik", (("premium_income", "==", 0.0),),
+              "Satış yok: prim rekabetçi seviyenin çok üzerinde kalmış görünüyor.",
+              "Prim düzeyini düşür (ör. önerilen brüt primin %90–%110 bandına yaklaş)."),
+    CoachRule("teknik_kar", "teknik", (("combined_ratio", "<", 1.0),),
+              "Teknik sonuç olumlu: Combined Ratio = {cr:.2f} (< 1).",
+              "Fiyatı koru veya kontrollü büyüme için küçük indirim dene (örn. -%5).", price_factor=0.95),
+    CoachRule("sinirda", "teknik", (("combined_ratio", ">=", 1.0), ("combined_ratio", "<", 1.10)),
+              "Teknik sonuç sınıra yakın: Combined Ratio = {cr:.2f} (1’e yakın).",
+              "Prim düzeyini bir kademe artır (örn. +%5–%10) veya gider oranını düşürmeyi dene.", price_factor=1.075),
+    CoachRule("teknik_zarar", "teknik", (),
+              "Teknik sonuç olumsuz: Combined Ratio = {cr:.2f} (>> 1).",
+              "Prim düzeyini artır (+%10–%20) ve fiyat disiplinini güçlendir.", price_factor=1.15),
+    CoachRule("ucuz", "fiyat", (("price_gap", "<", 0.9),),
+              "Prim, önerilen brüt primin belirgin altında: satış artabilir ama prim yetersizliği sermayeyi zorlayabilir.",
+              "CR>1 ise önce prim seviyesini önerilen banda yaklaştır."),
+    CoachRule("pahali", "fiyat", (("price_gap", ">", 1.1),),
+              "Prim, önerilen brüt primin üstünde: zarar riski azalabilir ama rekabetçi satış düşebilir.",
+              "Satış çok düştüyse prim seviyesini biraz geri çek (örn. -%5)."),
+    CoachRule("dengeli_fiyat", "fiyat", (),
+              "Prim, önerilen brüt prime yakın: fiyatlama açısından dengeli bir bölgede ilerliyorsun."),
+    CoachRule("satis_zayif", "talep", (("demand_ratio", "<", 0.6),),
+              "Satış zayıf: fiyat pahalı kalmış olabilir veya piyasa fiyata çok hassastır.",
+              "Satış hedefleniyorsa prim düzeyini düşür veya fiyata duyarlılığı daha düşük bir piyasa varsayımıyla test et."),
+    CoachRule("satis_guclu", "talep", (("demand_ratio", ">", 1.2),),
+              "Satış güçlü: genişleyen risk havuzu sonuçları beklenen değere yaklaştırma eğilimindedir.",
+              "CR kötü ise satış artışı zararı büyütebilir → prim artır. CR iyi ise büyümeyi sürdür."),
+)
+COACH_ROADMAP = (
+    "1) Öncelik: Combined Ratio’yu 1’in altına çek (teknik denge).",
+    "2) Sonra: CR<1 iken küçük fiyat indirimleriyle satış hacmini test et (kontrollü).",
+    "3) Piyasa çok hassassa: prim ayarını küçük adımlarla yap; küçük artış satışları hızlı düşürebilir.",
+    "4) Rekabet baskısı yüksekse, primin daha disiplinli olması gerekir.",
+)
+# Satış yokken önerilen bandın (%90–%110) üst ucu; otomatik pilot prim düzeyini buraya çeker
+NO_SALES_FACTOR = 110.0
+NO_MATCH = -1
+
+_OPERATORS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+}
+
+def cr_price_bands(rules: Sequence[CoachRule] = COACH_RULES, group: str = "teknik"):
+    """
+    Bir grubun fiyat çarpanlı kurallarını eşik tablosuna çevirir: (cr_edges, multipliers).
+    Bu kurallar sırayla CR'nin ardışık bantlarıdır; bandın üst sınırı kuralın
+    ("combined_ratio", "<", eşik) koşulundandır, yalnızca sonuncusu üstten sınırsızdır.
+    """
+    edges, multipliers = [], []
+    for rule in rules:
+        if rule.group != group or rule.price_factor is None:
+            continue
+        multipliers.append(rule.price_factor)
+        edges.extend(threshold for metric, op, threshold in rule.conditions
+                     if metric == "combined_ratio" and op == "<")
+    if len(multipliers) != len(edges) + 1 or edges != sorted(edges):
+        raise ValueError(f"{group!r} grubunun fiyat çarpanlı kuralları ardışık CR bantları oluşturmuyor.")
+    return edges, multipliers
+
+def coach_metrics(premium_income, combined_ratio, policies, reference_policies, premium, suggested_gross) -> dict:
+    """Ham sütunlardan (skaler veya dizi) kural göstergelerini üretir; hepsi birbirine yayınlanır."""
+    reference = np.trunc(np.asarray(reference_policies, dtype=float))
+    return {
+        "premium_income": np.asarray(premium_income, dtype=float),
+        "combined_ratio": np.asarray(combined_ratio, dtype=float),
+        "price_gap": np.asarray(premium, dtype=float) / np.maximum(1.0, np.asarray(suggested_gross, dtype=float)),
+        "demand_ratio": np.trunc(np.asarray(policies, dtype=float)) / np.where(reference == 0, 1.0, reference),
+    }
+
+class CoachEvaluation(NamedTuple):
+    """codes[i, g]: i. satırda g. grupta eşleşen kuralın COACH_RULES içindeki sırası (yoksa NO_MATCH)."""
+    rules: tuple
+    groups: tuple
+    codes: np.ndarray
+    metrics: dict
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    def counts(self) -> dict:
+        """Kural kodu → eşleştiği satır sayısı."""
+        tally = np.bincount(self.codes[self.codes != NO_MATCH].ravel(), minlength=len(self.rules))
+        return {rule.code: int(n) for rule, n in zip(self.rules, tally)}
+
+    def rule_codes(self, group: str) -> np.ndarray:
+        """Bir grubun satır bazında kural kodları (metin; eşleşme yoksa boş)."""
+        names = np.array([rule.code for rule in self.rules] + [""], dtype=object)
+        return names[self.codes[:, self.groups.index(group)]]
+
+    def messages(self, row: int = -1):
+        """Bir satırın (yorum, öneri) listeleri; sıra gruplarınkidir."""
+        fields = {"cr": float(self.metrics["combined_ratio"][row])}
+        diagnosis, actions = [], []
+        for index in self.codes[row]:
+            if index == NO_MATCH:
+                continue
+            rule = self.rules[index]
+            if rule.diagnosis:
+                diagnosis.append(rule.diagnosis.format(**fields))
+            if rule.action:
+                actions.append(rule.action.format(**fields))
+        return diagnosis, actions
+
+def evaluate_coach(metrics: Mapping[str, np.ndarray], rules: Sequence[CoachRule] = COACH_RULES,
+                   groups: Sequence[str] = COACH_GROUPS) -> CoachEvaluation:
+    """Kuralları tüm satırlara aynı anda uygular; gösterge dizileri aynı uzunluğa yayınlanır."""
+    rules, groups = tuple(rules), tuple(groups)
+    names = list(metrics)
+    arrays = np.broadcast_arrays(*(np.atleast_1d(metrics[name]) for name in names))
+    metrics = dict(zip(names, arrays))
+    n = arrays[0].shape[0]
+
+    codes = np.full((n, len(groups)), NO_MATCH, dtype=np.int16)
+    for g, group in enumerate(groups):
+        undecided = np.ones(n, dtype=bool)
+        for index, rule in enumerate(rules):
+            if rule.group != group:
+                continue
+            mask = undecided.copy()
+            for metric, op, threshold in rule.conditions:
+                mask &= _OPERATORS[op](metrics[metric], threshold)
+            codes[mask, g] = index
+            undecided &= ~mask
+            if not undecided.any():
+                break
+    return CoachEvaluation(rules, groups, codes, metrics)
+
+def _column(table, name: str, default=None) -> np.ndarray:
+    """PeriodHistory, DataFrame, sütun sözlüğü veya satır sözlükleri listesinden bir sütun."""
+    if hasattr(table, "column"):
+        return table.column(name) if name in table.dtypes else default
+    if hasattr(table, "columns") and hasattr(table, "iloc"):
+        return table[name].to_numpy() if name in table.columns else default
+    if isinstance(table, Mapping):
+        return np.asarray(table[name]) if name in table else default
+    if not table or name not in table[0]:
+        return default
+    return np.array([row[name] for row in table])
+
+def evaluate_table(table, suggested_gross, premium=None, rules: Sequence[CoachRule] = COACH_RULES) -> CoachEvaluation:
+    """
+    Sonuç tablosunun (PeriodHistory, DataFrame, sütun sözlüğü, satır listesi) tüm satırlarını değerlendirir.
+    premium verilmezse her satırın kendi "Prim/poliçe" değeri kullanılır; suggested_gross skaler ya da
+    satır bazında dizi (ör. toplu çıktının "suggested_gross" sütunu) olabilir. "Referans Satış (poliçe)"
+    yoksa "base_policies" sütununa, o da yoksa 1'e düşülür.
+    """
+    reference = _column(table, "Referans Satış (poliçe)")
+    if reference is None:
+        reference = _column(table, "base_policies", 0)
+    metrics = coach_metrics(
+        premium_income=_column(table, "Prim Geliri"),
+        combined_ratio=_column(table, "Combined Ratio"),
+        policies=_column(table, "Poliçe"),
+        reference_policies=reference,
+        premium=_column(table, "Prim/poliçe") if premium is None else premium,
+        suggested_gross=suggested_gross,
+    )
+    return evaluate_coach(metrics, rules)
@@ -0,0 +1,266 @@
+"""
+Fiyatlama ve simülasyon çekirdeği.
+
+Streamlit ve pandas'a bağımlı değildir; yalnızca NumPy yükler. Arayüz (app.py),
+toplu çalıştırıcı (python -m sigorta) ve sunucu tarafı işler aynı fonksiyonları kullanır.
+"""
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .coach import COACH_ROADMAP, evaluate_table
+from .sampling import sample_period_losses
+from .severity import make_severity, simulate_claims
+
+# int tohum, tohum dizisi, SeedSequence veya hazır bir Generator kabul edilir.
+SeedLike = Union[None, int, Sequence[int], np.random.SeedSequence, np.random.Generator]
+
+# =============================
+# Piyasa/Risk Profili (terminoloji sadeleştirildi)
+# =============================
+SCENARIOS = {
+    "Seçici Risk Kabul (Daha İyi Portföy)": {
+        "p_claim": 0.05,
+        "mean_loss": 20_000,
+        "severity": {"dist": "exponential"},
+        "label": "Daha düşük hasar olasılığı ve daha düşük ortalama hasar",
+        "market_logic": (
+            "**Ne demek?**\n"
+            "- Şirket daha düşük riskli poliçeler satıyor varsayılır.\n"
+            "- Bu yüzden hasar daha seyrek ve/veya daha düşük tutarda gelir.\n"
+            "- Rekabet baskısı görece düşüktür (fiyat kırma daha azdır)."
+        )
+    },
+    "Standart Piyasa": {
+        "p_claim": 0.08,
+        "mean_loss": 25_000,
+        "severity": {"dist": "exponential"},
+        "label": "Ortalama risk karışımı; tipik piyasa dengesi",
+        "market_logic": (
+            "**Ne demek?**\n"
+            "- Piyasa ortalamasına yakın bir risk düzeyi varsayılır.\n"
+            "- Rekabet baskısı orta düzeydedir.\n"
+            "- Hasar olasılığı ve ortalama hasar ‘referans’ seviyededir."
+        )
+    },
+    "Yoğun Rekabet (Zayıf Fiyat Disiplini)": {
+        "p_claim": 0.12,
+        "mean_loss": 32_000,
+        "severity": {"dist": "exponential"},
+        "label": "Hasar olasılığı ve ortalama hasar daha yüksek (daha zorlu koşul)",
+        "market_logic": (
+            "**Ne demek?**\n"
+            "- Rekabet baskısı yüksektir: fiyat kırma eğilimi artar.\n"
+            "- Daha riskli poliçelerin portföye gelmesi olasıdır.\n"
+            "- Bu nedenle hasar daha sık ve/veya daha yüksek tutarda gerçekleşebilir."
+        )
+    },
+}
+
+# =============================
+# Fiyatlama
+# =============================
+def suggested_gross_premium(p_claim: float, mean_loss: float, expense_loading: float, profit_loading: float) -> float:
+    """Önerilen brüt prim = beklenen hasar/poliçe × (1 + gider oranı + tampon/kâr oranı)."""
+    return p_claim * mean_loss * (1 + expense_loading + profit_loading)
+
+_SCALAR_TYPES = (int, float, np.number)
+
+def demand_from_premium(premium, base_policies, reference_premium, sensitivity):
+    """
+    Talep = referans satış × exp(-duyarlılık × (prim / referans prim - 1)), en yakın tam sayıya yuvarlanır.
+    Argümanlar skaler veya NumPy dizisi olabilir ve birbirine yayınlanır (broadcast).
+    Tüm argümanlar skalerse int (eski skaler yol), değilse int64 dizisi döner.
+    """
+    if (isinstance(premium, _SCALAR_TYPES) and isinstance(reference_premium, _SCALAR_TYPES)
+            and isinstance(sensitivity, _SCALAR_TYPES) and isinstance(base_policies, _SCALAR_TYPES)):
+        ratio = premium / reference_premium if reference_premium > 0 else 1.0
+        demand_factor = np.exp(-sensitivity * (ratio - 1.0))
+        return max(0, int(round(base_policies * demand_factor)))
+
+    premium = np.asarray(premium, dtype=float)
+    reference_premium = np.asarray(reference_premium, dtype=float)
+    ratio = np.divide(premium, reference_premium, out=np.ones(np.broadcast(premium, reference_premium).shape),
+                      where=reference_premium > 0)
+    demand = np.rint(np.multiply(base_policies, np.exp(-np.multiply(sensitivity, ratio - 1.0))))
+    demand = np.maximum(demand, 0).astype(np.int64)
+    return int(demand) if demand.ndim == 0 else demand
+
+# =============================
+# Simülasyon
+# =============================
+# Bu poliçe adedinin üzerinde "auto" mod toplam hasarı doğrudan çeker (poliçe başına çekiliş yok).
+AGGREGATE_SAMPLING_THRESHOLD = 50_000
+
+def simulate_period(n_policies: int, p_claim: float, mean_loss: float, seed: SeedLike = None,
+                    method: str = "auto", severity: Optional[Mapping] = None, sampler=None):
+    """
+    Bir fiyatlama dönemi için (hasar adedi, toplam hasar) üretir.
+    - "per_policy": her poliçe için bir uniform + her hasar için bir üstel çekiliş (eski yol, çapraz kontrol için).
+    - "aggregate": hasar adedi ~ Binom(n, p), toplam hasar ~ Gamma(hasar adedi, ortalama hasar).
+      Üstel hasarların toplamı Gamma dağılımlı olduğundan dağılım birebir aynıdır; bellek O(1).
+    - "auto": büyük portföylerde "aggregate", küçüklerde "per_policy".
+    severity üstel dışı bir dağılım tanımlıyorsa (ör. SCENARIOS[...]["severity"]) hasarlar
+    severity.simulate_claims ile parça parça üretilir ve method yok sayılır.
+    sampler (sampling.make_sampler) verilirse üstel hasarlar için seed ve method yerine sampler'ın
+    sıradaki noktası ters CDF'lerden geçirilir (QMC arka uçları için). 64'ten fazla hasarda toplam
+    hasar Wilson–Hilferty yaklaşımıyla üretilir (kantilde göreli hata < 3e-3; sampling modülüne bakın).
+    """
+    if severity is not None and severity.get("dist", "exponential") != "exponential":
+        totals = simulate_claims(n_policies, p_claim, make_severity(mean_loss, severity), seed=seed)
+        return totals.n_claims, totals.gross
+
+    if sampler is not None:
+        n_claims, total_loss = sample_period_losses(sampler.uniforms(1)[0, :2], n_policies, p_claim, mean_loss)
+        return int(n_claims), float(total_loss)
+
+    if method == "auto":
+        method = "aggregate" if n_policies >= AGGREGATE_SAMPLING_THRESHOLD else "per_policy"
+    if method not in ("aggregate", "per_policy"):
+        raise ValueError(f"Bilinmeyen örnekleme yöntemi: {method!r}")
+
+    rng = np.random.default_rng(seed)
+    if method == "aggregate":
+        n_claims = int(rng.binomial(n_policies, p_claim)) if n_policies > 0 else 0
+        total_loss = float(rng.gamma(shape=n_claims, scale=mean_loss)) if n_claims > 0 else 0.0
+        return n_claims, total_loss
+
+    claim_occurs = rng.random(n_policies) < p_claim
+    n_claims = int(claim_occurs.sum())
+    losses = rng.exponential(scale=mean_loss, size=n_claims) if n_claims > 0 else np.array([])
+    return n_claims, float(losses.sum())
+
+def period_seed(seed: int, period: int) -> np.random.SeedSequence:
+    """(oturum tohumu, fiyatlama dönemi) → o döneme ait bağımsız rastgele akış."""
+    return np.random.SeedSequence(seed, spawn_key=(period,))
+
+def replay_period(seed: int, period: int, n_policies: int, p_claim: float, mean_loss: float,
+                  method: str = "auto", severity: Optional[Mapping] = None):
+    """
+    Geçmiş bir dönemin (hasar adedi, toplam hasar) sonucunu yalnızca (tohum, dönem) anahtarından
+    yeniden üretir. Dönem aynı anahtarla simüle edildiyse sonuç birebir aynıdır.
+    """
+    return simulate_period(n_policies, p_claim, mean_loss, seed=period_seed(seed, period), method=method, severity=severity)
+
+def pricing_period_result(n_policies: int, premium: float, n_claims: int, total_loss: float,
+                          expense_loading: float) -> dict:
+    """Bir dönemin muhasebesi: sonuç tablosundaki (history) sütun adlarıyla satır üretir."""
+    premium_income = float(n_policies) * float(premium)
+    expense = premium_income * expense_loading
+    uw_result = premium_income - total_loss - expense
+    combined_ratio = (total_loss + expense) / premium_income if premium_income > 0 else 0.0
+    return {
+        "Poliçe": n_policies,
+        "Prim/poliçe": premium,
+        "Prim Geliri": premium_income,
+        "Hasar Adedi": n_claims,
+        "Toplam Hasar": total_loss,
+        "Gider": expense,
+        "UW Sonucu": uw_result,
+        "Combined Ratio": combined_ratio,
+    }
+
+FAN_QUANTILES = (0.05, 0.25, 0.50, 0.75, 0.95)
+
+def simulate_capital_paths(n_paths: int, n_policies: int, p_claim: float, mean_loss: float,
+                           premium: float, expense_loading: float, capital0: float,
+                           n_periods: int = 12, seed: SeedLike = None,
+                           quantiles: tuple = FAN_QUANTILES, sampler=None):
+    """
+    N bağımsız sermaye yolunu (yol × dönem) dizileriyle tek seferde simüle eder.
+    Her hücre simulate_period'un "aggregate" yoluyla aynı dağılımdan çekilir.
+    sampler verilirse her yol, en az 2 × n_periods boyutlu bir QMC noktasıdır.
+    Dönüş: sermaye matrisi, dönem bazında kantiller, iflas olasılığı ve dönem sonu sermaye.
+    """
+    shape = (n_paths, n_periods)
+    if sampler is not None:
+        u = sampler.uniforms(n_paths)[:, :2 * n_periods].reshape(shape + (2,))
+        _, total_loss = sample_period_losses(u, max(0, int(n_policies)), p_claim, mean_loss)
+    else:
+        rng = np.random.default_rng(seed)
+        n_claims = rng.binomial(max(0, int(n_policies)), p_claim, size=shape)
+        # Gamma(0, θ) = 0 olduğundan hasarsız hücreler ayrıca ele alınmaz.
+        total_loss = rng.gamma(shape=n_claims, scale=mean_loss)
+
+    premium_income = float(n_policies) * float(premium)
+    expense = premium_income * expense_loading
+    uw_result = premium_income - expense - total_loss
+
+    capital = capital0 + np.cumsum(uw_result, axis=1)
+    ruined = (capital < 0).any(axis=1)
+
+    return {
+        "capital": capital,
+        "quantiles": dict(zip(quantiles, np.quantile(capital, quantiles, axis=0))),
+        "ruin_probability": float(ruined.mean()),
+        "final_capital": capital[:, -1],
+    }
+
+# Prim düzeyi (%) ve fiyata duyarlılık kaydırıcılarının tam ızgarası
+SWEEP_PREMIUM_FACTORS = np.arange(60, 161, 5)
+SWEEP_SENSITIVITIES = np.round(np.arange(0.0, 3.01, 0.1), 1)
+
+def sweep_surface(p_claim: float, mean_loss: float, expense_loading: float, profit_loading: float,
+                  base_policies: int, capital0: float, n_paths: int = 200, n_periods: int = 12,
+                  seed: SeedLike = None, sampler=None):
+    """
+    Prim düzeyi × duyarlılık ızgarasının tamamını tek bir NumPy geçişinde değerlendirir.
+    Tüm çıktılar (prim düzeyi, duyarlılık) şeklinde 2B dizilerdir.
+    sampler verilirse tüm hücreler aynı QMC nokta kümesini (yol başına 2 × n_periods boyut) paylaşır.
+    """
+    factors = SWEEP_PREMIUM_FACTORS.astype(float)
+    sens = SWEEP_SENSITIVITIES
+    suggested = suggested_gross_premium(p_claim, mean_loss, expense_loading, profit_loading)
+    premium = suggested * factors / 100.0
+    n_pol = demand_from_premium(premium[:, None], base_policies, suggested if suggested > 0 else 1.0, sens[None, :])
+
+    income = n_pol * premium[:, None]
+    expense = income * expense_loading
+    exp_loss = n_pol * p_claim * mean_loss
+    has_income = income > 0
+    exp_cr = np.divide(exp_loss + expense, income, out=np.zeros_like(income), where=has_income)
+
+    cell = (slice(None), slice(None), None, None)
+    if sampler is not None:
+        u = sampler.uniforms(n_paths)[:, :2 * n_periods].reshape(n_paths, n_periods, 2)
+        _, losses = sample_period_losses(np.broadcast_to(u, n_pol.shape + u.shape), n_pol[cell], p_claim, mean_loss)
+    else:
+        rng = np.random.default_rng(seed)
+        n_claims = rng.binomial(n_pol[cell], p_claim, size=n_pol.shape + (n_paths, n_periods))
+        losses = rng.gamma(shape=n_claims, scale=mean_loss)
+        del n_claims
+    total_loss = losses.sum(axis=(-1, -2))
+
+    # losses dizisi yerinde UW sonucuna, ardından sermayeye dönüştürülür (ek bellek yok)
+    uw = np.subtract((income - expense)[cell], losses, out=losses)
+    sim_uw = uw.mean(axis=(-1, -2))
+    capital = np.cumsum(uw, axis=-1, out=uw)
+    capital += capital0
+    ruin = (capital < 0).any(axis=-1).mean(axis=-1)
+
+    n_draws = n_paths * n_periods
+    sim_cr = np.divide(total_loss + expense * n_draws, income * n_draws, out=np.zeros_like(income), where=has_income)
+
+    return {
+        "premium_factor": SWEEP_PREMIUM_FACTORS,
+        "sensitivity": sens,
+        "policies": n_pol,
+        "expected_cr": exp_cr,
+        "simulated_cr": sim_cr,
+        "expected_uw": income - expense - exp_loss,
+        "simulated_uw": sim_uw,
+        "ruin_probability": ruin,
+    }
+
+# =============================
+# Koç
+# =============================
+def compute_last_insights(df, suggested_gross: float, premium_choice: float):
+    """
+    Son dönemin satırına göre yorum, öneri ve yol haritası üretir (kurallar: coach.COACH_RULES).
+    df: sonuç tablosu (pandas DataFrame), PeriodHistory veya aynı sütunlara sahip satır sözlüklerinin listesi.
+    Tüm geçmişi ya da toplu çıktıları satır satır değerlendirmek için coach.evaluate_table kullanılır.
+    """
+    last = [df.iloc[-1].to_dict() if hasattr(df, "iloc") else dict(df[-1])]
+    diagnosis, actions = evaluate_table(last, suggested_gross, premium=premium_choice).messages(-1)
+    return diagnosis, actions, list(COACH_ROADMAP)
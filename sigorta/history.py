@@ -0,0 +1,119 @@
+"""
+Oturum geçmişi için sütunlu (columnar) depo.
+
+Her sütun tipli bir NumPy dizisidir; kapasite dolunca iki katına çıkarılır (amorti O(1) ekleme).
+"Piyasa koşulu" gibi metin sütunları kategori kodu olarak saklanır. Türetilmiş görünümler
+(ör. arayüzün DataFrame'i, grafik verisi) sürüm numarasıyla önbelleğe alınır ve yalnızca
+yeni dönem eklendiğinde geçersiz olur; aradaki yeniden çalıştırmalar (rerun) bedava kalır.
+"""
+from typing import Callable, Optional
+
+import numpy as np
+
+HISTORY_COLUMNS = {
+    "Fiyatlama Dönemi": np.int64,
+    "Piyasa koşulu": object,
+    "Tohum": np.int64,
+    "Poliçe": np.int64,
+    "Referans Satış (poliçe)": np.int64,
+    "Prim/poliçe": np.float64,
+    "Prim Geliri": np.float64,
+    "Hasar Adedi": np.int64,
+    "Toplam Hasar": np.float64,
+    "Gider": np.float64,
+    "UW Sonucu": np.float64,
+    "Combined Ratio": np.float64,
+    "Sermaye": np.float64,
+}
+INITIAL_CAPACITY = 16
+
+class PeriodHistory:
+    """
+    Dönem sonuçlarının sütunlu geçmişi. Satır sözlüğüyle eklenir (append), sütun görünümleriyle okunur.
+    h[-1] son satırı sözlük olarak verir; compute_last_insights doğrudan bu nesneyi kabul eder.
+    """
+
+    def __init__(self, columns: Optional[dict] = None, capacity: int = INITIAL_CAPACITY):
+        self.dtypes = dict(columns or HISTORY_COLUMNS)
+        self._data = {}
+        self._categories = {}
+        for name, dtype in self.dtypes.items():
+            if dtype is object:
+                # Metin sütunu: int16 kod + kategori listesi
+                self._data[name] = np.empty(capacity, dtype=np.int16)
+                self._categories[name] = []
+            else:
+                self._data[name] = np.empty(capacity, dtype=dtype)
+        self._size = 0
+        self.version = 0
+        self._views = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    @property
+    def capacity(self) -> int:
+        return next(iter(self._data.values())).size
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self._data.values())
+
+    def append(self, row: dict):
+        if self._size == self.capacity:
+            for name, values in self._data.items():
+                grown = np.empty(2 * values.size, dtype=values.dtype)
+                grown[:self._size] = values[:self._size]
+                self._data[name] = grown
+        for name in self.dtypes:
+            value = row[name]
+            if name in self._categories:
+                categories = self._categories[name]
+                if value not in categories:
+                    categories.append(value)
+                value = categories.index(value)
+            self._data[name][self._size] = value
+        self._size += 1
+        self.version += 1
+        self._views.clear()
+
+    def column(self, name: str) -> np.ndarray:
+        """Sütunun salt okunur görünümü (kategori sütunlarında metin dizisi)."""
+        values = self._data[name][:self._size]
+        if name in self._categories:
+            return np.asarray(self._categories[name], dtype=object)[values]
+        view = values.view()
+        view.flags.writeable = False
+        return view
+
+    def columns(self, names: Optional[list] = None) -> dict:
+        return {name: self.column(name) for name in (names or self.dtypes)}
+
+    def row(self, index: int) -> dict:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Geçmişte böyle bir dönem yok.")
+        row = {}
+        for name, values in self._data.items():
+            value = values[index]
+            row[name] = self._categories[name][value] if name in self._categories else value.item()
+        return row
+
+    def __getitem__(self, index: int) -> dict:
+        return self.row(index)
+
+    def view(self, name: str, build: Callable[["PeriodHistory"], object]):
+        """build(self) sonucunu bir sonraki eklemeye kadar saklar."""
+        if name not in self._views:
+            self._views[name] = build(self)
+        return self._views[name]
+
+    def __getstate__(self):
+        # Türetilmiş görünümler (DataFrame vb.) serileştirilmez
+        state = self.__dict__.copy()
+        state["_views"] = {}
+        return state
@@ -0,0 +1,206 @@
+"""
+K sigortacılı rekabetçi piyasa.
+
+Her dönem toplam piyasa talebi, ortalama piyasa primine göre demand_from_premium ile belirlenir
+ve sigortacılar arasında fiyatla softmax payına bölünür:
+
+    pay_k ∝ exp(-duyarlılık × (prim_k / referans prim - 1))
+
+Bu, tek sigortacılı talep fonksiyonunun üssüyle aynıdır; ucuz olan pay kazanır. Sermayesi
+sıfırın altına düşen sigortacı piyasadan çıkar. Her sigortacının bir sonraki dönem primi bir
+fiyatlama kuralıyla belirlenir; kurallar değiştirilebilir (PRICING_RULES ya da kendi fonksiyonunuz).
+
+Tüm denemeler ve sigortacılar her dönem tek bir NumPy geçişinde ilerler; sonuçlar
+(deneme × sigortacı × dönem) dizileridir.
+"""
+from typing import Callable, NamedTuple, Sequence, Union
+
+import numpy as np
+
+from .core import SeedLike, demand_from_premium, suggested_gross_premium
+
+MARKET_SENSITIVITY = 0.3   # toplam piyasa talebinin ortalama fiyata duyarlılığı (paylaşımdan düşük)
+
+class MarketState(NamedTuple):
+    """Fiyatlama kurallarına verilen durum; diziler (deneme, sigortacı) şeklindedir."""
+    period: int
+    premium: np.ndarray
+    base_premium: np.ndarray      # (sigortacı,) kendi yüklemeleriyle önerilen prim × prim düzeyi
+    reference_premium: float
+    share: np.ndarray
+    combined_ratio: np.ndarray
+    capital: np.ndarray
+    alive: np.ndarray
+
+# Kural: (durum, sütunlar) → bu sigortacıların yeni primi, (deneme, len(sütunlar))
+PricingRule = Callable[[MarketState, np.ndarray], np.ndarray]
+
+def _market_average(state: MarketState) -> np.ndarray:
+    """Pay ağırlıklı ortalama piyasa primi, (deneme, 1)."""
+    total = state.share.sum(axis=1, keepdims=True)
+    weighted = (state.premium * state.share).sum(axis=1, keepdims=True)
+    return np.divide(weighted, total, out=np.full_like(total, state.reference_premium), where=total > 0)
+
+def fixed_price() -> PricingRule:
+    """Prim hiç değişmez."""
+    def rule(state, cols):
+        return np.broadcast_to(state.base_premium[cols], (state.premium.shape[0], cols.size)).copy()
+    return rule
+
+def follow_market(weight: float = 0.5) -> PricingRule:
+    """Primi her dönem piyasa ortalamasına weight oranında yaklaştırır."""
+    def rule(state, cols):
+        return (1.0 - weight) * state.premium[:, cols] + weight * _market_average(state)
+    return rule
+
+def undercut(margin: float = 0.03, floor: float = 0.85) -> PricingRule:
+    """En ucuz rakibin margin altına iner; kendi primi floor × başlangıç priminin altına düşmez."""
+    def rule(state, cols):
+        live = np.where(state.alive, state.premium, np.inf)
+        if live.shape[1] < 2:
+            return state.premium[:, cols].copy()
+        # Her sigortacı için kendisi hariç en ucuz: en ucuz kendisiyse ikinci en ucuz
+        lowest = np.partition(live, 1, axis=1)
+        cheapest = np.where(live.argmin(axis=1)[:, None] == cols, lowest[:, 1:2], lowest[:, :1])
+        target = np.where(np.isfinite(cheapest), cheapest * (1.0 - margin), state.premium[:, cols])
+        return np.maximum(target, floor * state.base_premium[cols])
+    return rule
+
+def target_cr(target: float = 1.0, step: float = 0.05, band: float = 0.05,
+              bounds: tuple = (0.7, 1.5)) -> PricingRule:
+    """Son dönem CR hedefin üstündeyse primi step kadar artırır, band kadar altındaysa yarım step indirir."""
+    def rule(state, cols):
+        cr = state.combined_ratio[:, cols]
+        factor = np.where(cr > target, 1.0 + step, np.where(cr < target - band, 1.0 - step / 2, 1.0))
+        base = state.base_premium[cols]
+        return np.clip(state.premium[:, cols] * factor, bounds[0] * base, bounds[1] * base)
+    return rule
+
+PRICING_RULES = {
+    "sabit": fixed_price,
+    "takipçi": follow_market,
+    "fiyat kırıcı": undercut,
+    "CR hedefli": target_cr,
+}
+
+class Insurer(NamedTuple):
+    name: str
+    premium_factor: float = 100.0   # önerilen brüt primin yüzdesi
+    expense_loading: float = 0.20
+    profit_loading: float = 0.10
+    capital0: float = 1_000_000.0
+    rule: Union[str, PricingRule] = "sabit"
+
+def make_insurers(n_competitors: int, expense_loading: float = 0.20, profit_loading: float = 0.10,
+                  capital0: float = 1_000_000.0, premium_factor: float = 100.0,
+                  rules: Sequence[str] = tuple(PRICING_RULES), seed: SeedLike = 0) -> list:
+    """
+    İlk sırada kullanıcı ("Sen", sabit prim), ardından kuralları sırayla dönüşümlü kullanan
+    n_competitors rakip. Rakiplerin prim düzeyi %90–%110, yüklemeleri kullanıcınınkinin ±%5 puanı içindedir.
+    """
+    rng = np.random.default_rng(seed)
+    insurers = [Insurer("Sen", premium_factor, expense_loading, profit_loading, capital0, "sabit")]
+    for i in range(n_competitors):
+        insurers.append(Insurer(
+            name=f"Rakip {i + 1} ({rules[i % len(rules)]})",
+            premium_factor=float(np.round(rng.uniform(90, 110))),
+            expense_loading=float(np.round(np.clip(expense_loading + rng.uniform(-0.05, 0.05), 0.0, 0.6), 3)),
+            profit_loading=float(np.round(np.clip(profit_loading + rng.uniform(-0.05, 0.05), 0.0, 0.6), 3)),
+            capital0=capital0,
+            rule=rules[i % len(rules)],
+        ))
+    return insurers
+
+def simulate_market(insurers: Sequence[Insurer], p_claim: float, mean_loss: float, market_policies: int,
+                    sensitivity: float, reference_premium: float = None,
+                    market_sensitivity: float = MARKET_SENSITIVITY, n_trials: int = 10_000,
+                    n_periods: int = 12, seed: SeedLike = None):
+    """
+    reference_premium verilmezse ilk sigortacının yüklemeleriyle önerilen brüt primdir.
+    Dönüş: (deneme × sigortacı × dönem) prim, pay, poliçe, CR ve sermaye dizileri ile sigortacı
+    bazında özetler (ortalama pay, ortalama CR, iflas olasılığı, dönem sonu sermaye medyanı).
+    """
+    insurers = list(insurers)
+    k = len(insurers)
+    expense = np.array([ins.expense_loading for ins in insurers])
+    base_premium = np.array([
+        suggested_gross_premium(p_claim, mean_loss, ins.expense_loading, ins.profit_loading) * ins.premium_factor / 100.0
+        for ins in insurers
+    ])
+    if reference_premium is None:
+        reference_premium = suggested_gross_premium(p_claim, mean_loss, insurers[0].expense_loading, insurers[0].profit_loading)
+    reference_premium = reference_premium if reference_premium > 0 else 1.0
+
+    # Aynı kuralı kullanan sigortacılar tek çağrıda fiyatlanır
+    groups = {}
+    for i, ins in enumerate(insurers):
+        key = ins.rule if isinstance(ins.rule, str) else id(ins.rule)
+        groups.setdefault(key, (PRICING_RULES[ins.rule]() if isinstance(ins.rule, str) else ins.rule, []))[1].append(i)
+    groups = [(rule, np.array(cols)) for rule, cols in groups.values()]
+
+    # Dönem ilk eksende tutulur (her dönem bitişik yazılır); dönüşte (deneme, sigortacı, dönem) görünümüne çevrilir
+    shape = (n_periods, n_trials, k)
+    out_premium = np.empty(shape, dtype=np.float32)
+    out_share = np.empty(shape, dtype=np.float32)
+    out_policies = np.empty(shape, dtype=np.int32)
+    out_cr = np.empty(shape, dtype=np.float32)
+    out_capital = np.empty(shape)
+
+    rng = np.random.default_rng(seed)
+    premium = np.tile(base_premium, (n_trials, 1))
+    capital = np.tile(np.array([ins.capital0 for ins in insurers], dtype=float), (n_trials, 1))
+    alive = np.ones((n_trials, k), dtype=bool)
+    income_total = np.zeros((n_trials, k))
+    cost_total = np.zeros((n_trials, k))
+    for t in range(n_periods):
+        logits = np.where(alive, -sensitivity * (premium / reference_premium - 1.0), -np.inf)
+        logits -= np.max(logits, axis=1, keepdims=True, initial=-1e300, where=alive)
+        weights = np.exp(logits)
+        total_weight = weights.sum(axis=1, keepdims=True)
+        share = np.divide(weights, total_weight, out=np.zeros_like(weights), where=total_weight > 0)
+
+        average = (premium * share).sum(axis=1)
+        demand = demand_from_premium(np.where(average > 0, average, reference_premium),
+                                     market_policies, reference_premium, market_sensitivity)
+        policies = np.rint(demand[:, None] * share).astype(np.int64)
+        n_claims = rng.binomial(policies, p_claim)
+        losses = rng.gamma(shape=n_claims, scale=mean_loss)
+        income = policies * premium
+        costs = losses + income * expense
+        capital += income - costs
+        income_total += income
+        cost_total += costs
+        cr = np.divide(costs, income, out=np.zeros_like(income), where=income > 0)
+        alive &= capital >= 0
+
+        out_premium[t] = premium
+        out_share[t] = share
+        out_policies[t] = policies
+        out_cr[t] = cr
+        out_capital[t] = capital
+
+        state = MarketState(t + 1, premium, base_premium, reference_premium, share, cr, capital, alive)
+        next_premium = premium.copy()
+        for rule, cols in groups:
+            next_premium[:, cols] = rule(state, cols)
+        premium = next_premium
+
+    income_sum = income_total.sum(axis=0)
+    premium_tkp, share_tkp, policies_tkp, cr_tkp, capital_tkp = (
+        np.moveaxis(a, 0, -1) for a in (out_premium, out_share, out_policies, out_cr, out_capital))
+    return {
+        "insurers": [ins.name for ins in insurers],
+        "base_premium": base_premium,
+        "premium": premium_tkp,
+        "share": share_tkp,
+        "policies": policies_tkp,
+        "combined_ratio": cr_tkp,
+        "capital": capital_tkp,
+        "mean_share": out_share.mean(axis=(0, 1)),
+        "share_by_period": out_share.mean(axis=1).T,
+        "mean_premium_by_period": out_premium.mean(axis=1).T,
+        "mean_cr": np.divide(cost_total.sum(axis=0), income_sum, out=np.zeros(k), where=income_sum > 0),
+        "mean_policies": out_policies.mean(axis=(0, 1)),
+        "ruin_probability": (~alive).mean(axis=0),
+        "final_capital_median": np.median(out_capital[-1], axis=0),
+    }
@@ -0,0 +1,98 @@
+"""
+Çok branşlı portföy: branşlar ortak bir katastrofik şokla (common shock) birbirine bağlıdır.
+
+Her dönem olasılığı cat_probability olan bir katastrofik yıl yaşanabilir; yaşanırsa şiddeti
+S ~ Pareto (ortalaması cat_severity) olur ve her branşın hasar olasılığı
+p × (1 + cat_sensitivity × S) katına çıkar. Şok tüm branşlarda aynı anda görüldüğünden
+hasarlar birlikte artar; cat_probability = 0 iken branşlar bağımsızdır.
+
+Tüm yollar, dönemler ve branşlar tek bir (yol × dönem × branş) NumPy geçişinde simüle edilir;
+hasar adedi ~ Binom(poliçe, p_etkin), toplam hasar ~ Gamma(hasar adedi, ortalama hasar).
+"""
+from typing import Mapping, Optional
+
+import numpy as np
+
+from .core import SeedLike, suggested_gross_premium
+
+MULTILINE_LINES = {
+    "Konut": {"p_claim": 0.04, "mean_loss": 30_000, "policies": 3_000, "cat_sensitivity": 4.0},
+    "Kasko": {"p_claim": 0.15, "mean_loss": 12_000, "policies": 5_000, "cat_sensitivity": 0.8},
+    "İşyeri": {"p_claim": 0.06, "mean_loss": 60_000, "policies": 1_000, "cat_sensitivity": 2.5},
+}
+CAT_PROBABILITY = 0.05
+CAT_SEVERITY = 1.0
+CAT_TAIL_INDEX = 2.5   # Pareto kuyruk indeksi (> 1)
+
+def simulate_multiline(lines: Mapping[str, Mapping] = MULTILINE_LINES, expense_loading: float = 0.20,
+                       profit_loading: float = 0.10, premium_factor: float = 100.0,
+                       cat_probability: float = CAT_PROBABILITY, cat_severity: float = CAT_SEVERITY,
+                       n_paths: int = 20_000, n_periods: int = 12, target_ruin: float = 0.005,
+                       capital0: Optional[float] = None, seed: SeedLike = None):
+    """
+    Her branşın primi, katastrofik yük dahil beklenen hasar olasılığından önerilen brüt prim
+    × premium_factor / 100 olarak alınır.
+    Dönüş: branş bazında ve toplam combined ratio (beklenen / simüle / %99 kantil), branşlar arası
+    hasar prim oranı korelasyonu, n_periods boyunca iflas olasılığını target_ruin'de tutan sermaye
+    (branş tek başına ve portföy) ve çeşitlendirme faydası. capital0 verilirse portföyün o sermayeyle
+    iflas olasılığı da döner. Branş bazında diziler lines sırasındadır.
+    """
+    if not 0.0 <= cat_probability <= 1.0:
+        raise ValueError("cat_probability 0 ile 1 arasında olmalı.")
+    names = list(lines)
+    p_claim = np.array([lines[n]["p_claim"] for n in names], dtype=float)
+    mean_loss = np.array([lines[n]["mean_loss"] for n in names], dtype=float)
+    policies = np.array([lines[n]["policies"] for n in names], dtype=np.int64)
+    beta = np.array([lines[n].get("cat_sensitivity", 0.0) for n in names], dtype=float)
+
+    # Katastrof yükü dahil beklenen hasar olasılığı (p_etkin ≤ 1 kırpması ihmal edilir)
+    expected_p = p_claim * (1.0 + beta * cat_probability * cat_severity)
+    premium = suggested_gross_premium(expected_p, mean_loss, expense_loading, profit_loading) * premium_factor / 100.0
+    income = policies * premium
+    expense = income * expense_loading
+
+    rng = np.random.default_rng(seed)
+    shape = (n_paths, n_periods)
+    is_cat = rng.random(shape) < cat_probability
+    # Klasik Pareto: x_m (1 + Lomax(α)), ortalama = cat_severity
+    x_m = cat_severity * (CAT_TAIL_INDEX - 1) / CAT_TAIL_INDEX
+    shock = np.where(is_cat, x_m * (1.0 + rng.pareto(CAT_TAIL_INDEX, size=shape)), 0.0)
+    p_eff = np.minimum(p_claim * (1.0 + beta * shock[..., None]), 1.0)
+    n_claims = rng.binomial(policies, p_eff)
+    losses = rng.gamma(shape=n_claims, scale=mean_loss)
+    del n_claims, p_eff
+
+    # Son sütun portföy toplamı: (yol, dönem, branş + 1)
+    losses = np.concatenate([losses, losses.sum(axis=-1, keepdims=True)], axis=-1)
+    income_all = np.append(income, income.sum())
+    expense_all = np.append(expense, expense.sum())
+    cr = (losses + expense_all) / income_all
+
+    # Gereken sermaye: 12 dönemlik birikimli UW'nin en dip noktası, (1 - target_ruin) kantilinde
+    uw = np.subtract(income_all - expense_all, losses)
+    drawdown = np.maximum(0.0, -np.cumsum(uw, axis=1).min(axis=1))
+    capital = np.quantile(drawdown, 1.0 - target_ruin, axis=0)
+
+    loss_ratio = (losses[..., :-1] / income).reshape(-1, len(names))
+    expected_cr = (policies * expected_p * mean_loss + expense) / income
+    result = {
+        "lines": names,
+        "premium": premium,
+        "premium_income": income,
+        "expected_cr": expected_cr,
+        "combined_ratio": cr[..., :-1].mean(axis=(0, 1)),
+        "cr_q99": np.quantile(cr[..., :-1].reshape(-1, len(names)), 0.99, axis=0),
+        "aggregate_expected_cr": float((expected_cr * income).sum() / income.sum()),
+        "aggregate_combined_ratio": float(cr[..., -1].mean()),
+        "aggregate_cr_q99": float(np.quantile(cr[..., -1], 0.99)),
+        "cat_frequency": float(is_cat.mean()),
+        "cat_year_cr": float(cr[..., -1][is_cat].mean()) if is_cat.any() else float("nan"),
+        "loss_ratio_correlation": np.corrcoef(loss_ratio, rowvar=False),
+        "required_capital": capital[:-1],
+        "aggregate_required_capital": float(capital[-1]),
+        "diversification_benefit": float(1.0 - capital[-1] / capital[:-1].sum()) if capital[:-1].sum() > 0 else 0.0,
+        "target_ruin": target_ruin,
+    }
+    if capital0 is not None:
+        result["ruin_probability"] = float((drawdown[:, -1] > capital0).mean())
+    return result
@@ -0,0 +1,144 @@
+"""
+Süreç havuzu ile paralel senaryo çalıştırıcı.
+
+İş, batch.iter_chunks ile sabit boyutlu parçalara bölünür; her parçanın rastgele akışı
+SeedSequence.spawn ile parçanın kendisine bağlıdır. Parçalar bitiş sırasıyla toplanır ama
+sıra numarasına göre birleştirilir, bu yüzden çıktı çalışan sayısından bağımsız olarak
+bit düzeyinde aynıdır.
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, NamedTuple, Optional
+
+from .batch import DEFAULT_CHUNK_SIZE, Chunk, iter_chunks, simulate_chunk
+from .stats import RiskAccumulator
+
+class ChunkResult(NamedTuple):
+    index: int
+    records: list
+    pid: int
+    seconds: float
+    policies: int
+    risk: RiskAccumulator
+
+def _run_chunk(chunk: Chunk) -> ChunkResult:
+    t0 = time.perf_counter()
+    records = simulate_chunk(chunk)
+    seconds = time.perf_counter() - t0
+    policies = sum(r["Poliçe"] for r in records)
+    # Risk taslağı çalışan süreçte oluşturulur, ana süreçte yalnızca birleştirilir
+    risk = RiskAccumulator()
+    risk.update_records(records)
+    return ChunkResult(chunk.index, records, os.getpid(), seconds, policies, risk)
+
+def iter_chunk_results(runs: list[dict], workers: Optional[int] = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[ChunkResult]:
+    """
+    Parçaları süreç havuzunda çalıştırır ve sonuçları parça sırasıyla, hazır oldukça üretir.
+    Bellek sınırlı kalsın diye çalışan ve sıra bekleyen (bitmiş ama önceki parçası gelmemiş)
+    parçaların toplamı 2 × workers'ı aşmaz; yavaş bir parça yeni gönderimleri durdurur.
+    workers=1 ise havuz kurulmaz.
+    """
+    chunks = iter_chunks(runs, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield _run_chunk(chunk)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    pending, next_index = {}, 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) + len(pending) < 2 * workers:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    in_flight.add(pool.submit(_run_chunk, chunk))
+            if not in_flight:
+                break
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                pending[result.index] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+
+class RunSummary:
+    """
+    Bir koşunun özet istatistikleri; parçalar geldikçe güncellenir.
+    risk: UW Sonucu / Combined Ratio / loss ratio dağılımları için birleştirilmiş akış taslakları.
+    """
+
+    def __init__(self):
+        self.risk = RiskAccumulator()
+        self.n = 0
+        self.premium_income = 0.0
+        self.total_loss = 0.0
+        self.expense = 0.0
+        self.ceded_premium = 0.0
+        self.uw_sum = 0.0
+
+    def update(self, records: list):
+        for r in records:
+            self.n += 1
+            self.premium_income += r["Prim Geliri"]
+            self.total_loss += r["Toplam Hasar"]
+            self.expense += r["Gider"]
+            self.ceded_premium += r.get("Devredilen Prim", 0.0)
+            self.uw_sum += r["UW Sonucu"]
+
+    @property
+    def combined_ratio(self) -> float:
+        return (self.total_loss + self.expense + self.ceded_premium) / self.premium_income if self.premium_income > 0 else 0.0
+
+    @property
+    def uw_mean(self) -> float:
+        return self.uw_sum / self.n if self.n else 0.0
+
+    @property
+    def uw_std(self) -> float:
+        """Welford–Chan momentlerinden örneklem standart sapması (risk taslağı birleştirildikçe güncellenir)."""
+        return self.risk.uw.moments.std
+
+class WorkerStats:
+    """Çalışan süreç başına simüle edilen poliçe ve geçen süre."""
+
+    def __init__(self):
+        self.policies = {}
+        self.seconds = {}
+        self.chunks = {}
+
+    def update(self, result: ChunkResult):
+        self.policies[result.pid] = self.policies.get(result.pid, 0) + result.policies
+        self.seconds[result.pid] = self.seconds.get(result.pid, 0.0) + result.seconds
+        self.chunks[result.pid] = self.chunks.get(result.pid, 0) + 1
+
+    def throughput(self) -> dict:
+        """pid → saniyede simüle edilen poliçe."""
+        return {pid: self.policies[pid] / self.seconds[pid] if self.seconds[pid] > 0 else 0.0 for pid in self.policies}
+
+def run_parallel(runs: list[dict], sink=None, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Tüm koşuları paralel çalıştırır. Satırlar (varsa) sink'e parça sırasıyla yazılır,
+    koşu özetleri ve çalışan istatistikleri her parça geldiğinde güncellenir.
+    Dönüş: ({koşu no: RunSummary}, WorkerStats)
+    """
+    summaries = {run["run"]: RunSummary() for run in runs}
+    stats = WorkerStats()
+    for result in iter_chunk_results(runs, workers, chunk_size):
+        if result.records:
+            summary = summaries[result.records[0]["run"]]
+            summary.update(result.records)
+            summary.risk.merge(result.risk)
+        stats.update(result)
+        if sink is not None:
+            for record in result.records:
+                sink.write(record)
+    return summaries, stats
@@ -0,0 +1,233 @@
+"""
+Dönemden döneme taşınan, poliçe düzeyinde heterojen portföy.
+
+Her poliçe NumPy yapılı dizisinde (structured array) 11 baytlık bir satırdır: risk sınıfı,
+kendi hasar olasılığı, sigorta bedeli ve kıdemi (yenilenme sayısı). Bir milyon poliçe ≈ 11 MB.
+Dönem geçişi tamamen vektörel ve yerindedir:
+
+1. Yenileme: mevcut poliçeler fiyata bağlı bir iptal (lapse) olasılığıyla ayrılır, kalanların
+   kıdemi artar. Ayrılanlar dizinin başına doğru sıkıştırılarak silinir (kopya tablo yok).
+2. Yeni iş: demand_from_premium ile (referans satış × temel iptal oranı) ölçeğinde yeni poliçe
+   eklenir; kapasite dolunca dizi iki katına çıkar. Referans primde giriş ve çıkış dengededir,
+   portföy referans satış civarında kalır.
+3. Hasar: her poliçe kendi olasılığıyla hasar görür; hasar tutarı sigorta bedeliyle orantılı
+   ortalamalı üstel dağılımdan çekilir ve bedelle sınırlanır.
+"""
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .core import SeedLike, demand_from_premium
+
+# (ad, hasar olasılığı göreli katsayısı, yeni işteki payı); katsayılar karma ortalaması 1 olacak şekilde ölçeklenir
+RISK_CLASSES = (
+    ("Düşük risk", 0.5, 0.35),
+    ("Orta risk", 1.0, 0.45),
+    ("Yüksek risk", 2.2, 0.20),
+)
+POLICY_DTYPE = np.dtype([
+    ("risk_class", np.uint8),
+    ("p_claim", np.float32),
+    ("sum_insured", np.float32),
+    ("tenure", np.uint16),
+])
+BASE_LAPSE_RATE = 0.15
+P_CLAIM_SPREAD = 0.25          # sınıf içi hasar olasılığı dağılımı (lognormal σ, ortalama korunur)
+SUM_INSURED_MULTIPLE = 8.0     # ortalama sigorta bedeli = ortalama hasar × bu kat
+SUM_INSURED_SPREAD = 0.5
+MIN_CAPACITY = 1_024
+# replay için ara kayıtlar: her REPLAY_CHECKPOINT_EVERY dönemde bir portföy kopyası. Sayı ya da toplam
+# boyut sınırı aşılınca her ikinci kayıt atılır ve aralık ikiye katlanır (bellek sınırlı, replay O(aralık)).
+REPLAY_CHECKPOINT_EVERY = 32
+MAX_REPLAY_CHECKPOINTS = 16
+MAX_REPLAY_CHECKPOINT_BYTES = 32 * 2 ** 20
+_RAW = np.dtype((np.void, POLICY_DTYPE.itemsize))
+
+def _mean_one_lognormal(rng: np.random.Generator, sigma: float, n: int) -> np.ndarray:
+    """Ortalaması 1 olan lognormal çarpanlar (float32; rng.lognormal'dan belirgin hızlı)."""
+    z = rng.standard_normal(n, dtype=np.float32)
+    z *= sigma
+    z -= sigma ** 2 / 2
+    return np.exp(z, out=z)
+
+class PortfolioPeriod(NamedTuple):
+    policies: int        # dönem içinde yürürlükteki poliçe (yenilenen + yeni iş)
+    renewed: int
+    lapsed: int
+    new_business: int
+    n_claims: int
+    total_loss: float
+
+class Portfolio:
+    """
+    Kalıcı poliçe portföyü. Portfolio(n_policies, p_claim, mean_loss, seed) referans satış
+    büyüklüğünde, kıdemleri karışık bir başlangıç portföyü kurar; her dönem run_period ile ilerler.
+    p_claim ve mean_loss portföy ortalamalarıdır (SCENARIOS ile aynı anlamda).
+
+    Her run_period çağrısının argümanları log'a yazılır; replay(k) k. dönemden önceki en yakın ara
+    kayıttan (yoksa baştan) başlayıp dönemleri aynı argümanlarla yeniden işletir. Bunun için
+    tohumlar int ya da SeedSequence olmalıdır.
+    """
+
+    def __init__(self, n_policies: int, p_claim: float, mean_loss: float, seed: SeedLike = None,
+                 risk_classes: Sequence[tuple] = RISK_CLASSES, lapse_rate: float = BASE_LAPSE_RATE):
+        self._init_args = (n_policies, p_claim, mean_loss, seed, risk_classes, lapse_rate)
+        self.log = []
+        self._checkpoints = []          # (tamamlanan dönem, poliçeler, p_claim, mean_loss)
+        self._checkpoint_every = REPLAY_CHECKPOINT_EVERY
+        self.lapse_rate = float(lapse_rate)
+        self.class_names = tuple(name for name, _, _ in risk_classes)
+        shares = np.array([share for _, _, share in risk_classes], dtype=float)
+        self.class_shares = shares / shares.sum()
+        self._relativities = np.array([rel for _, rel, _ in risk_classes], dtype=float)
+        self._set_risk(p_claim, mean_loss)
+
+        # Yeni iş ilk dönemde diziyi büyütmesin diye yarım kat pay bırakılır
+        self._data = np.empty(max(MIN_CAPACITY, int(1.5 * n_policies)), dtype=POLICY_DTYPE)
+        self._size = 0
+        rng = np.random.default_rng(seed)
+        self._add(rng, int(n_policies))
+        # Başlangıçta kıdem, sabit iptal oranının durağan (geometrik) dağılımından gelir
+        tenure = rng.geometric(self.lapse_rate, size=self._size) - 1
+        self._data["tenure"][:self._size] = np.minimum(tenure, np.iinfo(np.uint16).max)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._data.size
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    @property
+    def policies(self) -> np.ndarray:
+        """Yürürlükteki poliçelerin salt okunur görünümü."""
+        view = self._data[:self._size].view()
+        view.flags.writeable = False
+        return view
+
+    def _set_risk(self, p_claim: float, mean_loss: float):
+        """Yeni işin ortalama hasar olasılığı ve ortalama hasarı; mevcut poliçeler kendi değerlerini korur."""
+        self.p_claim = float(p_claim)
+        self.mean_loss = float(mean_loss)
+        self.class_p_claim = self.p_claim * self._relativities / (self.class_shares @ self._relativities)
+        self.mean_sum_insured = self.mean_loss * SUM_INSURED_MULTIPLE
+
+    def _add(self, rng: np.random.Generator, n: int):
+        """n yeni poliçeyi yeni iş karmasından üretip sona ekler."""
+        if n <= 0:
+            return
+        end = self._size + n
+        if end > self.capacity:
+            grown = np.empty(max(end, 2 * self.capacity), dtype=POLICY_DTYPE)
+            grown.view(_RAW)[:self._size] = self._data.view(_RAW)[:self._size]
+            self._data = grown
+        new = self._data[self._size:end]
+        risk_class = rng.choice(len(self.class_shares), size=n, p=self.class_shares)
+        new["risk_class"] = risk_class
+        new["p_claim"] = np.minimum(self.class_p_claim[risk_class] * _mean_one_lognormal(rng, P_CLAIM_SPREAD, n), 1.0)
+        new["sum_insured"] = self.mean_sum_insured * _mean_one_lognormal(rng, SUM_INSURED_SPREAD, n)
+        new["tenure"] = 0
+        self._size = end
+
+    def lapse_probability(self, premium: float, reference_premium: float, sensitivity: float) -> float:
+        """İptal olasılığı = temel oran × exp(duyarlılık × (prim / referans prim - 1)), [0, 1] aralığında."""
+        ratio = premium / reference_premium if reference_premium > 0 else 1.0
+        return float(min(1.0, self.lapse_rate * np.exp(sensitivity * (ratio - 1.0))))
+
+    def run_period(self, premium: float, reference_premium: float, base_policies: int, sensitivity: float,
+                   seed: SeedLike = None, p_claim: Optional[float] = None,
+                   mean_loss: Optional[float] = None) -> PortfolioPeriod:
+        """
+        Yenileme/iptal → yeni iş → hasar sırasıyla bir fiyatlama dönemi ilerletir.
+        p_claim / mean_loss verilirse bu dönemden itibaren yeni iş bu ortalamalarla üretilir (senaryo değişimi).
+        """
+        if self._checkpoint_every and self.log and len(self.log) % self._checkpoint_every == 0:
+            self._checkpoint()
+        self.log.append((premium, reference_premium, base_policies, sensitivity, seed, p_claim, mean_loss))
+        if p_claim is not None or mean_loss is not None:
+            self._set_risk(self.p_claim if p_claim is None else p_claim,
+                           self.mean_loss if mean_loss is None else mean_loss)
+        rng = np.random.default_rng(seed)
+
+        n_before = self._size
+        lapse = self.lapse_probability(premium, reference_premium, sensitivity)
+        keep = rng.random(n_before, dtype=np.float32) >= lapse
+        renewed = int(np.count_nonzero(keep))
+        # Satırlar ham bayt (void) olarak taşınır; yapılı dizide alan alan kopyadan ~5 kat hızlı
+        raw = self._data.view(_RAW)
+        raw[:renewed] = np.compress(keep, raw[:n_before])
+        self._size = renewed
+        tenure = self._data["tenure"][:renewed]
+        tenure += tenure < np.iinfo(np.uint16).max
+
+        new_business = demand_from_premium(premium, base_policies * self.lapse_rate, reference_premium, sensitivity)
+        self._add(rng, new_business)
+
+        book = self._data[:self._size]
+        claimed = np.flatnonzero(rng.random(self._size, dtype=np.float32) < book["p_claim"])
+        sum_insured = book["sum_insured"][claimed].astype(float)
+        losses = rng.exponential(self.mean_loss * sum_insured / self.mean_sum_insured)
+        total_loss = float(np.minimum(losses, sum_insured).sum())
+
+        return PortfolioPeriod(self._size, renewed, n_before - renewed, new_business, claimed.size, total_loss)
+
+    def _checkpoint(self):
+        self._checkpoints.append((len(self.log), self._data[:self._size].copy(), self.p_claim, self.mean_loss))
+        while (len(self._checkpoints) > MAX_REPLAY_CHECKPOINTS
+               or sum(c[1].nbytes for c in self._checkpoints) > MAX_REPLAY_CHECKPOINT_BYTES):
+            self._checkpoint_every *= 2
+            self._checkpoints = [c for c in self._checkpoints if c[0] % self._checkpoint_every == 0]
+
+    def _restore(self, checkpoint) -> "Portfolio":
+        """Ara kayıttan, log'u ve ara kaydı olmayan bağımsız bir kopya."""
+        done, policies, p_claim, mean_loss = checkpoint
+        book = Portfolio.__new__(Portfolio)
+        book.__dict__.update(self.__dict__)
+        book.log, book._checkpoints, book._checkpoint_every = [], [], 0
+        book._data = np.empty(max(MIN_CAPACITY, int(1.5 * policies.size)), dtype=POLICY_DTYPE)
+        book._data[:policies.size] = policies
+        book._size = policies.size
+        book._set_risk(p_claim, mean_loss)
+        return book
+
+    def replay(self, n_periods: int) -> PortfolioPeriod:
+        """
+        Log'daki ilk n_periods dönemi yeniden işletir ve son dönemin sonucunu döndürür; n_periods'tan
+        önceki en yakın ara kayıttan başlar, böylece maliyet toplam dönem sayısıyla büyümez.
+        """
+        if not 1 <= n_periods <= len(self.log):
+            raise IndexError("Portföy geçmişinde böyle bir dönem yok.")
+        usable = [c for c in self._checkpoints if c[0] < n_periods]
+        if usable:
+            start = usable[-1][0]
+            book = self._restore(usable[-1])
+        else:
+            start = 0
+            book = Portfolio(*self._init_args)
+            book._checkpoint_every = 0
+        for args in self.log[start:n_periods]:
+            result = book.run_period(*args)
+        return result
+
+    def summary(self) -> dict:
+        """Risk sınıfı bazında poliçe adedi, ortalama hasar olasılığı, sigorta bedeli ve kıdem."""
+        book = self._data[:self._size]
+        n_classes = len(self.class_names)
+        counts = np.bincount(book["risk_class"], minlength=n_classes)
+        safe = np.maximum(counts, 1)
+
+        def class_mean(field: str) -> np.ndarray:
+            return np.bincount(book["risk_class"], weights=book[field], minlength=n_classes) / safe
+
+        return {
+            "risk_class": self.class_names,
+            "policies": counts,
+            "share": counts / max(1, self._size),
+            "mean_p_claim": class_mean("p_claim"),
+            "mean_sum_insured": class_mean("sum_insured"),
+            "mean_tenure": class_mean("tenure"),
+        }
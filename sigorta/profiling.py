@@ -0,0 +1,125 @@
+"""
+İsteğe bağlı süre ölçümü (rerun gecikmesi ve sıcak yollar).
+
+Ölçümler sabit boyutlu halka tamponlara (ring buffer) yazılır: oturum başına bir tampon ve
+süreç genelinde ortak PROCESS_TIMINGS. Ölçüm kapalıyken Profiler.timed paylaşılan boş bir
+bağlam, Profiler.wrap ise fonksiyonun kendisini döndürür; ek maliyet bir öznitelik okumasıdır.
+
+Streamlit betiği yukarıdan aşağı çalıştığından bölüm süreleri checkpoint ile ölçülür:
+her çağrı bir önceki checkpoint'ten bu yana geçen süreyi verilen adla kaydeder.
+"""
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Callable, Optional
+
+DEFAULT_BUFFER_SIZE = 2_000
+PROCESS_BUFFER_SIZE = 50_000
+_NULL = nullcontext()
+
+def _percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+class TimingBuffer:
+    """(ad, saniye, zaman damgası) kayıtlarını tutan, kilitle korunan halka tampon."""
+
+    def __init__(self, maxlen: int = DEFAULT_BUFFER_SIZE):
+        self._records = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self._records.append((name, seconds, time.time()))
+
+    def records(self) -> list:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> dict:
+        """ad → çağrı sayısı, toplam/ortalama/p50/p95/en büyük süre (ms)."""
+        groups = {}
+        for name, seconds, _ in self.records():
+            groups.setdefault(name, []).append(seconds * 1000.0)
+        out = {}
+        for name, values in groups.items():
+            values.sort()
+            out[name] = {
+                "count": len(values),
+                "total_ms": sum(values),
+                "mean_ms": sum(values) / len(values),
+                "p50_ms": _percentile(values, 0.50),
+                "p95_ms": _percentile(values, 0.95),
+                "max_ms": values[-1],
+            }
+        return out
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps({
+            "summary": self.summary(),
+            "records": [{"name": n, "ms": s * 1000.0, "time": t} for n, s, t in self.records()],
+        }, ensure_ascii=False, indent=indent)
+
+PROCESS_TIMINGS = TimingBuffer(PROCESS_BUFFER_SIZE)
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class Profiler:
+    """Ölçümleri verilen tamponların hepsine yazar; enabled=False iken hiçbir şey yapmaz."""
+
+    def __init__(self, *buffers: TimingBuffer, enabled: bool = True):
+        self.buffers = buffers
+        self.enabled = enabled
+        self._last = time.perf_counter()
+
+    def record(self, name: str, seconds: float):
+        for buffer in self.buffers:
+            buffer.record(name, seconds)
+
+    def timed(self, name: str):
+        return _Timer(self, name) if self.enabled else _NULL
+
+    def wrap(self, func: Callable, name: Optional[str] = None) -> Callable:
+        if not self.enabled:
+            return func
+        name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(self, name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def checkpoint(self, name: str):
+        """Bir önceki checkpoint'ten (ya da oluşturulmadan) bu yana geçen süreyi name ile kaydeder."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.record(name, now - self._last)
+        self._last = now
+
+DISABLED_PROFILER = Profiler(enabled=False)
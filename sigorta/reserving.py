@@ -0,0 +1,304 @@
+"""
+Hasar gelişimi ve rezerv (IBNR) tahmini.
+
+Bir kaza döneminin (origin) nihai hasarı tek seferde ödenmez: gelişme dönemlerine bir ödeme
+deseniyle yayılır, bildirimler de ayrı bir desenle gelir. Satırlar kaza dönemi, sütunlar gelişme
+dönemi olan kümülatif ödenen ve gerçekleşen (ödenen + dosya muallağı) üçgenleri tutulur; değerleme
+anında yalnızca i + j < değerleme dönemi hücreleri gözlenir.
+
+- Gelişme: her kaza döneminin payları Dirichlet(yoğunluk × desen) ile çekilir; ortalaması desendir,
+  yoğunluk büyüdükçe desene yaklaşır. Gerçekleşen hiçbir zaman ödenenin altında kalmaz.
+- Chain-ladder: hacim ağırlıklı gelişme faktörleri; Bornhuetter-Ferguson: önsel beklenen nihai
+  hasar ile gelişmemiş payın birleşimi.
+- Bootstrap: ödenen üçgende ODP (aşırı yayılımlı Poisson) Pearson artıklarının yeniden örneklenmesi
+  ve süreç varyansı için Gamma.
+
+Tüm hesaplar önde ek eksenli (yol × kaza × gelişme) üçgenler üzerinde tek bir NumPy geçişidir;
+binlerce simülasyon yolu ya da bootstrap örneği aynı anda değerlendirilir.
+"""
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .core import SeedLike
+
+# Gelişme dönemi başına ödenen ve bildirilen paylar (toplamları 1'e ölçeklenir)
+PAYMENT_PATTERN = (0.40, 0.25, 0.15, 0.10, 0.06, 0.04)
+REPORTING_PATTERN = (0.70, 0.20, 0.06, 0.03, 0.01, 0.00)
+DEVELOPMENT_PATTERNS = {
+    "Kısa kuyruk (kasko)": {"payment_pattern": (0.55, 0.30, 0.10, 0.05),
+                            "reporting_pattern": (0.85, 0.12, 0.03, 0.00)},
+    "Orta kuyruk (konut)": {"payment_pattern": PAYMENT_PATTERN,
+                            "reporting_pattern": REPORTING_PATTERN},
+    "Uzun kuyruk (sorumluluk)": {"payment_pattern": (0.15, 0.20, 0.18, 0.14, 0.11, 0.09, 0.07, 0.06),
+                                 "reporting_pattern": (0.45, 0.25, 0.12, 0.08, 0.05, 0.03, 0.02, 0.00)},
+}
+DEVELOPMENT_CONCENTRATION = 100.0
+DEVELOPMENT_STREAM = 0          # dönem 0 hiç simüle edilmez; oturumun gelişme akışına ayrılır
+BOOTSTRAP_QUANTILES = (0.50, 0.75, 0.95, 0.995)
+BOOTSTRAP_CHUNK_SIZE = 8_192
+
+def normalize_pattern(pattern: Sequence[float]) -> np.ndarray:
+    """Deseni negatif olmayan, toplamı 1 olan diziye çevirir."""
+    p = np.asarray(pattern, dtype=float)
+    if p.ndim != 1 or p.size == 0 or np.any(p < 0) or p.sum() <= 0:
+        raise ValueError("Gelişme deseni negatif olmayan ve toplamı pozitif bir dizi olmalı.")
+    return p / p.sum()
+
+def pattern_factors(pattern: Sequence[float]) -> np.ndarray:
+    """Desenin ima ettiği gelişme faktörleri (j → j + 1), (J - 1,)."""
+    cum = np.cumsum(normalize_pattern(pattern))
+    return np.divide(cum[1:], cum[:-1], out=np.ones(cum.size - 1), where=cum[:-1] > 0)
+
+def observed_mask(n_origins: int, n_dev: int, valuation: Optional[int] = None) -> np.ndarray:
+    """Değerleme anında gözlenen hücreler: i + j < valuation (varsayılan: kaza dönemi sayısı)."""
+    valuation = n_origins if valuation is None else valuation
+    return np.add.outer(np.arange(n_origins), np.arange(n_dev)) < valuation
+
+class ClaimsTriangle(NamedTuple):
+    """Önde ek eksenlere izin veren (..., kaza, gelişme) kümülatif üçgenler; gözlenmeyen hücreler de doludur (gerçek)."""
+    paid: np.ndarray
+    incurred: np.ndarray
+    ultimate: np.ndarray          # (..., kaza) gerçek nihai hasar
+    premium: np.ndarray           # (..., kaza) prim geliri
+    mask: np.ndarray              # (kaza, gelişme) gözlenen hücreler
+
+    def __len__(self) -> int:
+        return self.mask.shape[0]
+
+    @property
+    def latest_dev(self) -> np.ndarray:
+        """Kaza dönemi başına son gözlenen gelişme dönemi (gözlem yoksa -1)."""
+        return self.mask.sum(axis=1) - 1
+
+    def latest(self, kind: str = "paid") -> np.ndarray:
+        """Son köşegen: (..., kaza)."""
+        tri = getattr(self, kind)
+        d = self.latest_dev
+        return np.where(d >= 0, tri[..., np.arange(len(self)), np.maximum(d, 0)], 0.0)
+
+    def observed(self, kind: str = "paid") -> np.ndarray:
+        """Gözlenmeyen hücreleri NaN olan üçgen (gösterim için)."""
+        return np.where(self.mask, getattr(self, kind), np.nan)
+
+    def outstanding(self) -> np.ndarray:
+        """Gerçek ödenecek (muallak + IBNR) hasar: nihai - ödenen, (..., kaza)."""
+        return self.ultimate - self.latest("paid")
+
+    def calendar_paid(self) -> np.ndarray:
+        """Takvim dönemi (i + j) başına ödenen hasar; yalnızca gözlenen hücreler, (..., değerleme)."""
+        n_origins, n_dev = self.mask.shape
+        inc = np.diff(self.paid, axis=-1, prepend=0.0)[..., self.mask]
+        calendar = np.add.outer(np.arange(n_origins), np.arange(n_dev))[self.mask]
+        out = np.zeros(inc.shape[:-1] + (n_origins,))
+        np.add.at(out, (..., calendar), inc)
+        return out
+
+    def tail(self, n_origins: int) -> "ClaimsTriangle":
+        """Son n_origins kaza dönemi (değerleme anı değişmez)."""
+        n = min(n_origins, len(self))
+        return ClaimsTriangle(self.paid[..., -n:, :], self.incurred[..., -n:, :], self.ultimate[..., -n:],
+                              self.premium[..., -n:], self.mask[-n:])
+
+def develop_claims(ultimate, premium=None, payment_pattern: Sequence[float] = PAYMENT_PATTERN,
+                   reporting_pattern: Sequence[float] = REPORTING_PATTERN,
+                   concentration: float = DEVELOPMENT_CONCENTRATION, valuation: Optional[int] = None,
+                   seed: SeedLike = None) -> ClaimsTriangle:
+    """
+    (..., kaza) nihai hasarları gelişme dönemlerine dağıtır. İki desen aynı uzunlukta olmalı.
+    Kaza dönemleri sırayla çekildiğinden bir kaza döneminin gelişmesi, sonraki kaza dönemlerinin
+    eklenmesiyle değişmez (aynı tohumla oturum boyunca tutarlıdır).
+    """
+    pay = normalize_pattern(payment_pattern)
+    rep = normalize_pattern(reporting_pattern)
+    if pay.size != rep.size:
+        raise ValueError("Ödeme ve bildirim desenleri aynı uzunlukta olmalı.")
+    ult = np.asarray(ultimate, dtype=float)
+    if ult.ndim == 0:
+        ult = ult[None]
+    n_dev = pay.size
+
+    rng = np.random.default_rng(seed)
+    draws = rng.gamma(concentration * np.stack([pay, rep]), size=ult.shape + (2, n_dev))
+    share = np.cumsum(draws, axis=-1)
+    share /= np.where(share[..., -1:] > 0, share[..., -1:], 1.0)
+    share[..., -1] = 1.0
+    paid = ult[..., None] * share[..., 0, :]
+    incurred = ult[..., None] * np.maximum(share[..., 1, :], share[..., 0, :])
+
+    premium = np.zeros_like(ult) if premium is None else np.broadcast_to(np.asarray(premium, dtype=float), ult.shape)
+    return ClaimsTriangle(paid, incurred, ult, premium, observed_mask(ult.shape[-1], n_dev, valuation))
+
+def triangle_from_history(history, payment_pattern: Sequence[float] = PAYMENT_PATTERN,
+                          reporting_pattern: Sequence[float] = REPORTING_PATTERN,
+                          concentration: float = DEVELOPMENT_CONCENTRATION,
+                          n_origins: Optional[int] = None) -> ClaimsTriangle:
+    """
+    Oturum geçmişinin (PeriodHistory) üçgeni: her fiyatlama dönemi bir kaza dönemidir, nihai hasar
+    "Toplam Hasar" sütunudur. Gelişme, oturum tohumunun DEVELOPMENT_STREAM akışından çekilir;
+    aynı geçmiş her zaman aynı üçgeni verir. n_origins verilirse son n_origins kaza dönemi döner.
+    """
+    seed = int(history.column("Tohum")[0]) if len(history) else 0
+    triangle = develop_claims(
+        history.column("Toplam Hasar"), history.column("Prim Geliri"),
+        payment_pattern, reporting_pattern, concentration,
+        seed=np.random.SeedSequence(seed, spawn_key=(DEVELOPMENT_STREAM,)),
+    )
+    return triangle.tail(n_origins) if n_origins else triangle
+
+def chain_ladder(cumulative, mask, fallback_factors=None) -> dict:
+    """
+    Hacim ağırlıklı chain-ladder. cumulative: (..., kaza, gelişme); mask: (kaza, gelişme).
+    Hiç gözlemi olmayan gelişme faktörleri fallback_factors'tan (yoksa 1) alınır.
+    Ödenen üçgende ibnr toplam rezervdir (muallak + IBNR), gerçekleşen üçgende saf IBNR'dir.
+    """
+    c = np.asarray(cumulative, dtype=float)
+    mask = np.asarray(mask, dtype=bool)
+    n_origins, n_dev = mask.shape
+    use = mask[:, 1:]
+    num = np.where(use, c[..., :, 1:], 0.0).sum(axis=-2)
+    den = np.where(use, c[..., :, :-1], 0.0).sum(axis=-2)
+    fallback = np.ones(n_dev - 1) if fallback_factors is None else np.asarray(fallback_factors, dtype=float)
+    factors = np.divide(num, den, out=np.array(np.broadcast_to(fallback, num.shape)), where=den > 0)
+
+    # cdf[j]: j. gelişme döneminden nihaiye kümülatif faktör
+    cdf = np.concatenate([np.cumprod(factors[..., ::-1], axis=-1)[..., ::-1],
+                          np.ones(factors.shape[:-1] + (1,))], axis=-1)
+    d = mask.sum(axis=1) - 1
+    rows = np.arange(n_origins)
+    latest = np.where(d >= 0, c[..., rows, np.maximum(d, 0)], 0.0)
+    cdf_latest = cdf[..., np.maximum(d, 0)]
+    ultimate = latest * cdf_latest
+    ibnr = ultimate - latest
+    return {
+        "factors": factors,
+        "cdf": cdf,
+        "latest": latest,
+        "ultimate": ultimate,
+        "ibnr": ibnr,
+        "total_ibnr": ibnr.sum(axis=-1),
+    }
+
+def bornhuetter_ferguson(cumulative, mask, expected_ultimate, cdf=None) -> dict:
+    """
+    BF: nihai = son gözlenen + (1 - 1 / cdf) × önsel beklenen nihai hasar (ör. prim × beklenen
+    hasar prim oranı). cdf verilmezse aynı üçgenin chain-ladder faktörleri kullanılır.
+    """
+    c = np.asarray(cumulative, dtype=float)
+    mask = np.asarray(mask, dtype=bool)
+    if cdf is None:
+        cdf = chain_ladder(c, mask)["cdf"]
+    d = np.maximum(mask.sum(axis=1) - 1, 0)
+    latest = np.where(mask.any(axis=1), c[..., np.arange(mask.shape[0]), d], 0.0)
+    cdf_latest = np.asarray(cdf)[..., d]
+    unreported = np.divide(cdf_latest - 1.0, cdf_latest, out=np.ones_like(cdf_latest), where=cdf_latest > 0)
+    ibnr = unreported * np.asarray(expected_ultimate, dtype=float)
+    return {
+        "latest": latest,
+        "ultimate": latest + ibnr,
+        "ibnr": ibnr,
+        "total_ibnr": ibnr.sum(axis=-1),
+    }
+
+def _odp_fit(c: np.ndarray, mask: np.ndarray, factors: np.ndarray, cdf: np.ndarray):
+    """Chain-ladder'dan geriye doğru uydurulmuş artımlar, Pearson artıkları ve ölçek (φ)."""
+    d = np.maximum(mask.sum(axis=1) - 1, 0)
+    rows = np.arange(mask.shape[0])
+    latest = c[rows, d]
+    fitted_cum = np.divide(latest[:, None] * cdf[d][:, None], cdf[None, :],
+                           out=np.zeros(mask.shape), where=cdf[None, :] > 0)
+    fitted = np.where(mask, np.diff(fitted_cum, axis=-1, prepend=0.0), 0.0)
+    actual = np.where(mask, np.diff(c, axis=-1, prepend=0.0), 0.0)
+    valid = mask & (fitted > 0)
+    residual = np.zeros(mask.shape)
+    residual[valid] = (actual[valid] - fitted[valid]) / np.sqrt(fitted[valid])
+
+    n_obs = int(mask.sum())
+    n_params = mask.shape[0] + int(mask[:, 1:].any(axis=0).sum())
+    dof = max(1, n_obs - n_params)
+    phi = float((residual ** 2).sum() / dof)
+    return actual, fitted, valid, residual * np.sqrt(n_obs / dof), phi
+
+def bootstrap_reserves(cumulative, mask, n_resamples: int = 10_000, process_variance: bool = True,
+                       quantiles: Sequence[float] = BOOTSTRAP_QUANTILES, fallback_factors=None,
+                       seed: SeedLike = None) -> dict:
+    """
+    ODP bootstrap (England-Verrall): artıklar n_resamples kez yeniden örneklenir, her sözde üçgene
+    chain-ladder uygulanır ve gelecek artımlar Gamma(ortalama m, varyans φ m) ile çekilir.
+    Sözde üçgenler BOOTSTRAP_CHUNK_SIZE'lık parçalar halinde tek geçişte işlenir.
+    Dönüş: toplam rezerv örnekleri, ortalama, standart sapma, kantiller, nokta tahmini ve φ.
+    """
+    c = np.asarray(cumulative, dtype=float)
+    mask = np.asarray(mask, dtype=bool)
+    point = chain_ladder(c, mask, fallback_factors)
+    actual, fitted, valid, residual, phi = _odp_fit(c, mask, point["factors"], point["cdf"])
+    pool = residual[valid]
+    d = np.maximum(mask.sum(axis=1) - 1, 0)
+    rows = np.arange(mask.shape[0])
+    future = ~mask[:, 1:]
+
+    rng = np.random.default_rng(seed)
+    reserves = np.empty(n_resamples)
+    for start in range(0, n_resamples, BOOTSTRAP_CHUNK_SIZE):
+        b = min(BOOTSTRAP_CHUNK_SIZE, n_resamples - start)
+        pseudo = np.broadcast_to(actual, (b,) + mask.shape).copy()
+        if pool.size:
+            sampled = pool[rng.integers(0, pool.size, size=(b, pool.size))]
+            pseudo[:, valid] = fitted[valid] + sampled * np.sqrt(fitted[valid])
+        boot = chain_ladder(np.cumsum(pseudo, axis=-1), mask, point["factors"])
+
+        cdf = boot["cdf"]
+        cdf_latest = cdf[:, d]
+        projected = np.divide((boot["latest"] * cdf_latest)[:, :, None], cdf[:, None, :],
+                              out=np.zeros((b,) + mask.shape), where=cdf[:, None, :] > 0)
+        projected[:, rows, d] = boot["latest"]
+        increments = np.where(future, np.diff(projected, axis=-1), 0.0)
+        if process_variance and phi > 0:
+            positive = np.maximum(increments, 0.0)
+            increments = np.minimum(increments, 0.0) + rng.gamma(positive / phi, phi)
+        reserves[start:start + b] = increments.sum(axis=(-2, -1))
+
+    return {
+        "reserve": reserves,
+        "mean": float(reserves.mean()),
+        "std": float(reserves.std(ddof=1)) if n_resamples > 1 else 0.0,
+        "quantiles": dict(zip(quantiles, np.quantile(reserves, quantiles))),
+        "point_estimate": float(point["total_ibnr"]),
+        "phi": phi,
+    }
+
+def simulate_reserve_runoff(n_paths: int, n_policies: int, p_claim: float, mean_loss: float, premium: float,
+                            n_origins: int = 12, payment_pattern: Sequence[float] = PAYMENT_PATTERN,
+                            reporting_pattern: Sequence[float] = REPORTING_PATTERN,
+                            concentration: float = DEVELOPMENT_CONCENTRATION, seed: SeedLike = None) -> dict:
+    """
+    n_paths yolun her biri için n_origins kaza dönemi simüle edilir (simulate_capital_paths'in
+    "aggregate" yolu), gelişme üçgenleri kurulur ve değerleme anındaki rezerv chain-ladder (ödenen ve
+    gerçekleşen) ve BF ile tahmin edilir. Dönüş: gerçek rezerv ve yöntem başına tahminler (yol,),
+    ortalama hata ve hata standart sapması.
+    """
+    rng = np.random.default_rng(seed)
+    n_policies = max(0, int(n_policies))
+    n_claims = rng.binomial(n_policies, p_claim, size=(n_paths, n_origins))
+    ultimate = rng.gamma(shape=n_claims, scale=mean_loss)
+    triangle = develop_claims(ultimate, n_policies * premium, payment_pattern, reporting_pattern,
+                              concentration, seed=rng)
+
+    true_reserve = triangle.outstanding().sum(axis=-1)
+    latest_paid = triangle.latest("paid")
+    fallback = pattern_factors(payment_pattern)
+    cl_paid = chain_ladder(triangle.paid, triangle.mask, fallback)
+    cl_incurred = chain_ladder(triangle.incurred, triangle.mask)
+    bf = bornhuetter_ferguson(triangle.paid, triangle.mask,
+                              np.full(n_origins, n_policies * p_claim * mean_loss), cl_paid["cdf"])
+    estimates = {
+        "Chain-ladder (ödenen)": cl_paid["total_ibnr"],
+        "Chain-ladder (gerçekleşen)": (cl_incurred["ultimate"] - latest_paid).sum(axis=-1),
+        "Bornhuetter-Ferguson": bf["total_ibnr"],
+    }
+    return {
+        "true_reserve": true_reserve,
+        "estimates": estimates,
+        "mean_error": {name: float((est - true_reserve).mean()) for name, est in estimates.items()},
+        "error_std": {name: float((est - true_reserve).std()) for name, est in estimates.items()},
+    }
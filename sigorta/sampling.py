@@ -0,0 +1,279 @@
+"""
+Uniform örnekleme arka uçları ve ters CDF dönüşümleri.
+
+Simülasyon, hasar adedini ve toplam hasarı [0, 1) uniformlarının ters CDF'leriyle üretebilir:
+
+    hasar adedi  N = F⁻¹_Binom(n, p)(u₁)
+    toplam hasar S = F⁻¹_Gamma(N, μ)(u₂)      (N üstel hasarın toplamı)
+
+Binom ters CDF'i tamdır. Gamma ters CDF'i N ≤ ERLANG_EXACT_MAX (64) hasarda tamdır (Newton);
+daha fazla hasarda Wilson–Hilferty yaklaşımıdır. Yaklaşımın kantildeki göreli hatası N = 65'te
+0,001 ≤ u ≤ 0,999 için < 6e-4, uç kuyruklarda (u = 1e-6) < 3e-3'tür ve ~1/N hızıyla küçülür
+(N = 1000'de < 4e-5). QMC arka uçlarıyla üretilen toplam hasar bu kadar yanlı olabilir.
+
+Uniformlar değiştirilebilir bir arka uçtan gelir:
+- "random": np.random.default_rng (varsayılan, bağımsız çekilişler)
+- "sobol":  karıştırılmış (doğrusal matris + dijital kaydırma) Sobol dizisi, en fazla SOBOL_MAX_DIM boyut
+- "halton": rastgele kaydırılmış (Cranley–Patterson) Halton dizisi
+
+Düzgün (smooth) çıktılarda QMC hatası ~1/N hızında azalır. Tek bir QMC kümesinin hatası
+kendisinden tahmin edilemez; rqmc_estimate bağımsız karıştırmalarla yinelemeler üretir ve
+standart hatayı yinelemelerin dağılımından verir.
+"""
+import math
+from typing import Callable
+
+import numpy as np
+
+SAMPLERS = ("random", "sobol", "halton")
+SOBOL_BITS = 32
+# Erlang (tam sayı şekilli Gamma) ters CDF'i bu şekle kadar tam, üstünde Wilson–Hilferty ile
+ERLANG_EXACT_MAX = 64
+
+# Joe & Kuo (2008) yön sayıları, 2. boyuttan itibaren: (derece s, katsayı a, başlangıç m_1..m_s)
+_SOBOL_DIRECTIONS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+    (7, 7, (1, 1, 3, 13, 7, 35, 63)),
+    (7, 8, (1, 3, 5, 9, 1, 25, 53)),
+    (7, 14, (1, 3, 1, 13, 9, 35, 107)),
+    (7, 19, (1, 3, 1, 5, 27, 61, 31)),
+)
+SOBOL_MAX_DIM = len(_SOBOL_DIRECTIONS) + 1
+
+def _sobol_directions(dim: int) -> np.ndarray:
+    """(SOBOL_BITS × dim) yön sayıları; v[b, j], j. boyutta b. bitin katkısıdır (MSB hizalı)."""
+    v = np.empty((SOBOL_BITS, dim), dtype=np.uint64)
+    v[:, 0] = 1 << np.arange(SOBOL_BITS - 1, -1, -1, dtype=np.uint64)
+    for j, (s, a, m_init) in enumerate(_SOBOL_DIRECTIONS[:dim - 1], start=1):
+        m = list(m_init)
+        for i in range(s, SOBOL_BITS):
+            new = m[i - s] ^ (m[i - s] << s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    new ^= m[i - k] << k
+            m.append(new)
+        v[:, j] = [m[i] << (SOBOL_BITS - 1 - i) for i in range(SOBOL_BITS)]
+    return v
+
+def _parity(x: np.ndarray) -> np.ndarray:
+    for shift in (32, 16, 8, 4, 2, 1):
+        x = x ^ (x >> np.uint64(shift))
+    return x & np.uint64(1)
+
+class RandomSampler:
+    """Varsayılan arka uç: bağımsız sözde rastgele uniformlar."""
+
+    def __init__(self, dim: int, seed=None):
+        self.dim = dim
+        self.rng = np.random.default_rng(seed)
+
+    def uniforms(self, n: int) -> np.ndarray:
+        return self.rng.random((n, self.dim))
+
+class SobolSampler:
+    """
+    Karıştırılmış Sobol dizisi. Ardışık uniforms çağrıları diziyi kaldığı yerden sürdürür;
+    en iyi denge için toplam nokta sayısı 2'nin kuvveti olmalıdır.
+    """
+
+    def __init__(self, dim: int, seed=None, scramble: bool = True):
+        if not 1 <= dim <= SOBOL_MAX_DIM:
+            raise ValueError(f"Sobol en fazla {SOBOL_MAX_DIM} boyut destekler; daha fazlası için 'halton' kullanın.")
+        self.dim = dim
+        v = _sobol_directions(dim)
+        shift = np.zeros(dim, dtype=np.uint64)
+        if scramble:
+            rng = np.random.default_rng(seed)
+            # Doğrusal matris karıştırma: çıkış basamağı r = giriş basamaklarının (s ≤ r) rastgele XOR'u
+            lower = rng.integers(0, 2, size=(dim, SOBOL_BITS, SOBOL_BITS), dtype=np.uint64)
+            lower = np.tril(lower, k=-1) | np.eye(SOBOL_BITS, dtype=np.uint64)
+            bit_weights = 1 << np.arange(SOBOL_BITS - 1, -1, -1, dtype=np.uint64)
+            masks = (lower * bit_weights).sum(axis=-1)                     # (dim, satır r)
+            bits = _parity(v[:, :, None] & masks[None, :, :])              # (b, dim, r)
+            v = (bits * bit_weights).sum(axis=-1).astype(np.uint64)
+            shift = rng.integers(0, 2 ** SOBOL_BITS, size=dim, dtype=np.uint64)
+        self.v = v
+        self.state = shift
+        self.index = 0
+
+    def uniforms(self, n: int) -> np.ndarray:
+        if n <= 0:
+            return np.empty((0, self.dim))
+        # Gray kodu sırası: x_{k+1} = x_k ^ v[ctz(k + 1)]
+        k = np.arange(self.index + 1, self.index + n, dtype=np.uint64)
+        ctz = np.log2((k & (~k + np.uint64(1))).astype(float)).astype(np.intp)
+        steps = np.vstack([self.state[None, :], self.v[ctz]])
+        x = np.bitwise_xor.accumulate(steps, axis=0)
+        self.state = x[-1] ^ self.v[int(math.log2((self.index + n) & -(self.index + n)))]
+        self.index += n
+        return (x.astype(float) + 0.5) / 2.0 ** SOBOL_BITS
+
+def _first_primes(count: int) -> list:
+    primes, candidate = [], 2
+    while len(primes) < count:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+class HaltonSampler:
+    """Halton dizisi (boyut j için j. asal taban), her boyutta rastgele mod-1 kaydırma ile."""
+
+    def __init__(self, dim: int, seed=None, scramble: bool = True):
+        self.dim = dim
+        self.bases = _first_primes(dim)
+        self.shift = np.random.default_rng(seed).random(dim) if scramble else np.zeros(dim)
+        self.index = 0
+
+    def uniforms(self, n: int) -> np.ndarray:
+        k = np.arange(self.index, self.index + n, dtype=np.int64)
+        self.index += n
+        out = np.empty((n, self.dim))
+        for j, base in enumerate(self.bases):
+            x, rest, scale = np.zeros(n), k.copy(), 1.0 / base
+            while rest.any():
+                rest, digit = np.divmod(rest, base)
+                x += digit * scale
+                scale /= base
+            out[:, j] = x
+        out += self.shift
+        return np.mod(out, 1.0, out=out)
+
+def make_sampler(kind: str = "random", dim: int = 2, seed=None, scramble: bool = True):
+    """kind: "random" (varsayılan), "sobol" veya "halton"."""
+    if kind == "random":
+        return RandomSampler(dim, seed)
+    if kind == "sobol":
+        return SobolSampler(dim, seed, scramble)
+    if kind == "halton":
+        return HaltonSampler(dim, seed, scramble)
+    raise ValueError(f"Bilinmeyen örnekleme arka ucu: {kind!r}")
+
+# =============================
+# Ters CDF'ler
+# =============================
+def _binomial_table(n: int, p: float):
+    """Binom(n, p) kütlesinin pratikte tamamını kapsayan [lo, hi] penceresi ve bu penceredeki CDF."""
+    if n <= 0 or p <= 0:
+        return 0, np.array([1.0])
+    if p >= 1:
+        return n, np.array([1.0])
+    sd = math.sqrt(n * p * (1 - p))
+    lo = max(0, int(n * p - 15 * sd - 20))
+    hi = min(n, int(n * p + 15 * sd + 20))
+    k = np.arange(lo, hi)
+    log_ratio = np.log((n - k) / (k + 1)) + math.log(p / (1 - p))
+    log_pmf = np.concatenate([[0.0], np.cumsum(log_ratio)])
+    cdf = np.cumsum(np.exp(log_pmf - log_pmf.max()))
+    return lo, cdf / cdf[-1]
+
+def binomial_ppf(u, n, p: float) -> np.ndarray:
+    """Binom(n, p) ters CDF'i; n skaler ya da u ile yayınlanabilir biçimde (her farklı n için bir tablo)."""
+    u, n = np.broadcast_arrays(np.asarray(u, dtype=float), np.asarray(n, dtype=np.int64))
+    n, flat_u = n.ravel(), u.ravel()
+    out = np.empty(flat_u.size, dtype=np.int64)
+    order = np.argsort(n, kind="stable")
+    values, starts = np.unique(n[order], return_index=True)
+    for value, idx in zip(values, np.split(order, starts[1:])):
+        lo, cdf = _binomial_table(int(value), p)
+        out[idx] = lo + np.minimum(np.searchsorted(cdf, flat_u[idx], side="right"), cdf.size - 1)
+    return out.reshape(u.shape)
+
+def norm_ppf(u) -> np.ndarray:
+    """Standart normal ters CDF'i (Acklam rasyonel yaklaşımı, göreli hata < 1.2e-9)."""
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+    u = np.clip(np.asarray(u, dtype=float), 1e-300, 1 - 1e-16)
+    tail = np.minimum(u, 1 - u)
+    q = np.sqrt(-2 * np.log(tail))
+    x_tail = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+             ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    x_tail = np.where(u < 0.5, x_tail, -x_tail)
+    r = (u - 0.5) ** 2
+    x_mid = (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * (u - 0.5) / \
+            (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    return np.where(tail < 0.02425, x_tail, x_mid)
+
+_LOG_FACTORIALS = np.array([math.lgamma(i + 1) for i in range(ERLANG_EXACT_MAX + 1)])
+
+def _erlang_cdf_pdf(x: np.ndarray, k: np.ndarray):
+    """Gamma(k, 1) CDF ve yoğunluğu, k ≤ ERLANG_EXACT_MAX tam sayı: F = 1 - e^{-x} Σ_{j<k} x^j / j!"""
+    j = np.arange(int(k.max()))
+    log_x = np.log(x)
+    terms = np.exp(j * log_x[:, None] - x[:, None] - _LOG_FACTORIALS[j])
+    terms[j >= k[:, None]] = 0.0
+    cdf = 1.0 - terms.sum(axis=-1)
+    pdf = np.exp((k - 1) * log_x - x - _LOG_FACTORIALS[k - 1])
+    return cdf, pdf
+
+def gamma_ppf(u, k, scale: float = 1.0) -> np.ndarray:
+    """
+    Gamma(k, scale) ters CDF'i, k ≥ 0 tam sayı (k üstel hasarın toplamı; k = 0 → 0).
+    k ≤ ERLANG_EXACT_MAX için Wilson–Hilferty başlangıcından Newton ile tam çözüm; daha büyük k'da
+    Wilson–Hilferty yaklaşımı kullanılır (göreli hata modül açıklamasında: k = 65'te 3e-3'ün altında).
+    """
+    u = np.asarray(u, dtype=float)
+    k = np.broadcast_to(np.asarray(k, dtype=np.int64), u.shape)
+    kf = np.maximum(k, 1).astype(float)
+    z = norm_ppf(u)
+    x = kf * np.maximum(1 - 1 / (9 * kf) + z * np.sqrt(1 / (9 * kf)), 1e-3) ** 3
+
+    # Yalnızca henüz yakınsamamış elemanlar üzerinde Newton adımı
+    active = np.flatnonzero((k > 0) & (k <= ERLANG_EXACT_MAX))
+    flat_x, flat_k, flat_u = x.reshape(-1), k.reshape(-1), u.reshape(-1)
+    for _ in range(50):
+        if active.size == 0:
+            break
+        xs = flat_x[active]
+        cdf, pdf = _erlang_cdf_pdf(xs, flat_k[active])
+        step = (cdf - flat_u[active]) / np.maximum(pdf, 1e-300)
+        new = np.where(step > xs / 2, xs / 2, xs - step)
+        flat_x[active] = new
+        active = active[np.abs(new - xs) > 1e-10 * new]
+    return np.where(k > 0, x * scale, 0.0)
+
+def sample_period_losses(u: np.ndarray, n_policies, p_claim: float, mean_loss: float):
+    """
+    (..., 2) uniformlardan (hasar adedi, toplam hasar) üretir: u[..., 0] sıklık, u[..., 1] şiddet.
+    n_policies, u[..., 0] ile yayınlanabilir (broadcast) biçimde olabilir.
+    """
+    n_claims = binomial_ppf(u[..., 0], n_policies, p_claim)
+    return n_claims, gamma_ppf(u[..., 1], n_claims, mean_loss)
+
+def rqmc_estimate(estimator: Callable, dim: int, n_replicates: int = 16, kind: str = "sobol",
+                  seed=None) -> dict:
+    """
+    Rastgeleleştirilmiş QMC: estimator(sampler) her bağımsız karıştırma için bir tahmin (skaler
+    ya da dizi) döndürür. Dönüş: yinelemelerin ortalaması, standart hatası ve kendisi.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(n_replicates)
+    replicates = np.array([estimator(make_sampler(kind, dim, s)) for s in seeds], dtype=float)
+    return {
+        "estimate": replicates.mean(axis=0),
+        "std_error": replicates.std(axis=0, ddof=1) / math.sqrt(n_replicates),
+        "replicates": replicates,
+    }
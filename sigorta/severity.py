@@ -0,0 +1,137 @@
+"""
+Hasar başına şiddet (severity) motoru ve reasürans.
+
+Hasarlar sabit boyutlu parçalar halinde üretilir, her parçaya hasar fazlası (XoL) ve
+kota paylaşımı (quota share) uygulanır ve toplamlar parça parça indirgenir. Bellek
+kullanımı hasar sayısından bağımsızdır (en fazla bir parça).
+"""
+import math
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional
+
+import numpy as np
+
+SEVERITY_DISTS = ("exponential", "lognormal", "pareto")
+CLAIM_CHUNK_SIZE = 1_000_000
+
+class Severity(NamedTuple):
+    """Ortalaması mean olacak şekilde ölçeklenmiş hasar tutarı dağılımı."""
+    dist: str
+    mean: float
+    sigma: float = 1.0   # lognormal: log-ölçekte standart sapma
+    alpha: float = 2.5   # pareto: kuyruk indeksi (> 1, ortalama sonlu olsun diye)
+
+def _numeric_fields(spec: Mapping, allowed: tuple, what: str) -> dict:
+    """Parametre dosyasından gelen tanımı doğrular: bilinmeyen anahtar ya da sayı olmayan değer ValueError verir."""
+    unknown = sorted(set(spec) - set(allowed))
+    if unknown:
+        raise ValueError(f"Bilinmeyen {what} alanı: {', '.join(map(repr, unknown))} (geçerli: {', '.join(allowed)})")
+    try:
+        return {key: float(value) for key, value in spec.items()}
+    except (TypeError, ValueError):
+        raise ValueError(f"{what} alanları sayı olmalı: {dict(spec)!r}") from None
+
+def make_severity(mean_loss: float, spec: Optional[Mapping] = None) -> Severity:
+    """{"dist": "lognormal", "sigma": 1.2} gibi bir tanımdan Severity üretir (varsayılan üstel)."""
+    spec = dict(spec or {})
+    dist = spec.pop("dist", "exponential")
+    if dist not in SEVERITY_DISTS:
+        raise ValueError(f"Bilinmeyen hasar dağılımı: {dist!r}")
+    severity = Severity(dist, float(mean_loss), **_numeric_fields(spec, ("sigma", "alpha"), "hasar dağılımı"))
+    if severity.dist == "pareto" and severity.alpha <= 1.0:
+        raise ValueError("Pareto için alpha > 1 olmalı (aksi halde ortalama hasar sonsuz).")
+    return severity
+
+def sample_severity(rng: np.random.Generator, severity: Severity, size: int) -> np.ndarray:
+    if severity.dist == "exponential":
+        return rng.exponential(scale=severity.mean, size=size)
+    if severity.dist == "lognormal":
+        mu = math.log(severity.mean) - severity.sigma ** 2 / 2
+        return rng.lognormal(mean=mu, sigma=severity.sigma, size=size)
+    # Klasik Pareto: x_m × (1 + Lomax(α)), ortalama = α x_m / (α - 1)
+    x_m = severity.mean * (severity.alpha - 1) / severity.alpha
+    losses = rng.pareto(severity.alpha, size=size)
+    losses += 1.0
+    losses *= x_m
+    return losses
+
+class Reinsurance(NamedTuple):
+    """
+    retention / limit: hasar başına XoL (reasürör min(max(x - retention, 0), limit) öder).
+    quota_share: XoL sonrası kalan hasarın (ve XoL sonrası primin) devredilen oranı (0–1).
+    xol_rate: XoL reasürans primi, brüt prim gelirinin oranı olarak.
+    """
+    retention: float = math.inf
+    limit: float = math.inf
+    quota_share: float = 0.0
+    xol_rate: float = 0.0
+
+    def ceded_premium(self, premium_income: float) -> float:
+        xol_premium = self.xol_rate * premium_income
+        return xol_premium + self.quota_share * (premium_income - xol_premium)
+
+def make_reinsurance(spec: Optional[Mapping] = None) -> Reinsurance:
+    reinsurance = Reinsurance(**_numeric_fields(dict(spec or {}), Reinsurance._fields, "reasürans"))
+    if not 0.0 <= reinsurance.quota_share <= 1.0:
+        raise ValueError("quota_share 0 ile 1 arasında olmalı.")
+    if reinsurance.retention < 0 or reinsurance.limit < 0:
+        raise ValueError("retention ve limit negatif olamaz.")
+    if not 0.0 <= reinsurance.xol_rate <= 1.0:
+        raise ValueError("xol_rate 0 ile 1 arasında olmalı.")
+    return reinsurance
+
+class ClaimTotals(NamedTuple):
+    n_claims: int
+    gross: float
+    ceded_xol: float
+    ceded_quota: float
+    max_claim: float
+    n_xol_claims: int
+
+    @property
+    def ceded(self) -> float:
+        return self.ceded_xol + self.ceded_quota
+
+    @property
+    def net(self) -> float:
+        return self.gross - self.ceded
+
+def iter_claim_chunks(rng: np.random.Generator, severity: Severity, n_claims: int,
+                      chunk_size: int = CLAIM_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """n_claims hasar tutarını en fazla chunk_size'lık dizilerle üretir."""
+    remaining = int(n_claims)
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield sample_severity(rng, severity, size)
+        remaining -= size
+
+def reduce_claims(chunks: Iterable[np.ndarray], reinsurance: Reinsurance = Reinsurance()) -> ClaimTotals:
+    """Parçalara reasüransı uygular ve toplamları akış halinde indirger."""
+    n = n_xol = 0
+    gross = ceded_xol = ceded_quota = 0.0
+    max_claim = 0.0
+    has_xol = math.isfinite(reinsurance.retention)
+    for losses in chunks:
+        chunk_gross = float(losses.sum())
+        n += losses.size
+        gross += chunk_gross
+        max_claim = max(max_claim, float(losses.max()))
+        if has_xol:
+            excess = np.clip(losses - reinsurance.retention, 0.0, reinsurance.limit)
+            layer = float(excess.sum())
+            n_xol += int(np.count_nonzero(excess))
+        else:
+            layer = 0.0
+        ceded_xol += layer
+        ceded_quota += reinsurance.quota_share * (chunk_gross - layer)
+    return ClaimTotals(n, gross, ceded_xol, ceded_quota, max_claim, n_xol)
+
+def simulate_claims(n_policies: int, p_claim: float, severity: Severity,
+                    reinsurance: Reinsurance = Reinsurance(), seed=None,
+                    chunk_size: int = CLAIM_CHUNK_SIZE) -> ClaimTotals:
+    """
+    Hasar adedi ~ Binom(n, p); her hasarın tutarı severity'den çekilir ve akış halinde indirgenir.
+    On milyonlarca hasarda bile bellek en fazla bir parça kadardır.
+    """
+    rng = np.random.default_rng(seed)
+    n_claims = int(rng.binomial(n_policies, p_claim)) if n_policies > 0 else 0
+    return reduce_claims(iter_claim_chunks(rng, severity, n_claims, chunk_size), reinsurance)
@@ -0,0 +1,213 @@
+"""
+Akış halinde risk istatistikleri.
+
+Denemeler parça parça gelir ve saklanmaz: ortalama/varyans Welford–Chan birleştirme
+formülüyle, kantiller t-digest taslağıyla (sınırlı sayıda ağırlıklı merkez) tutulur. İki taslak
+de birleştirilebilir (merge); farklı süreçlerde oluşturulan özetler toplanıp tek rapor üretilir.
+"""
+import math
+
+import numpy as np
+
+DEFAULT_COMPRESSION = 500
+RISK_LEVELS = (0.95, 0.99, 0.995)
+CR_QUANTILES = (0.05, 0.25, 0.50, 0.75, 0.95, 0.99)
+
+class RunningMoments:
+    """Adet, ortalama, varyans, en küçük ve en büyük değer; parça parça ve birleştirilebilir."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        other = RunningMoments()
+        other.n = values.size
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other: "RunningMoments"):
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+class TDigest:
+    """
+    Birleştirilebilir t-digest (k1 ölçek fonksiyonu). Kuyruklarda merkezler çok küçük tutulur,
+    bu yüzden %99,5 gibi uç kantiller de isabetlidir. Bellek ~compression merkezle sınırlıdır.
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(values.size)]))
+
+    def merge(self, other: "TDigest"):
+        if other.weights.size == 0:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cum = np.cumsum(weights)
+        total = cum[-1]
+        # Her merkezin sol kenarındaki kantilin k-ölçeğindeki tam kısmı küme numarasıdır:
+        # k(q) = δ / (2π) · asin(2q - 1); bir küme k-ölçeğinde en fazla 1 birim kaplar.
+        q_left = (cum - weights) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * q_left - 1)
+        group = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.diff(group, prepend=-1))
+        w = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / w
+        self.weights = w
+
+    def _centers(self):
+        cum = np.cumsum(self.weights)
+        total = cum[-1]
+        centers = (cum - self.weights / 2) / total
+        xs = np.concatenate([[self.min], self.means, [self.max]])
+        qs = np.concatenate([[0.0], centers, [1.0]])
+        return qs, xs
+
+    def quantile(self, q):
+        if self.weights.size == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else math.nan
+        qs, xs = self._centers()
+        return np.interp(q, qs, xs)
+
+    def cdf(self, x):
+        if self.weights.size == 0:
+            return np.full(np.shape(x), np.nan) if np.ndim(x) else math.nan
+        qs, xs = self._centers()
+        return np.interp(x, xs, qs, left=0.0, right=1.0)
+
+    def lower_tail_mean(self, q: float) -> float:
+        """E[X | X ≤ Q(q)]: en küçük q kesrinin ortalaması (sınırdaki merkez oransal olarak dahil)."""
+        if self.weights.size == 0:
+            return math.nan
+        total = self.count
+        target = q * total
+        cum = np.cumsum(self.weights)
+        take = np.clip(target - (cum - self.weights), 0.0, self.weights)
+        return float((take * self.means).sum() / take.sum())
+
+    def upper_tail_mean(self, q: float) -> float:
+        """E[X | X ≥ Q(q)]: en büyük (1 - q) kesrinin ortalaması."""
+        if self.weights.size == 0:
+            return math.nan
+        total = self.count
+        target = (1.0 - q) * total
+        cum_from_top = np.cumsum(self.weights[::-1])[::-1]
+        take = np.clip(target - (cum_from_top - self.weights), 0.0, self.weights)
+        return float((take * self.means).sum() / take.sum())
+
+class StreamingMetric:
+    """Tek bir büyüklük için moment + t-digest ikilisi."""
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.moments = RunningMoments()
+        self.digest = TDigest(compression)
+
+    def update(self, values):
+        self.moments.update(values)
+        self.digest.update(values)
+
+    def merge(self, other: "StreamingMetric"):
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+
+class RiskAccumulator:
+    """
+    Deneme parçalarından UW Sonucu, Combined Ratio ve hasar prim oranı (loss ratio) dağılımlarını
+    sınırlı bellekle biriktirir. Satışı olmayan denemeler (prim geliri 0) oranlara katılmaz.
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.uw = StreamingMetric(compression)
+        self.combined_ratio = StreamingMetric(compression)
+        self.loss_ratio = StreamingMetric(compression)
+
+    def update(self, uw_result, combined_ratio, premium_income, total_loss):
+        uw_result = np.asarray(uw_result, dtype=float)
+        premium_income = np.asarray(premium_income, dtype=float)
+        sold = premium_income > 0
+        self.uw.update(uw_result)
+        self.combined_ratio.update(np.asarray(combined_ratio, dtype=float)[sold])
+        self.loss_ratio.update(np.asarray(total_loss, dtype=float)[sold] / premium_income[sold])
+
+    def update_records(self, records: list):
+        """Sonuç tablosu sütun adlarıyla satır sözlüklerinden günceller."""
+        if not records:
+            return
+        self.update(
+            [r["UW Sonucu"] for r in records],
+            [r["Combined Ratio"] for r in records],
+            [r["Prim Geliri"] for r in records],
+            [r["Toplam Hasar"] for r in records],
+        )
+
+    def merge(self, other: "RiskAccumulator"):
+        self.uw.merge(other.uw)
+        self.combined_ratio.merge(other.combined_ratio)
+        self.loss_ratio.merge(other.loss_ratio)
+
+    def report(self, levels: tuple = RISK_LEVELS, cr_quantiles: tuple = CR_QUANTILES) -> dict:
+        """
+        UW Sonucu için VaR/TVaR zarar olarak (pozitif = zarar) raporlanır:
+        VaR_α = -Q_UW(1 - α), TVaR_α = -E[UW | UW ≤ Q_UW(1 - α)].
+        """
+        uw, cr, lr = self.uw, self.combined_ratio, self.loss_ratio
+        return {
+            "n": uw.moments.n,
+            "uw_mean": uw.moments.mean,
+            "uw_std": uw.moments.std,
+            "uw_var": {a: -float(uw.digest.quantile(1 - a)) for a in levels},
+            "uw_tvar": {a: -uw.digest.lower_tail_mean(1 - a) for a in levels},
+            "prob_loss": float(uw.digest.cdf(0.0)),
+            "cr_mean": cr.moments.mean,
+            "cr_quantiles": {q: float(cr.digest.quantile(q)) for q in cr_quantiles},
+            "prob_cr_above_1": 1.0 - float(cr.digest.cdf(1.0)),
+            "lr_mean": lr.moments.mean,
+            "lr_std": lr.moments.std,
+            "lr_quantiles": {q: float(lr.digest.quantile(q)) for q in cr_quantiles},
+        }
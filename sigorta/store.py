@@ -0,0 +1,388 @@
+"""
+Sınıf sonuçları deposu: tüm oturumların dönem sonuçları ve mini soru cevapları (SQLite, WAL kipi).
+
+- Yazma eşzamansızdır: record_period / record_quiz kaydı yalnızca kuyruğa koyar ve hemen döner;
+  tek bir yazıcı iş parçacığı kayıtları batch_size'a ya da flush_interval'e kadar biriktirip tek
+  işlemde (transaction) yazar. Simüle düğmesi diski hiç beklemez; kuyruk doluysa kayıt düşürülür.
+- Eğitmen sorguları ham tabloları taramaz: tetikleyiciler (trigger) her eklemede oturum, senaryo
+  ve soru bazındaki özet tablolarını aynı işlem içinde günceller. Sorgular birkaç yüz satırlık,
+  indeksli özet tablolarını okur; ham veri büyüdükçe yavaşlamaz.
+- WAL kipinde okuyucular yazıcıyı beklemez; aynı dosyayı birden çok süreç paylaşabilir.
+
+open_store(path) süreç genelinde yol başına tek bir depo döndürür (Streamlit oturumları aynı
+süreçte ayrı iş parçacıklarında çalışır).
+"""
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 0.2     # saniye
+DEFAULT_QUEUE_SIZE = 100_000
+BUSY_TIMEOUT_MS = 5_000
+CAPITAL_QUANTILES = (0.05, 0.25, 0.50, 0.75, 0.95)
+
+# (depo sütunu, geçmiş satırındaki ad)
+PERIOD_FIELDS = (
+    ("period", "Fiyatlama Dönemi"),
+    ("scenario", "Piyasa koşulu"),
+    ("seed", "Tohum"),
+    ("policies", "Poliçe"),
+    ("premium", "Prim/poliçe"),
+    ("premium_income", "Prim Geliri"),
+    ("n_claims", "Hasar Adedi"),
+    ("total_loss", "Toplam Hasar"),
+    ("expense", "Gider"),
+    ("uw_result", "UW Sonucu"),
+    ("combined_ratio", "Combined Ratio"),
+    ("capital", "Sermaye"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS periods (
+    session_id TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    scenario TEXT NOT NULL,
+    seed INTEGER,
+    policies INTEGER,
+    premium REAL,
+    premium_income REAL,
+    n_claims INTEGER,
+    total_loss REAL,
+    expense REAL,
+    uw_result REAL,
+    combined_ratio REAL,
+    capital REAL,
+    recorded_at REAL,
+    PRIMARY KEY (session_id, period)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS quiz_attempts (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    recorded_at REAL
+);
+
+-- Önceden toplanmış tablolar (yalnızca tetikleyicilerle güncellenir)
+CREATE TABLE IF NOT EXISTS session_summary (
+    session_id TEXT PRIMARY KEY,
+    scenario TEXT,
+    periods INTEGER NOT NULL,
+    capital REAL,
+    premium_income REAL NOT NULL,
+    total_cost REAL NOT NULL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS session_summary_capital ON session_summary (periods, capital);
+
+CREATE TABLE IF NOT EXISTS scenario_summary (
+    scenario TEXT PRIMARY KEY,
+    periods INTEGER NOT NULL,
+    loss_periods INTEGER NOT NULL,
+    premium_income REAL NOT NULL,
+    total_cost REAL NOT NULL,
+    cr_periods INTEGER NOT NULL,
+    cr_sum REAL NOT NULL,
+    cr_sq_sum REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS quiz_progress (
+    session_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    PRIMARY KEY (session_id, step)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS quiz_summary (
+    step TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    sessions INTEGER NOT NULL,
+    sessions_passed INTEGER NOT NULL,
+    first_try INTEGER NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS periods_aggregate AFTER INSERT ON periods BEGIN
+    INSERT INTO session_summary VALUES (
+        NEW.session_id, NEW.scenario, 1, NEW.capital, NEW.premium_income,
+        NEW.total_loss + NEW.expense, NEW.recorded_at
+    )
+    ON CONFLICT (session_id) DO UPDATE SET
+        scenario = excluded.scenario,
+        periods = periods + 1,
+        capital = excluded.capital,
+        premium_income = premium_income + excluded.premium_income,
+        total_cost = total_cost + excluded.total_cost,
+        updated_at = excluded.updated_at;
+    INSERT INTO scenario_summary VALUES (
+        NEW.scenario, 1, NEW.combined_ratio > 1, NEW.premium_income, NEW.total_loss + NEW.expense,
+        NEW.premium_income > 0,
+        CASE WHEN NEW.premium_income > 0 THEN NEW.combined_ratio ELSE 0 END,
+        CASE WHEN NEW.premium_income > 0 THEN NEW.combined_ratio * NEW.combined_ratio ELSE 0 END
+    )
+    ON CONFLICT (scenario) DO UPDATE SET
+        periods = periods + 1,
+        loss_periods = loss_periods + excluded.loss_periods,
+        premium_income = premium_income + excluded.premium_income,
+        total_cost = total_cost + excluded.total_cost,
+        cr_periods = cr_periods + excluded.cr_periods,
+        cr_sum = cr_sum + excluded.cr_sum,
+        cr_sq_sum = cr_sq_sum + excluded.cr_sq_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS quiz_aggregate AFTER INSERT ON quiz_attempts BEGIN
+    INSERT INTO quiz_summary VALUES (NEW.step, 0, 0, 0, 0, 0) ON CONFLICT (step) DO NOTHING;
+    UPDATE quiz_summary SET
+        attempts = attempts + 1,
+        correct = correct + NEW.ok,
+        sessions = sessions + NOT EXISTS (
+            SELECT 1 FROM quiz_progress WHERE session_id = NEW.session_id AND step = NEW.step),
+        first_try = first_try + (NEW.ok AND NOT EXISTS (
+            SELECT 1 FROM quiz_progress WHERE session_id = NEW.session_id AND step = NEW.step)),
+        sessions_passed = sessions_passed + (NEW.ok AND NOT EXISTS (
+            SELECT 1 FROM quiz_progress WHERE session_id = NEW.session_id AND step = NEW.step AND passed))
+    WHERE step = NEW.step;
+    INSERT INTO quiz_progress VALUES (NEW.session_id, NEW.step, 1, NEW.ok)
+    ON CONFLICT (session_id, step) DO UPDATE SET
+        attempts = attempts + 1,
+        passed = MAX(passed, excluded.passed);
+END;
+"""
+
+_INSERT_PERIOD = (
+    f"INSERT OR IGNORE INTO periods (session_id, {', '.join(col for col, _ in PERIOD_FIELDS)}, recorded_at) "
+    f"VALUES ({', '.join('?' * (len(PERIOD_FIELDS) + 2))})"
+)
+_INSERT_QUIZ = "INSERT INTO quiz_attempts (session_id, step, ok, recorded_at) VALUES (?, ?, ?, ?)"
+
+class StoreStats(NamedTuple):
+    queued: int
+    written: int
+    batches: int
+    dropped: int
+    errors: int
+    last_error: Optional[str]
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    return conn
+
+class ClassroomStore:
+    """
+    Oturumların dönem ve soru kayıtlarını toplu ve eşzamansız yazan, eğitmen özetlerini okuyan depo.
+    session_id bir "koşu"dur: uygulama Baştan Başlat'ta yeni kimlik verir, eski koşu depoda kalır.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        conn = _connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._local = threading.local()
+        self._readers = []              # tüm iş parçacıklarının okuyucu bağlantıları; close() kapatır
+        self._lock = threading.Lock()
+        self._written = self._batches = self._dropped = self._errors = 0
+        self._last_error = None
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name=f"ClassroomStore({path})", daemon=True)
+        self._writer.start()
+
+    # ---------- yazma (çağıran hiç beklemez) ----------
+    def _put(self, kind: str, values: tuple):
+        try:
+            self._queue.put_nowait((kind, values))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+
+    def record_period(self, session_id: str, row: dict):
+        """Geçmiş satırını (sonuç tablosu sütun adlarıyla) kuyruğa koyar; aynı (oturum, dönem) ikinci kez yazılmaz."""
+        values = tuple(row[name] for _, name in PERIOD_FIELDS)
+        self._put("period", (session_id,) + tuple(v.item() if isinstance(v, np.generic) else v for v in values)
+                  + (time.time(),))
+
+    def record_quiz(self, session_id: str, step, ok: bool):
+        """Bir mini soru denemesini kuyruğa koyar."""
+        self._put("quiz", (session_id, str(step), int(bool(ok)), time.time()))
+
+    def _run(self):
+        conn = _connect(self.path)
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=max(0.0, remaining)) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:          # kapanış: bu toplu yazımdan sonra çık
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(conn, batch)
+            for _ in batch:
+                self._queue.task_done()
+        conn.close()
+
+    def _write(self, conn: sqlite3.Connection, batch: list):
+        periods = [values for kind, values in batch if kind == "period"]
+        quizzes = [values for kind, values in batch if kind == "quiz"]
+        written = 0
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # rowcount tetikleyicileri ve INSERT OR IGNORE ile atlanan tekrarları saymaz
+            if periods:
+                written += conn.executemany(_INSERT_PERIOD, periods).rowcount
+            if quizzes:
+                written += conn.executemany(_INSERT_QUIZ, quizzes).rowcount
+            conn.execute("COMMIT")
+        except sqlite3.Error as exc:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            with self._lock:
+                self._errors += 1
+                self._last_error = f"{type(exc).__name__}: {exc}"
+            return
+        with self._lock:
+            self._written += written
+            self._batches += 1
+
+    def flush(self):
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler (testler, kapanış)."""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        with self._lock:
+            self._closed = True
+            readers, self._readers = self._readers, []
+        # Son bağlantı kapanınca SQLite WAL'ı ana dosyaya aktarıp -wal/-shm dosyalarını siler
+        for conn in readers:
+            conn.close()
+
+    def stats(self) -> StoreStats:
+        with self._lock:
+            return StoreStats(self._queue.qsize(), self._written, self._batches, self._dropped,
+                              self._errors, self._last_error)
+
+    # ---------- eğitmen sorguları (önceden toplanmış tablolar) ----------
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _connect(self.path)
+            conn.row_factory = sqlite3.Row
+            with self._lock:
+                if self._closed:
+                    conn.close()
+                    raise sqlite3.ProgrammingError("Depo kapatıldı.")
+                self._readers.append(conn)
+            self._local.conn = conn
+        return conn
+
+    @property
+    def open_readers(self) -> int:
+        """Açık okuyucu bağlantısı sayısı (iş parçacığı başına bir tane)."""
+        with self._lock:
+            return len(self._readers)
+
+    def overview(self) -> dict:
+        """Oturum, dönem ve soru denemesi sayıları."""
+        row = self._reader().execute(
+            "SELECT COUNT(*) AS sessions, COALESCE(SUM(periods), 0) AS periods, "
+            "COALESCE(SUM(periods >= 12), 0) AS finished FROM session_summary"
+        ).fetchone()
+        attempts = self._reader().execute("SELECT COALESCE(SUM(attempts), 0) FROM quiz_summary").fetchone()[0]
+        return {"sessions": row["sessions"], "periods": row["periods"], "finished": row["finished"],
+                "quiz_attempts": attempts}
+
+    def capital_distribution(self, min_periods: int = 1, quantiles: Sequence[float] = CAPITAL_QUANTILES,
+                             bins: int = 20) -> dict:
+        """En az min_periods dönem oynamış oturumların son sermayesi: kantiller ve histogram."""
+        capital = np.array([r[0] for r in self._reader().execute(
+            "SELECT capital FROM session_summary WHERE periods >= ? ORDER BY periods, capital", (min_periods,))],
+            dtype=float)
+        if capital.size == 0:
+            return {"sessions": 0, "quantiles": {}, "counts": np.zeros(0, dtype=int), "edges": np.zeros(0)}
+        counts, edges = np.histogram(capital, bins=bins)
+        return {
+            "sessions": int(capital.size),
+            "mean": float(capital.mean()),
+            "quantiles": dict(zip(quantiles, np.quantile(capital, quantiles))),
+            "counts": counts,
+            "edges": edges,
+        }
+
+    def cr_by_scenario(self) -> list:
+        """Senaryo başına dönem sayısı, CR (oranların oranı), dönem CR ortalaması / std ve zararlı dönem payı."""
+        rows = []
+        for r in self._reader().execute("SELECT * FROM scenario_summary ORDER BY scenario"):
+            n = r["cr_periods"]
+            mean = r["cr_sum"] / n if n else 0.0
+            var = max(0.0, r["cr_sq_sum"] / n - mean ** 2) * n / (n - 1) if n > 1 else 0.0
+            rows.append({
+                "scenario": r["scenario"],
+                "periods": r["periods"],
+                "combined_ratio": r["total_cost"] / r["premium_income"] if r["premium_income"] > 0 else 0.0,
+                "cr_mean": mean,
+                "cr_std": var ** 0.5,
+                "loss_share": r["loss_periods"] / r["periods"] if r["periods"] else 0.0,
+            })
+        return rows
+
+    def quiz_pass_rates(self) -> list:
+        """Soru başına deneme, doğru oranı, ilk denemede doğru ve sonunda geçen oturum payı."""
+        rows = []
+        for r in self._reader().execute("SELECT * FROM quiz_summary ORDER BY step"):
+            sessions = r["sessions"]
+            rows.append({
+                "step": r["step"],
+                "sessions": sessions,
+                "attempts": r["attempts"],
+                "correct_rate": r["correct"] / r["attempts"] if r["attempts"] else 0.0,
+                "first_try_rate": r["first_try"] / sessions if sessions else 0.0,
+                "pass_rate": r["sessions_passed"] / sessions if sessions else 0.0,
+            })
+        return rows
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+def open_store(path: str, **kwargs) -> ClassroomStore:
+    """Süreç genelinde yol başına tek depo (ilk çağrının ayarlarıyla)."""
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = _STORES[path] = ClassroomStore(path, **kwargs)
+        return store
+
+@atexit.register
+def _close_stores():
+    with _STORES_LOCK:
+        for store in _STORES.values():
+            store.close()
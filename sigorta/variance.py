@@ -0,0 +1,147 @@
+"""
+Prim düzeylerini karşılaştırmak için varyans azaltmalı tahminciler.
+
+Her deneme tek bir hasar adedi uniformu U ve tek bir toplam hasar uniformu V ile üretilir:
+
+    hasar adedi  N = F⁻¹_Binom(n, p)(U)        (ters CDF, tablo üzerinden)
+    toplam hasar S = F⁻¹_Gamma(N, μ)(V)        (N üstel hasarın toplamı; sampling.gamma_ppf)
+
+Bu dağılım simulate_period ile aynıdır (64'ten fazla hasarda Gamma ters CDF'i Wilson–Hilferty
+yaklaşımıdır, bkz. sampling); farkı, çekilişlerin monoton dönüşümlerle yapılmasıdır. Deneme başına
+iki uniform yeterli olduğundan bellek hasar adedinden bağımsızdır:
+- Ortak rastgele sayılar (CRN): tüm aday primler aynı U ve V'yi kullanır, sonuçlar güçlü
+  pozitif ilişkili olur ve fark tahmininin varyansı düşer.
+- Antitetik çiftler: her denemenin eşi 1 - U ve 1 - V ile üretilir.
+- Kontrol değişkeni: C = S / n - p × μ (beklenen hasar/poliçe bilindiği için E[C] = 0).
+
+Varyans azaltma çarpanı, aynı deneme sayısıyla düz (bağımsız) Monte Carlo'nun varyansının
+elde edilen varyansa oranıdır; düz varyans aynı çekilişlerin marjinal varyanslarından tahmin edilir.
+"""
+import math
+from statistics import NormalDist
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .core import SeedLike, demand_from_premium, suggested_gross_premium
+from .sampling import binomial_ppf, gamma_ppf
+
+METRICS = ("uw", "prob_loss", "shortfall")
+DRAW_CHUNK = 2048
+
+def _losses(u: np.ndarray, v: np.ndarray, n_policies: np.ndarray, p_claim: float, mean_loss: float) -> np.ndarray:
+    """(çekiliş × aday) toplam hasar matrisi; tüm adaylar aynı u, v'yi kullanır."""
+    counts = binomial_ppf(u[:, None], n_policies[None, :], p_claim)
+    return gamma_ppf(np.broadcast_to(v[:, None], counts.shape), counts, mean_loss)
+
+def _outcome(metric: str, losses: np.ndarray, margin: np.ndarray) -> np.ndarray:
+    if metric == "uw":
+        return margin - losses
+    if metric == "prob_loss":
+        return (losses > margin).astype(float)
+    return np.maximum(losses - margin, 0.0)
+
+def _cv_adjust(y: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """y - (c - E[c]) β; E[c] = 0, β en küçük kareler ile (birden çok kontrol olabilir)."""
+    c = c.reshape(c.shape[0], -1)
+    beta, *_ = np.linalg.lstsq(c - c.mean(axis=0), y - y.mean(), rcond=None)
+    return y - c @ beta
+
+def compare_premiums(premium_factors: Sequence[float], p_claim: float, mean_loss: float,
+                     expense_loading: float, profit_loading: float, base_policies: int,
+                     sensitivity: float, n_trials: int = 10_000, metric: str = "prob_loss",
+                     baseline: int = 0, crn: bool = True, antithetic: bool = True,
+                     control_variate: bool = True, confidence: float = 0.95,
+                     target_half_width: Optional[float] = None, seed: SeedLike = None) -> dict:
+    """
+    Aday prim düzeyleri (önerilen brüt primin %'si) için metric'in beklenen değerini ve her adayın
+    baseline adayından farkını tahmin eder.
+    metric: "uw" (UW Sonucu), "prob_loss" (P(Combined Ratio > 1)) veya "shortfall" (E[teknik zarar]).
+    UW Sonucu toplam hasarın doğrusal fonksiyonu olduğundan kontrol değişkeniyle tam (analitik)
+    değeri verir; asıl kazanç doğrusal olmayan ölçütlerde ve fark tahminlerindedir.
+    Dönüş: aday ve fark bazında tahmin, standart hata, varyans azaltma çarpanı ve hedef güven
+    aralığı yarı genişliği için gereken deneme sayısı (elde edilen ve düz MC için).
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Bilinmeyen ölçüt: {metric!r}")
+    factors = np.asarray(premium_factors, dtype=float)
+    suggested = suggested_gross_premium(p_claim, mean_loss, expense_loading, profit_loading)
+    premiums = suggested * factors / 100.0
+    n_pol = demand_from_premium(premiums, base_policies, suggested if suggested > 0 else 1.0, sensitivity)
+    margin = n_pol * premiums * (1.0 - expense_loading)
+
+    rng = np.random.default_rng(seed)
+    n_base = n_trials // 2 if antithetic else n_trials
+    chunks = []
+    for start in range(0, n_base, DRAW_CHUNK):
+        size = min(DRAW_CHUNK, n_base - start)
+        if crn:
+            u = rng.random(size)
+            v = rng.random(size)
+            draws = [(u, v)]
+            if antithetic:
+                draws.append((1.0 - u, 1.0 - v))
+            chunks.append([_losses(uu, vv, n_pol, p_claim, mean_loss) for uu, vv in draws])
+        else:
+            # Bağımsız akış: her aday kendi uniformlarını çeker
+            per_draw = [[] for _ in range(2 if antithetic else 1)]
+            for n in n_pol[:, None]:
+                u = rng.random(size)
+                v = rng.random(size)
+                per_draw[0].append(_losses(u, v, n, p_claim, mean_loss)[:, 0])
+                if antithetic:
+                    per_draw[1].append(_losses(1.0 - u, 1.0 - v, n, p_claim, mean_loss)[:, 0])
+            chunks.append([np.stack(d, axis=1) for d in per_draw])
+
+    # (deneme, aday) matrisleri; antitetik ise [:, 0] ve [:, 1] eş denemelerdir
+    losses = np.stack([np.concatenate([c[i] for c in chunks]) for i in range(len(chunks[0]))], axis=1)
+    y = _outcome(metric, losses, margin)
+    control = losses / np.maximum(n_pol, 1) - p_claim * mean_loss
+
+    # Tahminci birimi: antitetik çift ortalaması (2 deneme) veya tek deneme
+    unit_y = y.mean(axis=1)
+    unit_c = control.mean(axis=1)
+    trials_per_unit = y.shape[1]
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    def summarize(unit_values, unit_controls, plain):
+        """plain: düz MC'de deneme başına varyans (farkta iki bağımsız adayın varyans toplamı)."""
+        if control_variate:
+            unit_values = _cv_adjust(unit_values, unit_controls)
+        # Deneme başına eşdeğer varyans: birim varyansı × birimdeki deneme sayısı
+        achieved = float(unit_values.var(ddof=1)) * trials_per_unit
+        n_used = unit_values.size * trials_per_unit
+        result = {
+            "estimate": float(unit_values.mean()),
+            "std_error": math.sqrt(achieved / n_used),
+            "plain_std_error": math.sqrt(plain / n_used),
+            # UW doğrusal olduğundan kontrol değişkeniyle tam çözülür: artık varyans yuvarlama gürültüsüdür
+            "variance_reduction": plain / achieved if achieved > 1e-12 * plain else math.inf,
+        }
+        if target_half_width:
+            result["trials_needed"] = math.ceil(achieved * (z / target_half_width) ** 2)
+            result["plain_trials_needed"] = math.ceil(plain * (z / target_half_width) ** 2)
+        return result
+
+    plain_var = y.reshape(-1, y.shape[2]).var(axis=0, ddof=1)
+    candidates = []
+    for j in range(len(factors)):
+        stats = summarize(unit_y[:, j], unit_c[:, [j]], float(plain_var[j]))
+        candidates.append({"premium_factor": float(factors[j]), "premium": float(premiums[j]),
+                           "policies": int(n_pol[j]), **stats})
+
+    differences = []
+    for j in range(len(factors)):
+        if j == baseline:
+            continue
+        stats = summarize(unit_y[:, j] - unit_y[:, baseline], unit_c[:, [j, baseline]],
+                          float(plain_var[j] + plain_var[baseline]))
+        differences.append({"premium_factor": float(factors[j]), "baseline_factor": float(factors[baseline]), **stats})
+
+    return {
+        "metric": metric,
+        "n_trials": int(y.shape[0] * y.shape[1]),
+        "confidence": confidence,
+        "candidates": candidates,
+        "differences": differences,
+    }
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from sigorta.analytic import aggregate_loss_distribution, analytic_period_metrics
+
+P_CLAIM, MEAN_LOSS = 0.08, 25_000.0
+
+@pytest.mark.parametrize("n_policies", [1, 2_000, 1_000_000])
+def test_discretisation_preserves_expected_loss(n_policies):
+    dist = aggregate_loss_distribution(n_policies, P_CLAIM, MEAN_LOSS)
+    assert dist.pmf.sum() == pytest.approx(1.0)
+    assert dist.mean == pytest.approx(n_policies * P_CLAIM * MEAN_LOSS, rel=1e-9)
+
+def test_poisson_variance_matches_compound_formula():
+    dist = aggregate_loss_distribution(2_000, P_CLAIM, MEAN_LOSS, frequency="poisson")
+    mean = dist.grid @ dist.pmf
+    variance = ((dist.grid - mean) ** 2) @ dist.pmf
+    # Var(S) = λ E[X²] = λ 2μ²; ayrıklaştırma h²/12 mertebesinde fark bırakır
+    assert variance == pytest.approx(2_000 * P_CLAIM * 2 * MEAN_LOSS ** 2, rel=1e-4)
+
+def test_risk_metrics_agree_with_monte_carlo():
+    n_policies, premium, expense_loading = 2_000, 2_600.0, 0.20
+    rng = np.random.default_rng(1)
+    n_claims = rng.binomial(n_policies, P_CLAIM, size=400_000)
+    losses = np.where(n_claims > 0, rng.gamma(np.maximum(n_claims, 1), MEAN_LOSS), 0.0)
+
+    metrics = analytic_period_metrics(n_policies, P_CLAIM, MEAN_LOSS, premium, expense_loading)
+    for level in (0.95, 0.99, 0.995):
+        assert metrics["loss_var"][level] == pytest.approx(np.quantile(losses, level), rel=5e-3)
+    tail = losses[losses >= np.quantile(losses, 0.99)]
+    assert metrics["loss_tvar"][0.99] == pytest.approx(tail.mean(), rel=5e-3)
+
+    margin = n_policies * premium * (1 - expense_loading)
+    prob = (losses > margin).mean()
+    std_error = np.sqrt(prob * (1 - prob) / losses.size)
+    assert abs(metrics["prob_cr_above_1"] - prob) < 4 * std_error
+    assert metrics["expected_uw"] == pytest.approx(margin - n_policies * P_CLAIM * MEAN_LOSS)
@@ -0,0 +1,87 @@
+import threading
+
+import numpy as np
+import pytest
+
+from sigorta.cache import ResultCache, cached, estimate_bytes, normalize_key
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_lru_eviction_and_counters():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1          # a en son kullanılan olur
+    cache.put("c", 3)                   # b tahliye edilir
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (3, 1, 1, 2)
+    assert stats.hit_rate == pytest.approx(0.75)
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = ResultCache(ttl=10.0, clock=clock)
+    cache.put("a", 1)
+    clock.now = 10.0
+    assert cache.get("a") == 1
+    clock.now = 10.5
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats.expirations, stats.entries, stats.bytes) == (1, 0, 0)
+
+def test_byte_limit_eviction():
+    block = np.zeros(1_000)
+    cache = ResultCache(max_bytes=2 * block.nbytes + 100)
+    for key in "abc":
+        cache.put(key, block.copy())
+    stats = cache.stats()
+    assert (stats.entries, stats.evictions) == (2, 1)
+    assert stats.bytes == 2 * estimate_bytes(block)
+    cache.put("big", np.zeros(10_000))  # tek başına sınırı aşan sonuç saklanmaz
+    assert cache.get("big") is None and len(cache) == 2
+
+def test_get_or_compute_runs_once_and_freezes_arrays():
+    cache = ResultCache()
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        return {"x": np.arange(3)}
+
+    def worker(out):
+        barrier.wait()
+        out.append(cache.get_or_compute("k", compute))
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert not results[0]["x"].flags.writeable
+    stats = cache.stats()
+    assert (stats.hits + stats.misses, stats.misses) == (8, 1)
+
+def test_cached_skips_unseeded_calls_and_normalises_floats():
+    cache = ResultCache()
+    calls = []
+
+    @cached(cache=cache)
+    def draw(scale, seed=None):
+        calls.append(seed)
+        return np.random.default_rng(seed).random() * scale
+
+    assert draw(2.0, seed=1) == draw(2.0 + 1e-15, seed=1)
+    draw(2.0)
+    draw(2.0)
+    assert calls == [1, None, None]
+    assert normalize_key({"b": [1, 2.0], "a": None}) == (("a", None), ("b", (1, 2.0)))
@@ -0,0 +1,113 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sigorta.autopilot import FACTOR_BOUNDS, PolicyState, coach_policy, evaluate_policies
+from sigorta.coach import COACH_RULES, NO_SALES_FACTOR, cr_price_bands, evaluate_table
+from sigorta.core import compute_last_insights
+
+def _baseline_insights(last: dict, suggested_gross: float, premium_choice: float):
+    """Tablo güdümlü motordan önceki if/elif zinciri (yol haritası hariç)."""
+    premium_income = float(last["Prim Geliri"])
+    cr = float(last["Combined Ratio"])
+    demand_ratio = int(last["Poliçe"]) / (int(last.get("Referans Satış (poliçe)", 0)) or 1)
+    price_gap = premium_choice / max(1.0, suggested_gross)
+    diagnosis, actions = [], []
+
+    if premium_income == 0:
+        diagnosis.append("Satış yok: prim rekabetçi seviyenin çok üzerinde kalmış görünüyor.")
+        actions.append("Prim düzeyini düşür (ör. önerilen brüt primin %90–%110 bandına yaklaş).")
+    elif cr < 1.0:
+        diagnosis.append(f"Teknik sonuç olumlu: Combined Ratio = {cr:.2f} (< 1).")
+        actions.append("Fiyatı koru veya kontrollü büyüme için küçük indirim dene (örn. -%5).")
+    elif 1.0 <= cr < 1.10:
+        diagnosis.append(f"Teknik sonuç sınıra yakın: Combined Ratio = {cr:.2f} (1’e yakın).")
+        actions.append("Prim düzeyini bir kademe artır (örn. +%5–%10) veya gider oranını düşürmeyi dene.")
+    else:
+        diagnosis.append(f"Teknik sonuç olumsuz: Combined Ratio = {cr:.2f} (>> 1).")
+        actions.append("Prim düzeyini artır (+%10–%20) ve fiyat disiplinini güçlendir.")
+
+    if price_gap < 0.9:
+        diagnosis.append("Prim, önerilen brüt primin belirgin altında: satış artabilir ama prim yetersizliği sermayeyi zorlayabilir.")
+        actions.append("CR>1 ise önce prim seviyesini önerilen banda yaklaştır.")
+    elif price_gap > 1.1:
+        diagnosis.append("Prim, önerilen brüt primin üstünde: zarar riski azalabilir ama rekabetçi satış düşebilir.")
+        actions.append("Satış çok düştüyse prim seviyesini biraz geri çek (örn. -%5).")
+    else:
+        diagnosis.append("Prim, önerilen brüt prime yakın: fiyatlama açısından dengeli bir bölgede ilerliyorsun.")
+
+    if demand_ratio < 0.6:
+        diagnosis.append("Satış zayıf: fiyat pahalı kalmış olabilir veya piyasa fiyata çok hassastır.")
+        actions.append("Satış hedefleniyorsa prim düzeyini düşür veya fiyata duyarlılığı daha düşük bir piyasa varsayımıyla test et.")
+    elif demand_ratio > 1.2:
+        diagnosis.append("Satış güçlü: genişleyen risk havuzu sonuçları beklenen değere yaklaştırma eğilimindedir.")
+        actions.append("CR kötü ise satış artışı zararı büyütebilir → prim artır. CR iyi ise büyümeyi sürdür.")
+    return diagnosis, actions
+
+# Eşiklerin iki yanı: CR 1 / 1,10, talep 0,6 / 1,2, fiyat farkı 0,9 / 1,1
+GRID = list(itertools.product(
+    [0.0, 1e6],                                                   # prim geliri
+    [0.0, 0.5, 0.9999, 1.0, 1.05, 1.0999, 1.1, 1.5, np.nan],     # combined ratio
+    [0, 100, 1199, 1200, 1201, 2000, 2401, 2500],                 # poliçe
+    [0, 1, 2000],                                                 # referans satış
+    [0.5, 2000, 2339, 2340, 2600, 2860, 2861, 5000],              # seçilen prim
+    [0.5, 2600.0],                                                # önerilen brüt prim
+))
+
+def _row(income, cr, policies, reference):
+    return {"Prim Geliri": income, "Combined Ratio": cr, "Poliçe": policies, "Referans Satış (poliçe)": reference}
+
+def test_last_insights_match_baseline_on_threshold_grid():
+    for income, cr, policies, reference, premium, suggested in GRID:
+        row = _row(income, cr, policies, reference)
+        diagnosis, actions, _ = compute_last_insights([row], suggested, premium)
+        assert (diagnosis, actions) == _baseline_insights(row, suggested, premium), (row, suggested, premium)
+
+def test_dataframe_and_missing_reference_match_baseline():
+    for income, cr, policies, reference, premium, suggested in GRID[::17]:
+        row = _row(income, cr, policies, reference)
+        diagnosis, actions, _ = compute_last_insights(pd.DataFrame([row]), suggested, premium)
+        assert (diagnosis, actions) == _baseline_insights(row, suggested, premium)
+    row = {"Prim Geliri": 1.0, "Combined Ratio": 1.0, "Poliçe": 1}
+    assert compute_last_insights([row], 2600.0, 2600.0)[:2] == _baseline_insights(row, 2600.0, 2600.0)
+
+def test_vectorised_table_matches_row_by_row_baseline():
+    table = pd.DataFrame([_row(*case[:4]) for case in GRID])
+    premium = np.array([case[4] for case in GRID])
+    suggested = np.array([case[5] for case in GRID])
+    evaluation = evaluate_table(table, suggested, premium=premium)
+    assert len(evaluation) == len(GRID)
+    for i, case in enumerate(GRID):
+        assert evaluation.messages(i) == _baseline_insights(table.iloc[i].to_dict(), case[5], case[4])
+
+def test_coach_policy_follows_rule_table():
+    edges, multipliers = cr_price_bands()
+    assert (edges, multipliers) == ([1.0, 1.10], [0.95, 1.075, 1.15])
+    state = PolicyState(1, np.full(5, 100.0), np.array([0.9, 1.0, 1.05, 1.2, 0.0]),
+                        np.array([10, 10, 10, 10, 0]), np.ones(5), np.ones(5))
+    np.testing.assert_allclose(coach_policy()(state), [95.0, 107.5, 107.5, 115.0, 100.0])
+
+    edited = [rule._replace(price_factor=1.2) if rule.code == "teknik_zarar" else rule for rule in COACH_RULES]
+    assert coach_policy(edited)(state)[3] == pytest.approx(120.0)
+    high = state._replace(premium_factor=np.full(5, 150.0))
+    assert coach_policy()(high)[4] == NO_SALES_FACTOR
+
+def test_coach_policy_band_edges():
+    cr = np.array([0.9999, 1.0, 1.0999, 1.10, 3.0])
+    state = PolicyState(1, np.full(5, 100.0), cr, np.full(5, 10), np.ones(5), np.ones(5))
+    np.testing.assert_allclose(coach_policy()(state), [95.0, 107.5, 107.5, 115.0, 115.0])
+    # Satış yoksa prim düzeyi en fazla NO_SALES_FACTOR'a çekilir, zaten altındaysa korunur
+    no_sales = PolicyState(1, np.array([90.0, 150.0]), np.zeros(2), np.zeros(2, dtype=int), np.zeros(2), np.ones(2))
+    np.testing.assert_allclose(coach_policy()(no_sales), [90.0, NO_SALES_FACTOR])
+
+def test_coach_policy_moves_towards_break_even_within_bounds():
+    results = evaluate_policies({"koç": coach_policy()}, 0.08, 25_000.0, 0.20, 0.10, 2_000, 1.2, 1e9,
+                                start_factor={"koç": 60.0}, n_paths=2_000, n_periods=12, seed=0)
+    path = results["koç"]["premium_factor_by_period"]
+    assert path[0] == 60.0
+    assert np.all(np.diff(path[:4]) > 0)          # CR ≥ 1,10 bandında her dönem %15 artış
+    assert np.all((path >= FACTOR_BOUNDS[0]) & (path <= FACTOR_BOUNDS[1]))
+    # Başa baş prim düzeyi 100 / 1,3 / 0,8 ≈ %96; koç bunun çevresinde salınır
+    assert 85.0 < path[-4:].mean() < 115.0
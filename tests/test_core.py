@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from sigorta.core import (
+    FAN_QUANTILES,
+    SCENARIOS,
+    demand_from_premium,
+    period_seed,
+    replay_period,
+    simulate_capital_paths,
+    simulate_period,
+    suggested_gross_premium,
+    sweep_surface,
+)
+
+P_CLAIM, MEAN_LOSS = 0.08, 25_000.0
+
+@pytest.mark.parametrize("n_policies", [50, 2_000])
+def test_aggregate_and_per_policy_sampling_share_moments(n_policies):
+    n_draws = 4_000
+    # N ~ Binom(n, p), S = Σ Üstel(μ): E[S] = npμ, Var(S) = npμ²(2 - p)
+    mean = n_policies * P_CLAIM * MEAN_LOSS
+    variance = n_policies * P_CLAIM * MEAN_LOSS ** 2 * (2 - P_CLAIM)
+    for method in ("aggregate", "per_policy"):
+        seeds = np.random.SeedSequence(7).spawn(n_draws)
+        draws = np.array([simulate_period(n_policies, P_CLAIM, MEAN_LOSS, seed=s, method=method) for s in seeds])
+        counts, losses = draws[:, 0], draws[:, 1]
+        assert counts.mean() == pytest.approx(n_policies * P_CLAIM, abs=4 * np.sqrt(n_policies * P_CLAIM / n_draws))
+        assert losses.mean() == pytest.approx(mean, abs=4 * np.sqrt(variance / n_draws))
+        assert losses.var(ddof=1) == pytest.approx(variance, rel=0.15)
+        assert np.all(losses[counts == 0] == 0.0)
+
+def test_empty_book_and_unknown_method():
+    assert simulate_period(0, P_CLAIM, MEAN_LOSS, seed=1, method="aggregate") == (0, 0.0)
+    assert simulate_period(0, P_CLAIM, MEAN_LOSS, seed=1, method="per_policy") == (0, 0.0)
+    with pytest.raises(ValueError):
+        simulate_period(10, P_CLAIM, MEAN_LOSS, seed=1, method="poisson")
+
+def test_capital_paths_shapes_and_ruin_probability():
+    n_paths, n_periods, n_policies, premium, capital0 = 4_000, 12, 2_000, 2_600.0, 300_000.0
+    paths = simulate_capital_paths(n_paths, n_policies, P_CLAIM, MEAN_LOSS, premium, 0.20, capital0,
+                                   n_periods=n_periods, seed=3)
+    assert paths["capital"].shape == (n_paths, n_periods)
+    assert paths["final_capital"].shape == (n_paths,)
+    assert list(paths["quantiles"]) == list(FAN_QUANTILES)
+    bands = np.array(list(paths["quantiles"].values()))
+    assert bands.shape == (len(FAN_QUANTILES), n_periods)
+    assert np.all(np.diff(bands, axis=0) >= 0)
+    assert paths["ruin_probability"] == (paths["capital"] < 0).any(axis=1).mean()
+
+    # Aynı model dönem dönem simulate_period ile: iflas olasılıkları standart hata içinde uyuşur
+    margin = n_policies * premium * 0.80
+    seeds = np.random.SeedSequence(11).spawn(n_paths)
+    ruined = 0
+    for s in seeds:
+        rng = np.random.default_rng(s)
+        uw = [margin - simulate_period(n_policies, P_CLAIM, MEAN_LOSS, seed=rng, method="aggregate")[1]
+              for _ in range(n_periods)]
+        ruined += bool((capital0 + np.cumsum(uw) < 0).any())
+    expected = ruined / n_paths
+    assert 0.05 < expected < 0.95
+    se = np.sqrt(2 * expected * (1 - expected) / n_paths)
+    assert paths["ruin_probability"] == pytest.approx(expected, abs=4 * se)
+
+def test_capital_paths_ruin_extremes():
+    safe = simulate_capital_paths(500, 2_000, P_CLAIM, MEAN_LOSS, 2_600.0, 0.20, 1e12, seed=1)
+    assert safe["ruin_probability"] == 0.0
+    broke = simulate_capital_paths(500, 2_000, P_CLAIM, MEAN_LOSS, 2_600.0, 0.20, -1e9, seed=1)
+    assert broke["ruin_probability"] == 1.0
+
+def test_sweep_surface_matches_scalar_demand():
+    expense, profit, base = 0.20, 0.10, 2_000
+    surface = sweep_surface(P_CLAIM, MEAN_LOSS, expense, profit, base, 1_000_000.0, n_paths=20, n_periods=4, seed=5)
+    suggested = suggested_gross_premium(P_CLAIM, MEAN_LOSS, expense, profit)
+    shape = (surface["premium_factor"].size, surface["sensitivity"].size)
+    for key in ("policies", "expected_cr", "simulated_cr", "expected_uw", "simulated_uw", "ruin_probability"):
+        assert surface[key].shape == shape
+    for i, factor in enumerate(surface["premium_factor"]):
+        premium = suggested * float(factor) / 100.0
+        for j, sensitivity in enumerate(surface["sensitivity"]):
+            n = demand_from_premium(premium, base, suggested, float(sensitivity))
+            assert surface["policies"][i, j] == n
+            assert surface["expected_uw"][i, j] == pytest.approx(n * premium * (1 - expense) - n * P_CLAIM * MEAN_LOSS)
+            assert surface["expected_cr"][i, j] == pytest.approx((P_CLAIM * MEAN_LOSS + premium * expense) / premium)
+    # Duyarlılık 0 iken talep fiyattan bağımsızdır
+    assert np.all(surface["policies"][:, 0] == base)
+
+def test_array_demand_broadcasts_like_scalar_calls():
+    premium = np.array([0.0, 1_500.0, 2_600.0, 4_000.0])
+    sensitivity = np.array([0.0, 1.2, 3.0])
+    grid = demand_from_premium(premium[:, None], 2_000, 2_600.0, sensitivity[None, :])
+    assert grid.dtype == np.int64 and grid.shape == (4, 3)
+    for i, p in enumerate(premium):
+        for j, s in enumerate(sensitivity):
+            assert grid[i, j] == demand_from_premium(float(p), 2_000, 2_600.0, float(s))
+    # Sıfır referans primde oran 1 kabul edilir; 0-boyutlu girişte int döner
+    assert np.all(demand_from_premium(premium, 2_000, np.zeros(4), 1.2) == 2_000)
+    assert isinstance(demand_from_premium(np.float64(2_600.0), 2_000, np.array(2_600.0), 1.2), int)
+
+@pytest.mark.parametrize("n_policies, method", [(2_000, "auto"), (2_000, "per_policy"), (200_000, "aggregate")])
+def test_replay_period_reproduces_simulate_period(n_policies, method):
+    seed = 20240917
+    for period in (1, 2, 17):
+        original = simulate_period(n_policies, P_CLAIM, MEAN_LOSS, seed=period_seed(seed, period), method=method)
+        assert replay_period(seed, period, n_policies, P_CLAIM, MEAN_LOSS, method=method) == original
+    assert replay_period(seed, 1, n_policies, P_CLAIM, MEAN_LOSS, method=method) != \
+        replay_period(seed, 2, n_policies, P_CLAIM, MEAN_LOSS, method=method)
+
+def test_replay_period_with_heavy_tailed_severity():
+    severity = next(s["severity"] for s in SCENARIOS.values() if s.get("severity"))
+    original = simulate_period(2_000, P_CLAIM, MEAN_LOSS, seed=period_seed(5, 3), severity=severity)
+    assert replay_period(5, 3, 2_000, P_CLAIM, MEAN_LOSS, severity=severity) == original
@@ -0,0 +1,57 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from sigorta.history import HISTORY_COLUMNS, INITIAL_CAPACITY, PeriodHistory
+
+def _row(period: int) -> dict:
+    row = {name: period for name in HISTORY_COLUMNS}
+    row["Piyasa koşulu"] = "Riskli Piyasa" if period % 2 else "Standart Piyasa"
+    row["Combined Ratio"] = period / 10
+    return row
+
+def test_append_grows_capacity_and_keeps_rows():
+    history = PeriodHistory()
+    assert not history and history.capacity == INITIAL_CAPACITY
+    n = 3 * INITIAL_CAPACITY + 1
+    for period in range(1, n + 1):
+        history.append(_row(period))
+    assert len(history) == n and history.version == n
+    assert history.capacity == 4 * INITIAL_CAPACITY
+    np.testing.assert_array_equal(history.column("Fiyatlama Dönemi"), np.arange(1, n + 1))
+    assert list(history.column("Piyasa koşulu")[:2]) == ["Riskli Piyasa", "Standart Piyasa"]
+    assert history[-1] == _row(n)
+    assert isinstance(history[0]["Poliçe"], int)
+    with pytest.raises(IndexError):
+        history.row(n)
+
+def test_column_views_are_read_only():
+    history = PeriodHistory()
+    history.append(_row(1))
+    with pytest.raises(ValueError):
+        history.column("Sermaye")[0] = 0.0
+
+def test_views_are_cached_until_next_append():
+    history = PeriodHistory()
+    history.append(_row(1))
+    builds = []
+
+    def build(h):
+        builds.append(len(h))
+        return h.column("Combined Ratio").sum()
+
+    assert history.view("cr", build) == pytest.approx(0.1)
+    assert history.view("cr", build) == pytest.approx(0.1)
+    assert builds == [1]
+    history.append(_row(2))
+    assert history.view("cr", build) == pytest.approx(0.3)
+    assert builds == [1, 2]
+
+def test_pickle_drops_derived_views():
+    history = PeriodHistory()
+    history.append(_row(1))
+    history.view("cr", lambda h: object())
+    restored = pickle.loads(pickle.dumps(history))
+    assert restored._views == {}
+    assert restored[0] == history[0]
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from sigorta.market import Insurer, make_insurers, simulate_market
+
+P_CLAIM, MEAN_LOSS = 0.08, 25_000.0
+
+def test_shares_sum_to_one_including_exits():
+    # Düşük sermaye: bazı sigortacılar dönem içinde piyasadan çıkar
+    insurers = make_insurers(4, capital0=150_000.0, seed=1)
+    result = simulate_market(insurers, P_CLAIM, MEAN_LOSS, 5_000, 2.0, n_trials=2_000, n_periods=12, seed=2)
+    share = result["share"].astype(float)
+    assert share.shape == (2_000, 5, 12)
+    assert result["ruin_probability"].max() > 0
+
+    totals = share.sum(axis=1)
+    # Dönem başında en az bir sigortacı ayaktaysa paylar 1'e, hiçbiri yoksa 0'a toplanır
+    alive_at_start = np.concatenate([np.ones((2_000, 1), dtype=bool),
+                                     (result["capital"][..., :-1] >= 0).any(axis=1)], axis=1)
+    np.testing.assert_allclose(totals[alive_at_start], 1.0, atol=1e-6)
+    assert np.all(totals[~alive_at_start] == 0.0)
+    assert np.all(result["share_by_period"].sum(axis=0) <= 1.0 + 1e-6)
+    assert result["mean_share"].sum() == pytest.approx(alive_at_start.mean(), abs=1e-5)  # float32 paylar
+
+def test_cheaper_insurer_wins_share():
+    insurers = [Insurer("Ucuz", 90.0), Insurer("Pahalı", 110.0)]
+    result = simulate_market(insurers, P_CLAIM, MEAN_LOSS, 5_000, 2.0, n_trials=200, n_periods=1, seed=0)
+    share = result["share"][:, :, 0]
+    np.testing.assert_allclose(share.sum(axis=1), 1.0, atol=1e-6)
+    # pay oranı exp(-duyarlılık × prim farkı / referans prim)
+    assert share[0, 0] / share[0, 1] == pytest.approx(np.exp(2.0 * 0.2), rel=1e-5)
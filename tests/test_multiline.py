@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from sigorta.multiline import MULTILINE_LINES, simulate_multiline
+
+def test_without_catastrophes_lines_are_independent():
+    result = simulate_multiline(cat_probability=0.0, n_paths=5_000, seed=2)
+    assert result["cat_frequency"] == 0.0
+    n = len(MULTILINE_LINES)
+    corr = result["loss_ratio_correlation"]
+    assert np.abs(corr - np.eye(n)).max() < 0.03   # 60 000 dönem: sıfır korelasyonun standart hatası ≈ 0,004
+
+    for i, (name, line) in enumerate(MULTILINE_LINES.items()):
+        expected_cr = (line["p_claim"] * line["mean_loss"] + result["premium"][i] * 0.20) / result["premium"][i]
+        assert result["expected_cr"][i] == pytest.approx(expected_cr)
+        assert result["combined_ratio"][i] == pytest.approx(expected_cr, rel=0.01)
+        # Tek başına simüle edilen branş aynı dağılımı verir
+        alone = simulate_multiline({name: line}, cat_probability=0.0, n_paths=5_000, seed=3)
+        assert alone["combined_ratio"][0] == pytest.approx(result["combined_ratio"][i], rel=0.01)
+        assert alone["cr_q99"][0] == pytest.approx(result["cr_q99"][i], rel=0.03)
+        assert alone["required_capital"][0] == pytest.approx(result["required_capital"][i], rel=0.25)
+
+    # Bağımsız branşlarda çeşitlendirme faydası pozitiftir
+    assert result["diversification_benefit"] > 0
+
+def test_common_shock_correlates_lines():
+    result = simulate_multiline(cat_probability=0.2, n_paths=5_000, seed=2)
+    off_diagonal = result["loss_ratio_correlation"][~np.eye(len(MULTILINE_LINES), dtype=bool)]
+    assert off_diagonal.min() > 0.1
+    assert result["cat_frequency"] == pytest.approx(0.2, abs=0.01)
+
+def test_rejects_invalid_cat_probability():
+    with pytest.raises(ValueError):
+        simulate_multiline(cat_probability=1.5, n_paths=10)
@@ -0,0 +1,39 @@
+import pytest
+
+from sigorta.batch import expand_runs
+from sigorta.cli import main
+from sigorta.parallel import run_parallel
+
+PARAMS = {"defaults": {"n_trials": 300, "seed": 3}, "grid": {"premium_factor": [90, 110]},
+          "runs": [{"severity": {"dist": "pareto", "alpha": 2.2}}]}
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record: dict):
+        self.records.append(record)
+
+def _run(workers: int):
+    sink = ListSink()
+    summaries, _ = run_parallel(expand_runs(PARAMS), sink, workers=workers, chunk_size=64)
+    return sink.records, summaries
+
+def test_output_is_bit_identical_across_worker_counts():
+    serial_records, serial = _run(1)
+    pooled_records, pooled = _run(2)
+    assert len(serial_records) == 3 * 300
+    assert serial_records == pooled_records
+    assert serial.keys() == pooled.keys()
+    for run_id in serial:
+        a, b = serial[run_id], pooled[run_id]
+        assert (a.n, a.premium_income, a.total_loss, a.expense, a.uw_sum) == \
+               (b.n, b.premium_income, b.total_loss, b.expense, b.uw_sum)
+        assert a.uw_std == b.uw_std
+        assert a.risk.report() == b.risk.report()
+
+def test_cli_rejects_negative_workers(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main([str(tmp_path / "yok.json"), "-o", str(tmp_path / "out.csv"), "--workers", "-1"])
+    assert exc.value.code == 2
+    assert "--workers" in capsys.readouterr().err
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from sigorta import portfolio as portfolio_module
+from sigorta.core import period_seed
+from sigorta.portfolio import Portfolio
+
+P_CLAIM, MEAN_LOSS, REFERENCE = 0.08, 25_000.0, 2_600.0
+
+def _run(book: Portfolio, factor: float, n_periods: int, seed: int = 0):
+    return [book.run_period(REFERENCE * factor, REFERENCE, 2_000, 1.2, seed=period_seed(seed, t))
+            for t in range(1, n_periods + 1)]
+
+def test_book_stays_near_reference_size_at_reference_premium():
+    book = Portfolio(2_000, P_CLAIM, MEAN_LOSS, seed=1)
+    assert len(book) == 2_000
+    periods = _run(book, 1.0, 20)
+    assert 1_800 < np.mean([p.policies for p in periods]) < 2_200
+    for p in periods:
+        assert p.policies == p.renewed + p.new_business
+    mean_claims = np.mean([p.n_claims for p in periods]) / np.mean([p.policies for p in periods])
+    assert mean_claims == pytest.approx(P_CLAIM, rel=0.15)
+
+def test_higher_price_raises_lapse_and_shrinks_book():
+    book = Portfolio(2_000, P_CLAIM, MEAN_LOSS, seed=1)
+    lapse = [book.lapse_probability(REFERENCE * f, REFERENCE, 1.2) for f in (0.8, 1.0, 1.2)]
+    assert lapse[0] < lapse[1] < lapse[2]
+    assert lapse[1] == pytest.approx(book.lapse_rate)
+
+    cheap, dear = Portfolio(2_000, P_CLAIM, MEAN_LOSS, seed=1), Portfolio(2_000, P_CLAIM, MEAN_LOSS, seed=1)
+    cheap_periods, dear_periods = _run(cheap, 0.8, 10), _run(dear, 1.2, 10)
+    assert len(cheap) > 2_000 > len(dear)
+    assert sum(p.lapsed for p in dear_periods) > sum(p.lapsed for p in cheap_periods)
+    # Kalan poliçelerin kıdemi artar
+    assert dear.policies["tenure"].mean() > 0
+
+def test_replay_reproduces_every_period(monkeypatch):
+    # Küçük aralık ve sınır: ara kayıt seyreltmesi de sınanır
+    monkeypatch.setattr(portfolio_module, "REPLAY_CHECKPOINT_EVERY", 3)
+    monkeypatch.setattr(portfolio_module, "MAX_REPLAY_CHECKPOINTS", 2)
+    book = Portfolio(1_500, P_CLAIM, MEAN_LOSS, seed=4)
+    factors = [1.0, 0.9, 1.15, 1.3, 0.85] * 4
+    results = [book.run_period(REFERENCE * f, REFERENCE, 1_500, 1.2, seed=period_seed(4, t),
+                               p_claim=0.1 if t == 7 else None)
+               for t, f in enumerate(factors, start=1)]
+    assert 1 <= len(book._checkpoints) <= 2
+    for n, expected in enumerate(results, start=1):
+        assert book.replay(n) == expected
+    with pytest.raises(IndexError):
+        book.replay(len(results) + 1)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from sigorta.reserving import (
+    PAYMENT_PATTERN,
+    bootstrap_reserves,
+    bornhuetter_ferguson,
+    chain_ladder,
+    develop_claims,
+    observed_mask,
+    pattern_factors,
+    simulate_reserve_runoff,
+)
+
+ULTIMATE = np.array([1.0e6, 1.2e6, 0.9e6, 1.5e6, 1.1e6, 1.3e6, 0.8e6, 1.4e6])
+
+def _pattern_triangle(ultimate=ULTIMATE, pattern=PAYMENT_PATTERN):
+    """Her kaza döneminin desene birebir uyduğu deterministik kümülatif üçgen."""
+    cumulative = np.multiply.outer(ultimate, np.cumsum(pattern) / np.sum(pattern))
+    return cumulative, observed_mask(len(ultimate), len(pattern))
+
+def test_chain_ladder_is_exact_on_a_pattern_triangle():
+    cumulative, mask = _pattern_triangle()
+    result = chain_ladder(cumulative, mask)
+    np.testing.assert_allclose(result["factors"], pattern_factors(PAYMENT_PATTERN))
+    np.testing.assert_allclose(result["ultimate"], ULTIMATE)
+    latest = cumulative[np.arange(len(ULTIMATE)), mask.sum(axis=1) - 1]
+    np.testing.assert_allclose(result["ibnr"], ULTIMATE - latest)
+    assert result["cdf"][-1] == 1.0
+
+def test_bornhuetter_ferguson_with_true_prior_is_exact():
+    cumulative, mask = _pattern_triangle()
+    result = bornhuetter_ferguson(cumulative, mask, ULTIMATE)
+    np.testing.assert_allclose(result["ultimate"], ULTIMATE)
+
+def test_batched_paths_match_one_at_a_time():
+    triangle = develop_claims(np.random.default_rng(0).gamma(50, 2e4, size=(5, 8)), seed=1)
+    batched = chain_ladder(triangle.paid, triangle.mask)
+    for path in range(5):
+        single = chain_ladder(triangle.paid[path], triangle.mask)
+        np.testing.assert_allclose(batched["ultimate"][path], single["ultimate"])
+        np.testing.assert_allclose(batched["factors"][path], single["factors"])
+
+def test_development_is_consistent_and_prefix_stable():
+    triangle = develop_claims(ULTIMATE, seed=7)
+    np.testing.assert_allclose(triangle.paid[:, -1], ULTIMATE)
+    assert np.all(np.diff(triangle.paid, axis=-1) >= 0)
+    assert np.all(triangle.incurred >= triangle.paid)
+    # Yeni kaza dönemi eklemek eski dönemlerin gelişmesini değiştirmez
+    shorter = develop_claims(ULTIMATE[:5], seed=7)
+    np.testing.assert_array_equal(shorter.paid, triangle.paid[:5])
+    np.testing.assert_array_equal(shorter.incurred, triangle.incurred[:5])
+
+def test_bootstrap_without_noise_returns_the_point_estimate():
+    cumulative, mask = _pattern_triangle()
+    result = bootstrap_reserves(cumulative, mask, n_resamples=100, process_variance=False, seed=0)
+    assert result["phi"] == pytest.approx(0.0, abs=1e-12)
+    np.testing.assert_allclose(result["reserve"], result["point_estimate"])
+
+def test_bootstrap_is_centred_on_chain_ladder():
+    triangle = develop_claims(ULTIMATE, seed=3)
+    result = bootstrap_reserves(triangle.paid, triangle.mask, n_resamples=20_000, seed=4)
+    assert result["mean"] == pytest.approx(result["point_estimate"], rel=0.05)
+    q = result["quantiles"]
+    assert q[0.5] < q[0.75] < q[0.95] < q[0.995]
+    again = bootstrap_reserves(triangle.paid, triangle.mask, n_resamples=20_000, seed=4)
+    np.testing.assert_array_equal(again["reserve"], result["reserve"])
+
+def test_estimators_are_close_to_unbiased_across_paths():
+    runoff = simulate_reserve_runoff(4_000, 2_000, 0.08, 25_000, 2_600.0, seed=1)
+    n_paths = runoff["true_reserve"].size
+    for name, mean_error in runoff["mean_error"].items():
+        # Ortalama hata, yol ortalamasının standart hatasının 4 katından küçük
+        assert abs(mean_error) < 4 * runoff["error_std"][name] / np.sqrt(n_paths), name
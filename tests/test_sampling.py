@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+import pytest
+
+from sigorta.sampling import (
+    ERLANG_EXACT_MAX,
+    SOBOL_MAX_DIM,
+    HaltonSampler,
+    SobolSampler,
+    _SOBOL_DIRECTIONS,
+    binomial_ppf,
+    gamma_ppf,
+    make_sampler,
+    rqmc_estimate,
+    sample_period_losses,
+)
+
+def _is_primitive(degree: int, a: int) -> bool:
+    """x^s + a_1 x^{s-1} + … + a_{s-1} x + 1, GF(2) üzerinde ilkel mi (x'in mertebesi 2^s - 1)."""
+    poly = (1 << degree) | (a << 1) | 1
+    period, x = (1 << degree) - 1, 1
+    for k in range(1, period + 1):
+        x <<= 1
+        if x >> degree:
+            x ^= poly
+        if x == 1:
+            return k == period
+    return False
+
+def test_direction_numbers_are_well_formed():
+    assert len({(s, a) for s, a, _ in _SOBOL_DIRECTIONS}) == len(_SOBOL_DIRECTIONS)
+    for s, a, m in _SOBOL_DIRECTIONS:
+        assert len(m) == s and _is_primitive(s, a)
+        assert all(value % 2 == 1 and value < 2 ** (k + 1) for k, value in enumerate(m))
+
+def test_unscrambled_sobol_matches_reference_points():
+    points = SobolSampler(3, scramble=False).uniforms(8)
+    expected = [[0, 0, 0], [.5, .5, .5], [.75, .25, .25], [.25, .75, .75],
+                [.375, .375, .625], [.875, .875, .125], [.625, .125, .875], [.125, .625, .375]]
+    np.testing.assert_allclose(points, expected, atol=1e-9)
+
+@pytest.mark.parametrize("scramble", [False, True])
+def test_sobol_points_are_stratified(scramble):
+    u = SobolSampler(SOBOL_MAX_DIM, seed=5, scramble=scramble).uniforms(1024)
+    # Her boyutta 1024 eşit aralığın her birinde tam bir nokta
+    for j in range(SOBOL_MAX_DIM):
+        assert np.all(np.bincount((u[:, j] * 1024).astype(int), minlength=1024) == 1)
+    # İlk iki boyut (0, 10, 2)-ağıdır: 2^-10 hacimli her temel kutuda tam bir nokta
+    for a in range(11):
+        cells = (u[:, 0] * 2 ** a).astype(int) * 2 ** (10 - a) + (u[:, 1] * 2 ** (10 - a)).astype(int)
+        assert np.all(np.bincount(cells, minlength=1024) == 1)
+
+@pytest.mark.parametrize("kind", ["random", "sobol", "halton"])
+def test_consecutive_calls_continue_the_sequence(kind):
+    whole = make_sampler(kind, 4, seed=3).uniforms(96)
+    sampler = make_sampler(kind, 4, seed=3)
+    parts = np.vstack([sampler.uniforms(32), sampler.uniforms(17), sampler.uniforms(47)])
+    np.testing.assert_array_equal(parts, whole)
+    assert np.all((whole >= 0) & (whole < 1))
+
+@pytest.mark.parametrize("kind", ["random", "sobol", "halton"])
+def test_empty_request_leaves_the_sequence_untouched(kind):
+    whole = make_sampler(kind, 4, seed=3).uniforms(8)
+    sampler = make_sampler(kind, 4, seed=3)
+    assert sampler.uniforms(0).shape == (0, 4)
+    parts = np.vstack([sampler.uniforms(3), sampler.uniforms(0), sampler.uniforms(5)])
+    np.testing.assert_array_equal(parts, whole)
+
+def test_unshifted_halton_is_radical_inverse():
+    u = HaltonSampler(2, scramble=False).uniforms(5)
+    np.testing.assert_allclose(u[:, 0], [0, 1 / 2, 1 / 4, 3 / 4, 1 / 8])
+    np.testing.assert_allclose(u[:, 1], [0, 1 / 3, 2 / 3, 1 / 9, 4 / 9])
+
+def test_binomial_ppf_is_exact():
+    n, p = 40, 0.08
+    cdf = np.cumsum([math.comb(n, k) * p ** k * (1 - p) ** (n - k) for k in range(n + 1)])
+    u = np.random.default_rng(0).random(10_000)
+    expected = np.minimum(np.searchsorted(cdf, u, side="right"), n)
+    np.testing.assert_array_equal(binomial_ppf(u, n, p), expected)
+
+def _gamma_cdf(k: int, x: float) -> float:
+    """Düzenlenmiş alt eksik gamma, seri açılımı."""
+    total = term = 1.0 / k
+    n = 1
+    while term > total * 1e-17:
+        term *= x / (k + n)
+        total += term
+        n += 1
+    return math.exp(k * math.log(x) - x - math.lgamma(k)) * total
+
+@pytest.mark.parametrize("k", [1, 2, 7, 30, ERLANG_EXACT_MAX])
+def test_gamma_ppf_is_exact_up_to_erlang_limit(k):
+    u = np.array([1e-6, 1e-3, 0.05, 0.5, 0.95, 0.999, 1 - 1e-6])
+    x = gamma_ppf(u, np.full(u.shape, k))
+    np.testing.assert_allclose([_gamma_cdf(k, xi) for xi in x], u, rtol=1e-8)
+
+@pytest.mark.parametrize("k, bound", [(ERLANG_EXACT_MAX + 1, 3e-3), (1_000, 4e-5)])
+def test_wilson_hilferty_error_stays_within_documented_bound(k, bound):
+    u = np.array([1e-6, 1e-3, 0.05, 0.5, 0.95, 0.999, 1 - 1e-6])
+    x = gamma_ppf(u, np.full(u.shape, k))
+    exact = []
+    for ui in u:
+        lo, hi = 0.0, k + 40 * math.sqrt(k) + 100
+        for _ in range(200):
+            mid = (lo + hi) / 2
+            lo, hi = (mid, hi) if _gamma_cdf(k, mid) < ui else (lo, mid)
+        exact.append((lo + hi) / 2)
+    assert np.max(np.abs(x / np.array(exact) - 1)) < bound
+
+def test_sobol_rqmc_beats_random_sampling():
+    def mean_total_loss(sampler):
+        return float(sample_period_losses(sampler.uniforms(4096), 2_000, 0.08, 25_000)[1].mean())
+
+    sobol = rqmc_estimate(mean_total_loss, 2, kind="sobol", seed=1)
+    random = rqmc_estimate(mean_total_loss, 2, kind="random", seed=1)
+    expected = 2_000 * 0.08 * 25_000
+    assert abs(sobol["estimate"] - expected) < 4 * sobol["std_error"] + 1e-6 * expected
+    assert sobol["std_error"] < random["std_error"] / 20
@@ -0,0 +1,18 @@
+import pytest
+
+from sigorta.cli import main
+from sigorta.severity import make_reinsurance, make_severity
+
+def test_unknown_spec_keys_raise_value_error():
+    with pytest.raises(ValueError, match="sigm"):
+        make_severity(25_000, {"dist": "lognormal", "sigm": 1.2})
+    with pytest.raises(ValueError, match="qouta_share"):
+        make_reinsurance({"retention": 100_000, "qouta_share": 0.2})
+    with pytest.raises(ValueError):
+        make_reinsurance({"retention": "yüz bin"})
+
+def test_cli_reports_bad_spec_without_traceback(tmp_path, capsys):
+    params = tmp_path / "p.json"
+    params.write_text('{"defaults": {"n_trials": 2, "reinsurance": {"retension": 1e5}}}')
+    assert main([str(params), "-o", str(tmp_path / "out.csv")]) == 2
+    assert "hata: Bilinmeyen reasürans alanı" in capsys.readouterr().err
@@ -0,0 +1,29 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from benchmarks.store_check import check_closed, run_check
+from sigorta import ClassroomStore
+
+def test_summary_tables_match_raw_rows():
+    assert run_check(n_sessions=200, seed=1) == []
+
+def test_close_releases_reader_connections(tmp_path):
+    store = ClassroomStore(str(tmp_path / "sinif.sqlite"))
+    store.record_quiz("oturum-0", 1, True)
+    store.flush()
+    threads = [threading.Thread(target=store.quiz_pass_rates) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.overview()
+    assert store.open_readers == 4
+    store.close()
+    assert store.open_readers == 0
+    assert check_closed(store) == []
+    assert not os.path.exists(store.path + "-wal")
+    with pytest.raises(sqlite3.ProgrammingError):
+        store.overview()
@@ -0,0 +1,39 @@
+import pytest
+
+from sigorta.analytic import analytic_period_metrics
+from sigorta.variance import compare_premiums
+
+P_CLAIM, MEAN_LOSS, EXPENSE, PROFIT = 0.08, 25_000.0, 0.20, 0.10
+FACTORS = (90, 100, 110)
+
+def _compare(metric, base_policies=2_000, n_trials=20_000, **kwargs):
+    return compare_premiums(FACTORS, P_CLAIM, MEAN_LOSS, EXPENSE, PROFIT, base_policies, 1.5,
+                            n_trials=n_trials, metric=metric, seed=1, **kwargs)
+
+def _analytic(candidate):
+    return analytic_period_metrics(candidate["policies"], P_CLAIM, MEAN_LOSS, candidate["premium"], EXPENSE)
+
+@pytest.mark.parametrize("metric", ["prob_loss", "shortfall"])
+def test_variance_reduction_factor_above_one(metric):
+    result = _compare(metric)
+    for row in result["candidates"] + result["differences"]:
+        assert row["variance_reduction"] > 1.0
+        assert row["std_error"] < row["plain_std_error"]
+
+@pytest.mark.parametrize("crn, antithetic, control_variate", [
+    (True, False, False), (True, True, False), (True, False, True), (True, True, True), (False, True, False),
+])
+def test_estimates_agree_with_analytic_metrics(crn, antithetic, control_variate):
+    flags = dict(crn=crn, antithetic=antithetic, control_variate=control_variate)
+    for metric, key in (("prob_loss", "prob_cr_above_1"), ("uw", "expected_uw")):
+        for candidate in _compare(metric, **flags)["candidates"]:
+            want = _analytic(candidate)[key]
+            # UW kontrol değişkeniyle tam çözülür; standart hata yuvarlama mertebesindedir
+            tolerance = 4 * candidate["std_error"] + 1e-9 * abs(want)
+            assert candidate["estimate"] == pytest.approx(want, abs=tolerance)
+
+def test_large_book_uses_constant_memory_per_trial():
+    # Deneme başına iki uniform: 1e6 poliçede de (DRAW_CHUNK, aday) boyutunda kalır
+    for candidate in _compare("prob_loss", base_policies=1_000_000, n_trials=4_000)["candidates"]:
+        want = _analytic(candidate)["prob_cr_above_1"]
+        assert candidate["estimate"] == pytest.approx(want, abs=4 * candidate["std_error"] + 1e-3)